@@ -0,0 +1,122 @@
+import asyncio
+import os
+import time
+
+from dataclasses import asdict, dataclass, field
+from typing import Awaitable, Callable
+
+from neo.rpc import AsyncRpcClient, RpcError
+from testcases.loadgen import percentile
+from testcases.testing import Testing
+
+
+@dataclass
+class BenchmarkResult:
+    name: str  # i.e. "invokefunction/StdLib.itoa"
+    requests: int
+    errors: int
+    seconds: float
+    concurrency: int
+    latencies: list[float] = field(default_factory=list)  # the latency of the successful requests, in seconds
+    extra: dict = field(default_factory=dict)  # the benchmark specific values, i.e. the gasconsumed
+
+    @property
+    def rps(self) -> float:
+        return (self.requests - self.errors) / self.seconds if self.seconds > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "requests": self.requests,
+            "errors": self.errors,
+            "seconds": self.seconds,
+            "concurrency": self.concurrency,
+            "rps": self.rps,
+            "latency": {  # null if all requests failed, NaN is not valid JSON
+                "mean": sum(self.latencies) / len(self.latencies) if len(self.latencies) > 0 else None,
+                "p50": percentile(self.latencies, 50) if len(self.latencies) > 0 else None,
+                "p90": percentile(self.latencies, 90) if len(self.latencies) > 0 else None,
+                "p99": percentile(self.latencies, 99) if len(self.latencies) > 0 else None,
+                "max": max(self.latencies, default=None),
+            },
+            "samples": self.latencies,
+            "extra": self.extra,
+        }
+
+    def summary(self) -> str:
+        return (f"{self.name:<48} {self.rps:>9.1f} rps  p50 {percentile(self.latencies, 50) * 1000:>8.2f}ms  "
+                f"p99 {percentile(self.latencies, 99) * 1000:>8.2f}ms  errors {self.errors}/{self.requests}")
+
+
+class Benchmark(Testing):
+    """
+    The base of the benchmarks. A benchmark is run like a testcase(so it has the `env`, `client` and the tx helpers),
+    and `run_test` calls `measure` for each measured case, the results are collected in `self.results`.
+    """
+
+    def __init__(self, loggerName: str, requests: int = 1000, concurrency: int = 16, warmup: int = 10):
+        super().__init__(loggerName)
+        self.declare_resources(sends_txs=False)
+        self.requests = requests
+        self.concurrency = concurrency
+        self.warmup = warmup
+        self.results: list[BenchmarkResult] = []
+
+    def measure(self, name: str, call: Callable[[AsyncRpcClient, int], Awaitable[any]],
+                requests: int | None = None, concurrency: int | None = None) -> BenchmarkResult:
+        """
+        Runs `call(client, i)` for i in range(requests) on `concurrency` concurrent workers.
+        A request fails if `call` raises RpcError or AssertionError.
+        """
+        requests = requests or self.requests
+        concurrency = concurrency or self.concurrency
+        result = asyncio.run(self._measure(name, call, requests, concurrency))
+        self.logger.info(result.summary())
+        self.results.append(result)
+        return result
+
+    async def _measure(self, name: str, call: Callable[[AsyncRpcClient, int], Awaitable[any]],
+                       requests: int, concurrency: int) -> BenchmarkResult:
+        result = BenchmarkResult(name, requests, 0, 0.0, concurrency)
+        next_index = 0
+
+        async def worker(client: AsyncRpcClient):
+            nonlocal next_index
+            while next_index < requests:
+                index = next_index
+                next_index += 1
+                start = time.perf_counter()
+                try:
+                    await call(client, index)
+                    result.latencies.append(time.perf_counter() - start)
+                except (RpcError, AssertionError) as e:
+                    if result.errors == 0:
+                        self.logger.warning(f"{name} request {index} failed: {e}")
+                    result.errors += 1
+
+        async with AsyncRpcClient(self.env.rpc_endpoint, max_concurrency=concurrency) as client:
+            for i in range(self.warmup):  # warm up the connections and the node caches
+                try:
+                    await call(client, i)
+                except (RpcError, AssertionError):
+                    pass
+
+            start = time.perf_counter()
+            await asyncio.gather(*[worker(client) for _ in range(concurrency)])
+            result.seconds = time.perf_counter() - start
+        return result
+
+    def result_metadata(self) -> dict:
+        """
+        The metadata to identify the results, so the results of different neo builds and testbeds can be compared.
+        """
+        version = self.client.get_version()
+        return {
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            "testbed": os.getenv('NEO_TESTBED', 'testbed/localnet.json'),
+            "useragent": version.get('useragent', ''),
+            "network": self.env.network,
+            "hardforks": asdict(self.env.hardforks),
+            "neo4_enable": self.env.neo4_enable,
+            "version": version,
+        }
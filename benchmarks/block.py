@@ -0,0 +1,53 @@
+from neo.rpc import AsyncRpcClient
+from benchmarks.base import Benchmark, BenchmarkResult
+
+
+# Operation: this benchmark gets the recent blocks with `getblock` in verbose and non-verbose mode.
+# Expect Result: The RPS and latency of `getblock`, the mean size of the non-verbose blocks,
+#  and the intervals between the recent blocks.
+class BlockBenchmark(Benchmark):
+
+    def __init__(self, requests: int = 1000, concurrency: int = 16, blocks: int = 100):
+        super().__init__("BlockBenchmark", requests, concurrency)
+        self.blocks = blocks
+
+    def run_test(self):
+        latest = self.client.get_block_index()
+        first = max(latest - self.blocks + 1, 0)
+        count = latest - first + 1
+        sizes = []
+
+        async def get_raw_block(client: AsyncRpcClient, i: int):
+            block = await client.get_block(first + i % count, False)
+            assert isinstance(block, str), f"Expected base64 string, got {block}"
+            if len(sizes) < count:
+                sizes.append(len(block) * 3 // 4)
+
+        async def get_verbose_block(client: AsyncRpcClient, i: int):
+            block = await client.get_block(first + i % count, True)
+            assert block['index'] == first + i % count, f"Expected block {first + i % count}, got {block['index']}"
+
+        result = self.measure("getblock/non-verbose", get_raw_block)
+        result.extra['blocks'] = count
+        result.extra['mean_block_size'] = sum(sizes) / len(sizes) if len(sizes) > 0 else 0
+
+        result = self.measure("getblock/verbose", get_verbose_block)
+        result.extra['blocks'] = count
+
+        self._measure_block_interval(first, latest)
+
+    def _measure_block_interval(self, first: int, latest: int):
+        # The block time is not a request, the "latencies" of the result are the intervals between the blocks.
+        with self.client.batch() as batch:
+            headers = [batch.get_block_header(i, True) for i in range(max(first, 1), latest + 1)]
+        times = [header.result()['time'] / 1000.0 for header in headers]
+        intervals = [b - a for (a, b) in zip(times, times[1:])]
+        result = BenchmarkResult("block/interval", len(intervals), 0, sum(intervals), 1, intervals)
+        self.logger.info(result.summary())
+        self.results.append(result)
+
+
+# Run with: python3 -B -m benchmarks.block
+if __name__ == "__main__":
+    benchmark = BlockBenchmark()
+    benchmark.run()
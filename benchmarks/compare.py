@@ -0,0 +1,141 @@
+import argparse
+import json
+import logging
+import random
+import statistics
+import sys
+
+from dataclasses import dataclass
+
+from benchmarks.history import ResultHistory
+
+logging.basicConfig(level=logging.INFO)
+
+# The extra values which are deterministic for the same build, any increase of them is a regression.
+DETERMINISTIC_EXTRAS = ['gasconsumed', 'networkfee', 'constant', 'per_byte']
+
+
+@dataclass
+class Comparison:
+    name: str  # the benchmark result name, i.e. "invokefunction/StdLib.itoa"
+    metric: str  # i.e. "latency.p50", "gasconsumed"
+    baseline: float
+    candidate: float
+    low: float  # the confidence interval of candidate / baseline
+    high: float
+    verdict: str  # "regression", "improvement" or "unchanged"
+
+    @property
+    def ratio(self) -> float:
+        return self.candidate / self.baseline if self.baseline != 0 else float('inf')
+
+    def summary(self) -> str:
+        return (f"{self.name:<48} {self.metric:<12} {self.baseline:>14.6g} -> {self.candidate:<14.6g} "
+                f"x{self.ratio:.3f} [{self.low:.3f}, {self.high:.3f}]  {self.verdict}")
+
+
+def bootstrap_ratio(baseline: list[float], candidate: list[float], resamples: int = 1000, confidence: float = 0.95,
+                    rng: random.Random | None = None) -> tuple[float, float]:
+    """
+    The bootstrap confidence interval of median(candidate) / median(baseline),
+    the two samples are resampled independently.
+    """
+    rng = rng or random.Random(0)
+    ratios = []
+    for _ in range(resamples):
+        b = statistics.median(rng.choices(baseline, k=len(baseline)))
+        c = statistics.median(rng.choices(candidate, k=len(candidate)))
+        ratios.append(c / b if b > 0 else float('inf'))
+    ratios.sort()
+    alpha = (1.0 - confidence) / 2.0
+    return ratios[int(alpha * (resamples - 1))], ratios[int((1.0 - alpha) * (resamples - 1))]
+
+
+def compare_runs(baseline: dict, candidate: dict, threshold: float = 0.05, resamples: int = 1000,
+                 confidence: float = 0.95) -> list[Comparison]:
+    """
+    Compares the results with the same name in two runs. The median latency is a regression if the lower bound of
+    its confidence interval is greater than `1 + threshold`, and an improvement if the upper bound is less than
+    `1 - threshold`. The deterministic values(`DETERMINISTIC_EXTRAS`) are compared directly.
+    """
+    rng = random.Random(0)
+    baseline_results = {r['name']: r for r in baseline['results']}
+    comparisons = []
+    for result in candidate['results']:
+        base = baseline_results.get(result['name'])
+        if base is None:
+            continue
+
+        if len(base.get('samples', [])) > 0 and len(result.get('samples', [])) > 0:
+            (low, high) = bootstrap_ratio(base['samples'], result['samples'], resamples, confidence, rng)
+            verdict = "regression" if low > 1 + threshold else "improvement" if high < 1 - threshold else "unchanged"
+            comparisons.append(Comparison(result['name'], "latency.p50", statistics.median(base['samples']),
+                                          statistics.median(result['samples']), low, high, verdict))
+
+        for metric in DETERMINISTIC_EXTRAS:
+            if metric not in base.get('extra', {}) or metric not in result.get('extra', {}):
+                continue
+            (b, c) = (base['extra'][metric], result['extra'][metric])
+            ratio = c / b if b != 0 else float('inf')
+            verdict = "regression" if c > b else "improvement" if c < b else "unchanged"
+            comparisons.append(Comparison(result['name'], metric, b, c, ratio, ratio, verdict))
+    return comparisons
+
+
+def load_run(source: str, history: ResultHistory) -> dict:
+    """
+    Loads the run from the results JSON file, or the `@index` run in the history, i.e. '@-1' is the latest run.
+    Raises ValueError if the index is out of the history.
+    """
+    if source.startswith('@'):
+        runs = history.runs()
+        index = int(source[1:])
+        if index < -len(runs) or index >= len(runs):
+            raise ValueError(f"No run {source} in {history.path}, it has {len(runs)} runs")
+        return runs[index]
+
+    with open(source, 'r') as f:
+        return json.load(f)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs and report the significant changes.")
+    parser.add_argument('baseline', help="the baseline run, a results JSON file or '@index' in the history")
+    parser.add_argument('candidate', help="the candidate run, a results JSON file or '@index' in the history")
+    parser.add_argument('--history', default='benchmark-history.jsonl', help="the JSONL history file")
+    parser.add_argument('--threshold', type=float, default=0.05,
+                        help="the relative latency change to ignore, 0.05 means 5%%")
+    parser.add_argument('--confidence', type=float, default=0.95, help="the confidence level of the intervals")
+    parser.add_argument('--resamples', type=int, default=1000, help="the number of the bootstrap resamples")
+    parser.add_argument('--all', action='store_true', help="show the unchanged results too")
+    args = parser.parse_args(argv)
+
+    logger = logging.getLogger("BenchmarkCompare")
+    history = ResultHistory(args.history)
+    try:
+        baseline = load_run(args.baseline, history)
+        candidate = load_run(args.candidate, history)
+    except ValueError as e:
+        parser.error(str(e))
+    if ResultHistory.config_key_of(baseline) != ResultHistory.config_key_of(candidate):
+        logger.warning("The runs have different testbed or hardfork config, the results may be incomparable")
+
+    logger.info(f"Baseline: {baseline.get('useragent')} at {baseline.get('timestamp')}")
+    logger.info(f"Candidate: {candidate.get('useragent')} at {candidate.get('timestamp')}")
+    comparisons = compare_runs(baseline, candidate, args.threshold, args.resamples, args.confidence)
+    shown = [c for c in comparisons if args.all or c.verdict != "unchanged"]
+    if len(shown) > 0:
+        logger.info("Changes:\n" + "\n".join(c.summary() for c in shown))
+
+    regressions = [c for c in comparisons if c.verdict == "regression"]
+    if len(regressions) > 0:
+        logger.error(f"{len(regressions)}/{len(comparisons)} regressions found")
+        return 1
+
+    logger.info(f"No regression found in {len(comparisons)} comparisons")
+    return 0
+
+
+# Run with: python3 -B -m benchmarks.compare <baseline> <candidate> [--history file] [--threshold 0.05] [--all]
+if __name__ == "__main__":
+    sys.exit(main())
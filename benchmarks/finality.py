@@ -0,0 +1,33 @@
+from benchmarks.base import Benchmark, BenchmarkResult
+from testcases.loadgen import LoadGenerator
+
+
+# Operation: this benchmark submits GAS transfers at a low rate with the load generator(see `testcases.loadgen`),
+#  so the latency is dominated by the block time rather than the mempool.
+# Expect Result: The submit-to-persist latency of the transactions.
+class FinalityBenchmark(Benchmark):
+
+    def __init__(self, txs: int = 50, tps: float = 5.0):
+        super().__init__("FinalityBenchmark", txs, 1)
+        # The transfers are sent between all pool accounts without leasing them, so it conflicts with all other tests.
+        self.declare_resources(writes=['*'])
+        self.tps = tps
+
+    def run_test(self):
+        load = LoadGenerator(self.requests, self.tps)
+        load.run()  # with the post test steps, the account release and the RPC stats of the load generator
+
+        report = load.report
+        result = BenchmarkResult("tx/finality", report.txs, report.txs - report.persisted, report.submit_seconds,
+                                 load.concurrency, report.latencies)
+        result.extra['target_tps'] = self.tps
+        result.extra['max_mempool_depth'] = max(
+            (s['verified'] + s['unverified'] for s in report.mempool), default=0)
+        self.logger.info(result.summary())
+        self.results.append(result)
+
+
+# Run with: python3 -B -m benchmarks.finality
+if __name__ == "__main__":
+    benchmark = FinalityBenchmark()
+    benchmark.run()
@@ -0,0 +1,143 @@
+import base64
+import sys
+
+from dataclasses import dataclass
+from typing import Callable
+
+from neo import CallFlags, Hardforks, OpCode
+from neo.contract import CRYPTO_CONTRACT_HASH, STDLIB_CONTRACT_HASH, ScriptBuilder
+from neo.rpc import RpcError
+from benchmarks.base import Benchmark, BenchmarkResult
+
+
+DEFAULT_SIZES = [0, 32, 64, 256, 1024, 4096, 16384]
+
+
+@dataclass
+class ProfiledMethod:
+    contract: str  # i.e. "StdLib"
+    script_hash: str
+    method: str
+    make_args: Callable[[int], list]  # the arguments with the input of the given size in bytes
+    hardfork: str | None = None  # the method is available since the hardfork
+
+    @property
+    def name(self) -> str:
+        return f"{self.contract}.{self.method}"
+
+
+def _serialized_bytes(size: int) -> bytes:
+    # The BinarySerializer format of a ByteString: type(0x28) + var-length + data
+    if size < 0xFD:
+        prefix = size.to_bytes(1, 'little')
+    elif size <= 0xFFFF:
+        prefix = b'\xfd' + size.to_bytes(2, 'little')
+    else:
+        prefix = b'\xfe' + size.to_bytes(4, 'little')
+    return b'\x28' + prefix + bytes(size)
+
+
+PROFILED_METHODS = [
+    ProfiledMethod("StdLib", STDLIB_CONTRACT_HASH, "base64Encode", lambda n: [bytes(n)]),
+    ProfiledMethod("StdLib", STDLIB_CONTRACT_HASH, "base64Decode", lambda n: [base64.b64encode(bytes(n)).decode()]),
+    ProfiledMethod("StdLib", STDLIB_CONTRACT_HASH, "base58Encode", lambda n: [bytes(n)]),
+    ProfiledMethod("StdLib", STDLIB_CONTRACT_HASH, "base58CheckEncode", lambda n: [bytes(n)]),
+    ProfiledMethod("StdLib", STDLIB_CONTRACT_HASH, "atoi", lambda n: ['9' * n, 10]),
+    ProfiledMethod("StdLib", STDLIB_CONTRACT_HASH, "serialize", lambda n: [bytes(n)]),
+    ProfiledMethod("StdLib", STDLIB_CONTRACT_HASH, "deserialize", lambda n: [_serialized_bytes(n)]),
+    ProfiledMethod("StdLib", STDLIB_CONTRACT_HASH, "jsonSerialize", lambda n: ['a' * n]),
+    ProfiledMethod("StdLib", STDLIB_CONTRACT_HASH, "memoryCompare", lambda n: [bytes(n), bytes(n)]),
+    ProfiledMethod("StdLib", STDLIB_CONTRACT_HASH, "memorySearch", lambda n: [bytes(n), b'\x01']),
+    ProfiledMethod("StdLib", STDLIB_CONTRACT_HASH, "strLen", lambda n: ['a' * n]),
+    ProfiledMethod("CryptoLib", CRYPTO_CONTRACT_HASH, "sha256", lambda n: [bytes(n)]),
+    ProfiledMethod("CryptoLib", CRYPTO_CONTRACT_HASH, "ripemd160", lambda n: [bytes(n)]),
+    ProfiledMethod("CryptoLib", CRYPTO_CONTRACT_HASH, "murmur32", lambda n: [bytes(n), 0]),
+    ProfiledMethod("CryptoLib", CRYPTO_CONTRACT_HASH, "keccak256", lambda n: [bytes(n)],
+                   hardfork=Hardforks.HF_Cockatrice),
+]
+
+
+def fit_linear(points: list[tuple[int, int]]) -> tuple[float, float, float]:
+    """
+    Fits `gas = constant + per_byte * size` with the least squares, returns (constant, per_byte, max_residual).
+    """
+    if len(points) == 0:
+        return 0.0, 0.0, 0.0
+    n = len(points)
+    mean_x = sum(x for (x, _) in points) / n
+    mean_y = sum(y for (_, y) in points) / n
+    var_x = sum((x - mean_x) ** 2 for (x, _) in points)
+    per_byte = sum((x - mean_x) * (y - mean_y) for (x, y) in points) / var_x if var_x > 0 else 0.0
+    constant = mean_y - per_byte * mean_x
+    max_residual = max(abs(y - constant - per_byte * x) for (x, y) in points)
+    return constant, per_byte, max_residual
+
+
+# Operation: this profiler calls the native methods with the inputs of different sizes via `invokescript`,
+#  and fits the consumed GAS to `constant + per_byte * size`.
+#  The GAS of pushing the arguments is subtracted, so the curve is the cost of the call itself.
+# Expect Result: The cost curve of each method, it changes only if the fee model changes.
+class GasProfile(Benchmark):
+
+    def __init__(self, sizes: list[int] = DEFAULT_SIZES):
+        super().__init__("GasProfile")
+        self.sizes = sizes
+
+    def run_test(self):
+        block_index = self.client.get_block_index()
+        for method in PROFILED_METHODS:
+            if method.hardfork is not None and not self.env.is_hardfork_enabled(method.hardfork, block_index):
+                self.logger.info(f"Skipping {method.name}, {method.hardfork} is not enabled")
+                continue
+            self._profile(method)
+
+        self.logger.info("GAS profile:\n" + self.table())
+
+    def _profile(self, method: ProfiledMethod):
+        with self.client.batch() as batch:
+            pendings = []
+            for size in self.sizes:
+                args = method.make_args(size)
+                script = ScriptBuilder().emit_dynamic_call(
+                    method.script_hash, method.method, CallFlags.READ_STATES, args).to_bytes()
+                baseline = ScriptBuilder().emit_push_array(args).emit(OpCode.DROP).to_bytes()
+                pendings.append((size, batch.invoke_script(script), batch.invoke_script(baseline)))
+
+        points, faults = [], {}
+        for (size, call, baseline) in pendings:
+            try:
+                (call, baseline) = (call.result(), baseline.result())
+            except RpcError as e:
+                faults[size] = e.message
+                continue
+            if call['state'] != 'HALT':
+                faults[size] = call.get('exception') or call['state']
+                continue
+            points.append((size, int(call['gasconsumed']) - int(baseline['gasconsumed'])))
+
+        (constant, per_byte, max_residual) = fit_linear(points)
+        result = BenchmarkResult(f"gas/{method.name}", len(self.sizes), len(faults), 0.0, 1)
+        result.extra = {
+            "points": {str(size): gas for (size, gas) in points},
+            "faults": {str(size): fault for (size, fault) in faults.items()},
+            "constant": round(constant, 3),
+            "per_byte": round(per_byte, 6),
+            "max_residual": round(max_residual, 3),
+        }
+        self.results.append(result)
+
+    def table(self) -> str:
+        lines = [f"{'method':<32} {'constant':>12} {'per_byte':>12} {'max_residual':>14}  points"]
+        for result in self.results:
+            extra = result.extra
+            points = " ".join(f"{size}:{gas}" for (size, gas) in extra['points'].items())
+            lines.append(f"{result.name[len('gas/'):]:<32} {extra['constant']:>12.1f} {extra['per_byte']:>12.4f} "
+                         f"{extra['max_residual']:>14.1f}  {points}")
+            lines += [f"{'':<32} fault at size {size}: {fault}" for (size, fault) in extra['faults'].items()]
+        return "\n".join(lines)
+
+
+# Run with: python3 -B -m benchmarks.gas_profile [size1 size2 ...]
+if __name__ == "__main__":
+    profile = GasProfile([int(s) for s in sys.argv[1:]] or DEFAULT_SIZES)
+    profile.run()
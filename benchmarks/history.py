@@ -0,0 +1,58 @@
+import hashlib
+import json
+import os
+
+
+def _digest(key: dict) -> str:
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+class ResultHistory:
+    """
+    The append-only JSONL store of the benchmark runs, one run(the document written by `benchmarks.runner`) per line.
+    Each run has two keys:
+     - `config_key`, the network, the testbed and the hardfork config, the runs with the same one are comparable;
+     - `key`, the `config_key` and the node build(the `getversion` user agent).
+    """
+
+    def __init__(self, path: str = 'benchmark-history.jsonl'):
+        self.path = path
+
+    @staticmethod
+    def config_key_of(run: dict) -> str:
+        return _digest({
+            "network": run.get('network', 0),
+            "testbed": run.get('testbed', ''),
+            "hardforks": run.get('hardforks', {}),
+        })
+
+    @staticmethod
+    def key_of(run: dict) -> str:
+        return _digest({"config_key": ResultHistory.config_key_of(run), "useragent": run.get('useragent', '')})
+
+    def append(self, run: dict) -> dict:
+        run = {**run, "key": self.key_of(run), "config_key": self.config_key_of(run)}
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(run, sort_keys=True) + "\n")
+        return run
+
+    def runs(self, key: str | None = None, config_key: str | None = None) -> list[dict]:
+        """
+        Returns the runs in the appended order, only the runs with the `key` or `config_key` if it's not None.
+        """
+        if not os.path.exists(self.path):
+            return []
+
+        runs = []
+        with open(self.path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if len(line) == 0:
+                    continue
+                run = json.loads(line)
+                if key is not None and run.get('key') != key:
+                    continue
+                if config_key is not None and run.get('config_key') != config_key:
+                    continue
+                runs.append(run)
+        return runs
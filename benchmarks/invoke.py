@@ -0,0 +1,94 @@
+import base64
+
+from dataclasses import dataclass
+
+from neo import CallFlags
+from neo.contract import *
+from neo.rpc import AsyncRpcClient
+from benchmarks.base import Benchmark
+
+
+@dataclass
+class NativeCall:
+    contract: str  # i.e. "StdLib"
+    script_hash: str
+    method: str
+    args: list[ContractParameter]
+
+    @property
+    def name(self) -> str:
+        return f"{self.contract}.{self.method}"
+
+    def script_args(self) -> list:
+        args = []
+        for arg in self.args:
+            if arg.type == 'ByteArray':
+                args.append(base64.b64decode(arg.value))
+            elif arg.type == 'Integer':
+                args.append(int(arg.value))
+            else:
+                args.append(arg.value)
+        return args
+
+
+def _bytes_parameter(size: int) -> ContractParameter:
+    return ContractParameter(type='ByteArray', value=base64.b64encode(bytes(range(256)) * (size // 256)).decode())
+
+
+NATIVE_CALLS = [
+    NativeCall("StdLib", STDLIB_CONTRACT_HASH, "itoa", [ContractParameter(type='Integer', value='1234567890')]),
+    NativeCall("StdLib", STDLIB_CONTRACT_HASH, "atoi", [ContractParameter(type='String', value='1234567890')]),
+    NativeCall("StdLib", STDLIB_CONTRACT_HASH, "base64Encode", [_bytes_parameter(1024)]),
+    NativeCall("StdLib", STDLIB_CONTRACT_HASH, "base64Decode",
+               [ContractParameter(type='String', value=base64.b64encode(bytes(1024)).decode())]),
+    NativeCall("CryptoLib", CRYPTO_CONTRACT_HASH, "sha256", [_bytes_parameter(1024)]),
+    NativeCall("CryptoLib", CRYPTO_CONTRACT_HASH, "ripemd160", [_bytes_parameter(1024)]),
+    NativeCall("CryptoLib", CRYPTO_CONTRACT_HASH, "murmur32",
+               [_bytes_parameter(1024), ContractParameter(type='Integer', value='0')]),
+    NativeCall("Ledger", LEDGER_CONTRACT_HASH, "currentIndex", []),
+    NativeCall("Ledger", LEDGER_CONTRACT_HASH, "currentHash", []),
+    NativeCall("Policy", POLICY_CONTRACT_HASH, "getFeePerByte", []),
+    NativeCall("Policy", POLICY_CONTRACT_HASH, "getExecFeeFactor", []),
+    NativeCall("Policy", POLICY_CONTRACT_HASH, "getStoragePrice", []),
+]
+
+
+# Operation: this benchmark calls the read-only methods of the native contracts(StdLib, CryptoLib, Ledger, Policy)
+#  with `invokefunction` and `invokescript` concurrently.
+# Expect Result: The RPS and latency of each method, and the gas consumed by one call.
+class InvokeBenchmark(Benchmark):
+
+    def __init__(self, requests: int = 1000, concurrency: int = 16):
+        super().__init__("InvokeBenchmark", requests, concurrency)
+
+    def run_test(self):
+        for call in NATIVE_CALLS:
+            self._measure_invoke_function(call)
+            self._measure_invoke_script(call)
+
+    def _measure_invoke_function(self, call: NativeCall):
+        async def invoke(client: AsyncRpcClient, _: int):
+            result = await client.invoke_function(call.script_hash, call.method, call.args)
+            assert result['state'] == 'HALT', f"Expected HALT, got {result}"
+
+        result = self.measure(f"invokefunction/{call.name}", invoke)
+        result.extra['gasconsumed'] = int(self.client.invoke_function(
+            call.script_hash, call.method, call.args)['gasconsumed'])
+
+    def _measure_invoke_script(self, call: NativeCall):
+        script = ScriptBuilder().emit_dynamic_call(
+            call.script_hash, call.method, CallFlags.READ_STATES, call.script_args()).to_bytes()
+
+        async def invoke(client: AsyncRpcClient, _: int):
+            result = await client.invoke_script(script)
+            assert result['state'] == 'HALT', f"Expected HALT, got {result}"
+
+        result = self.measure(f"invokescript/{call.name}", invoke)
+        result.extra['gasconsumed'] = int(self.client.invoke_script(script)['gasconsumed'])
+        result.extra['script_size'] = len(script)
+
+
+# Run with: python3 -B -m benchmarks.invoke
+if __name__ == "__main__":
+    benchmark = InvokeBenchmark()
+    benchmark.run()
@@ -0,0 +1,43 @@
+from neo import CallFlags
+from neo.contract import GAS_CONTRACT_HASH, ScriptBuilder
+from neo.rpc import AsyncRpcClient
+from benchmarks.base import Benchmark
+
+
+# Operation: this benchmark calls `calculatenetworkfee` with a single-signature and a BFT multi-signature transaction.
+# Expect Result: The RPS and latency of `calculatenetworkfee`, and the network fee of each transaction.
+class NetworkFeeBenchmark(Benchmark):
+
+    def __init__(self, requests: int = 1000, concurrency: int = 16):
+        super().__init__("NetworkFeeBenchmark", requests, concurrency)
+
+    def run_test(self):
+        source = self.env.others[0]
+        script = ScriptBuilder().emit_dynamic_call(
+            script_hash=GAS_CONTRACT_HASH,
+            method='transfer',
+            call_flags=(CallFlags.STATES | CallFlags.ALLOW_CALL | CallFlags.ALLOW_NOTIFY),
+            args=[source.script_hash, self.env.others[1].script_hash, 1, None],
+        ).to_bytes()
+
+        block_index = self.client.get_block_index()
+        single_tx = self.make_tx(source, script, self.default_sysfee, self.default_netfee, block_index + 10)
+        self._measure_network_fee("calculatenetworkfee/single-signature", single_tx.to_array())
+
+        multisig_tx = self.make_multisig_tx(script, self.default_sysfee, self.default_netfee, block_index + 10)
+        self._measure_network_fee("calculatenetworkfee/bft-multi-signature", multisig_tx.to_array())
+
+    def _measure_network_fee(self, name: str, raw_tx: bytes):
+        async def calculate(client: AsyncRpcClient, _: int):
+            result = await client.calculate_network_fee(raw_tx)
+            assert 'networkfee' in result, f"Expected networkfee, got {result}"
+
+        result = self.measure(name, calculate)
+        result.extra['networkfee'] = int(self.client.calculate_network_fee(raw_tx)['networkfee'])
+        result.extra['tx_size'] = len(raw_tx)
+
+
+# Run with: python3 -B -m benchmarks.network_fee
+if __name__ == "__main__":
+    benchmark = NetworkFeeBenchmark()
+    benchmark.run()
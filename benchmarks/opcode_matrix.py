@@ -0,0 +1,311 @@
+import statistics
+import sys
+
+from dataclasses import dataclass
+
+from neo import OpCode
+from neo.contract import ScriptBuilder
+from neo.rpc import AsyncRpcClient, RpcError
+from benchmarks.base import Benchmark, BenchmarkResult
+
+
+@dataclass
+class OpcodeCase:
+    opcode: OpCode
+    setup: bytes = b''  # pushes the operands of the opcode
+    inputs: int = 0  # the number of the items pushed by `setup`
+    operand: bytes = b''
+    outputs: int = 0  # the number of the items left by `setup` and the opcode
+    prefix: bytes = b''  # runs once before the opcode, i.e. INITSLOT
+    suffix: bytes = b''  # runs once after the opcode, i.e. the RET of the called function
+    repeatable: bool = True  # whether the opcode can be repeated in one script to measure the latency
+    fault: bool = False  # whether the opcode faults the execution
+
+    def script(self, repeat: int = 1, with_opcode: bool = True, cleanup: bool = True) -> bytes:
+        """
+        The `prefix`, then `repeat` times of the `setup` and the opcode, then the `suffix`.
+        If `with_opcode` is False, the opcode is not emitted, it's the baseline of the opcode.
+        If `cleanup` is True, the items left by each repetition are dropped, so the stack doesn't grow.
+        """
+        unit = self.setup + (bytes([self.opcode]) + self.operand if with_opcode else b'')
+        if cleanup:
+            unit += bytes([OpCode.DROP]) * (self.outputs if with_opcode else self.inputs)
+        return self.prefix + unit * repeat + self.suffix
+
+
+def _push(*items) -> bytes:
+    sb = ScriptBuilder()
+    for item in items:
+        sb.emit_push(item)
+    return sb.to_bytes()
+
+
+def _ops(*opcodes: OpCode) -> bytes:
+    sb = ScriptBuilder()
+    for opcode in opcodes:
+        sb.emit(opcode)
+    return sb.to_bytes()
+
+
+def _case(opcode: OpCode, inputs: list = [], outputs: int = 0, operand: bytes = b'', **kwargs) -> OpcodeCase:
+    return OpcodeCase(opcode, _push(*inputs), len(inputs), operand, outputs, **kwargs)
+
+
+def _raw_case(opcode: OpCode, setup: bytes, inputs: int, outputs: int, operand: bytes = b'', **kwargs) -> OpcodeCase:
+    return OpcodeCase(opcode, setup, inputs, operand, outputs, **kwargs)
+
+
+STATIC_SLOTS = bytes([OpCode.INITSSLOT, 7])
+LOCAL_SLOTS = bytes([OpCode.INITSLOT, 7, 0])
+ARGUMENT_SLOTS = _ops(*[OpCode.PUSH0] * 7) + bytes([OpCode.INITSLOT, 0, 7])
+TYPE_INTEGER = b'\x21'
+TYPE_BYTESTRING = b'\x28'
+
+# The opcodes which cannot be measured in isolation.
+UNSUPPORTED = {
+    OpCode.CALLA: "needs a pointer to a function",
+    OpCode.CALLT: "needs a method token of the contract",
+    OpCode.TRY: "must be paired with ENDTRY",
+    OpCode.TRY_L: "must be paired with ENDTRY",
+    OpCode.ENDTRY: "must be in a try block",
+    OpCode.ENDTRY_L: "must be in a try block",
+    OpCode.ENDFINALLY: "must be in a finally block",
+    OpCode.SYSCALL: "priced by the syscall, see the interop services",
+}
+
+
+def opcode_cases() -> list[OpcodeCase]:
+    cases = [
+        _case(OpCode.PUSHINT8, outputs=1, operand=bytes(1)),
+        _case(OpCode.PUSHINT16, outputs=1, operand=bytes(2)),
+        _case(OpCode.PUSHINT32, outputs=1, operand=bytes(4)),
+        _case(OpCode.PUSHINT64, outputs=1, operand=bytes(8)),
+        _case(OpCode.PUSHINT128, outputs=1, operand=bytes(16)),
+        _case(OpCode.PUSHINT256, outputs=1, operand=bytes(32)),
+        _case(OpCode.PUSHT, outputs=1),
+        _case(OpCode.PUSHF, outputs=1),
+        _case(OpCode.PUSHA, outputs=1, operand=bytes(4)),  # points to itself
+        _case(OpCode.PUSHNULL, outputs=1),
+        _case(OpCode.PUSHDATA1, outputs=1, operand=bytes(1)),
+        _case(OpCode.PUSHDATA2, outputs=1, operand=bytes(2)),
+        _case(OpCode.PUSHDATA4, outputs=1, operand=bytes(4)),
+        _case(OpCode.PUSHM1, outputs=1),
+    ]
+    cases += [_case(OpCode(OpCode.PUSH0 + i), outputs=1) for i in range(17)]
+
+    # Flow control, the jumps are taken and jump to the next instruction, the NOP of the suffix for the last one,
+    # a jump to the end of the script is out of range.
+    end = _ops(OpCode.NOP)
+    cases += [
+        _case(OpCode.NOP),
+        _case(OpCode.JMP, operand=b'\x02', suffix=end),
+        _case(OpCode.JMP_L, operand=(5).to_bytes(4, 'little'), suffix=end),
+        _case(OpCode.JMPIF, [True], operand=b'\x02', suffix=end),
+        _case(OpCode.JMPIF_L, [True], operand=(5).to_bytes(4, 'little'), suffix=end),
+        _case(OpCode.JMPIFNOT, [False], operand=b'\x02', suffix=end),
+        _case(OpCode.JMPIFNOT_L, [False], operand=(5).to_bytes(4, 'little'), suffix=end),
+    ]
+    for (short, long, operands) in [(OpCode.JMPEQ, OpCode.JMPEQ_L, [1, 1]), (OpCode.JMPNE, OpCode.JMPNE_L, [1, 2]),
+                                    (OpCode.JMPGT, OpCode.JMPGT_L, [2, 1]), (OpCode.JMPGE, OpCode.JMPGE_L, [1, 1]),
+                                    (OpCode.JMPLT, OpCode.JMPLT_L, [1, 2]), (OpCode.JMPLE, OpCode.JMPLE_L, [1, 1])]:
+        cases.append(_case(short, operands, operand=b'\x02', suffix=end))
+        cases.append(_case(long, operands, operand=(5).to_bytes(4, 'little'), suffix=end))
+    cases += [
+        # CALL the last RET, it returns to the RET before it.
+        _case(OpCode.CALL, operand=b'\x03', suffix=_ops(OpCode.RET, OpCode.RET), repeatable=False),
+        _case(OpCode.CALL_L, operand=(6).to_bytes(4, 'little'), suffix=_ops(OpCode.RET, OpCode.RET),
+              repeatable=False),
+        _case(OpCode.ABORT, repeatable=False, fault=True),
+        _case(OpCode.ASSERT, [True]),
+        _case(OpCode.THROW, [b'error'], repeatable=False, fault=True),
+        _case(OpCode.RET, repeatable=False),
+    ]
+
+    # Stack
+    cases += [
+        _case(OpCode.DEPTH, outputs=1),
+        _case(OpCode.DROP, [1]),
+        _case(OpCode.NIP, [1, 2], outputs=1),
+        _case(OpCode.XDROP, [1, 2, 1], outputs=1),
+        _case(OpCode.CLEAR, [1, 2]),
+        _case(OpCode.DUP, [1], outputs=2),
+        _case(OpCode.OVER, [1, 2], outputs=3),
+        _case(OpCode.PICK, [1, 0], outputs=2),
+        _case(OpCode.TUCK, [1, 2], outputs=3),
+        _case(OpCode.SWAP, [1, 2], outputs=2),
+        _case(OpCode.ROT, [1, 2, 3], outputs=3),
+        _case(OpCode.ROLL, [1, 2, 1], outputs=2),
+        _case(OpCode.REVERSE3, [1, 2, 3], outputs=3),
+        _case(OpCode.REVERSE4, [1, 2, 3, 4], outputs=4),
+        _case(OpCode.REVERSEN, [1, 2, 2], outputs=2),
+    ]
+
+    # Slots, the slots are initialized once in the prefix.
+    cases += [
+        _case(OpCode.INITSSLOT, operand=b'\x01', repeatable=False),
+        _case(OpCode.INITSLOT, operand=b'\x01\x00', repeatable=False),
+    ]
+    for (load, store, prefix) in [(OpCode.LDSFLD0, OpCode.STSFLD0, STATIC_SLOTS),
+                                  (OpCode.LDLOC0, OpCode.STLOC0, LOCAL_SLOTS),
+                                  (OpCode.LDARG0, OpCode.STARG0, ARGUMENT_SLOTS)]:
+        for i in range(7):
+            cases.append(_case(OpCode(load + i), outputs=1, prefix=prefix))
+            cases.append(_case(OpCode(store + i), [1], prefix=prefix))
+        cases.append(_case(OpCode(load + 7), outputs=1, operand=b'\x00', prefix=prefix))  # LDSFLD, LDLOC, LDARG
+        cases.append(_case(OpCode(store + 7), [1], operand=b'\x00', prefix=prefix))  # STSFLD, STLOC, STARG
+
+    # Splice
+    cases += [
+        _case(OpCode.NEWBUFFER, [1], outputs=1),
+        # MEMCPY(dst: Buffer, dst_index, src, src_index, count)
+        _raw_case(OpCode.MEMCPY, _ops(OpCode.PUSH1, OpCode.NEWBUFFER) + _push(0, b'a', 0, 1), 5, 0),
+        _case(OpCode.CAT, [b'a', b'b'], outputs=1),
+        _case(OpCode.SUBSTR, [b'ab', 0, 1], outputs=1),
+        _case(OpCode.LEFT, [b'ab', 1], outputs=1),
+        _case(OpCode.RIGHT, [b'ab', 1], outputs=1),
+    ]
+
+    # Bitwise logic and arithmetic
+    cases += [_case(opcode, [2], outputs=1) for opcode in [
+        OpCode.INVERT, OpCode.SIGN, OpCode.ABS, OpCode.NEGATE, OpCode.INC, OpCode.DEC, OpCode.SQRT, OpCode.NOT,
+        OpCode.NZ]]
+    cases += [_case(opcode, [2, 1], outputs=1) for opcode in [
+        OpCode.AND, OpCode.OR, OpCode.XOR, OpCode.EQUAL, OpCode.NOTEQUAL, OpCode.ADD, OpCode.SUB, OpCode.MUL,
+        OpCode.DIV, OpCode.MOD, OpCode.POW, OpCode.SHL, OpCode.SHR, OpCode.BOOLAND, OpCode.BOOLOR, OpCode.NUMEQUAL,
+        OpCode.NUMNOTEQUAL, OpCode.LT, OpCode.LE, OpCode.GT, OpCode.GE, OpCode.MIN, OpCode.MAX]]
+    cases += [
+        _case(OpCode.MODMUL, [2, 3, 5], outputs=1),
+        _case(OpCode.MODPOW, [2, 3, 5], outputs=1),
+        _case(OpCode.WITHIN, [1, 0, 2], outputs=1),
+    ]
+
+    # Compound types, the compound item is duplicated if the opcode doesn't push a result.
+    new_array = _ops(OpCode.NEWARRAY0, OpCode.DUP)
+    new_map = _ops(OpCode.NEWMAP, OpCode.DUP)
+    cases += [
+        _case(OpCode.PACKMAP, [0], outputs=1),
+        _case(OpCode.PACKSTRUCT, [0], outputs=1),
+        _case(OpCode.PACK, [0], outputs=1),
+        _raw_case(OpCode.UNPACK, _ops(OpCode.NEWARRAY0), 1, 1),
+        _case(OpCode.NEWARRAY0, outputs=1),
+        _case(OpCode.NEWARRAY, [1], outputs=1),
+        _case(OpCode.NEWARRAY_T, [1], outputs=1, operand=TYPE_INTEGER),
+        _case(OpCode.NEWSTRUCT0, outputs=1),
+        _case(OpCode.NEWSTRUCT, [1], outputs=1),
+        _case(OpCode.NEWMAP, outputs=1),
+        _case(OpCode.SIZE, [b'ab'], outputs=1),
+        _raw_case(OpCode.HASKEY, _ops(OpCode.NEWMAP) + _push(1), 2, 1),
+        _raw_case(OpCode.KEYS, _ops(OpCode.NEWMAP), 1, 1),
+        _raw_case(OpCode.VALUES, _ops(OpCode.NEWMAP), 1, 1),
+        _case(OpCode.PICKITEM, [b'ab', 0], outputs=1),
+        _raw_case(OpCode.APPEND, new_array + _push(1), 3, 1),
+        _raw_case(OpCode.SETITEM, new_map + _push(1, 2), 4, 1),
+        _raw_case(OpCode.REVERSEITEMS, new_array, 2, 1),
+        _raw_case(OpCode.REMOVE, new_map + _push(1), 3, 1),
+        _raw_case(OpCode.CLEARITEMS, new_array, 2, 1),
+        _raw_case(OpCode.POPITEM, _push(1, 1) + _ops(OpCode.PACK), 1, 1),
+    ]
+
+    # Types
+    cases += [
+        _case(OpCode.ISNULL, [1], outputs=1),
+        _case(OpCode.ISTYPE, [1], outputs=1, operand=TYPE_INTEGER),
+        _case(OpCode.CONVERT, [1], outputs=1, operand=TYPE_BYTESTRING),
+        _case(OpCode.ABORTMSG, [b'error'], repeatable=False, fault=True),
+        _case(OpCode.ASSERTMSG, [True, b'error']),
+    ]
+    return cases
+
+
+# Operation: this benchmark walks the `OpCode` enum, and runs each opcode with a minimal valid stack setup via the
+#  batched `invokescript`. The price is the GAS difference of the script with and without the opcode.
+#  The latency is the difference of the scripts which repeat the setup with and without the opcode, per opcode.
+# Expect Result: The price and latency of each opcode, the unsupported opcodes are reported with the reasons.
+class OpcodeMatrix(Benchmark):
+
+    def __init__(self, requests: int = 20, repeat: int = 1000):
+        super().__init__("OpcodeMatrix", requests, 1, warmup=2)
+        self.repeat = repeat
+        self.unsupported: dict[str, str] = {}
+
+    def run_test(self):
+        cases = opcode_cases()
+        covered = {case.opcode for case in cases}
+        for opcode in OpCode:
+            if opcode not in covered:
+                self.unsupported[opcode.name] = UNSUPPORTED.get(opcode, "no stack setup")
+
+        prices = self._measure_prices(cases)
+        missing = [case.opcode.name for case in cases if case.opcode not in prices]
+        assert len(missing) == 0, f"No price of the opcodes: {', '.join(missing)}, the setup of the cases is broken"
+        for case in cases:
+            self._measure_case(case, prices.get(case.opcode))
+
+        self.logger.info("Opcode matrix:\n" + self.table())
+
+    def _measure_prices(self, cases: list[OpcodeCase]) -> dict[OpCode, int]:
+        with self.client.batch() as batch:
+            # No cleanup, or the price includes the different number of DROPs.
+            pendings = [(case, batch.invoke_script(case.script(cleanup=False)),
+                         batch.invoke_script(case.script(with_opcode=False, cleanup=False))) for case in cases]
+
+        prices = {}
+        for (case, with_opcode, without_opcode) in pendings:
+            try:
+                (with_opcode, without_opcode) = (with_opcode.result(), without_opcode.result())
+            except RpcError as e:
+                self.logger.warning(f"Failed to run {case.opcode.name}: {e.message}")
+                continue
+
+            expected = 'FAULT' if case.fault else 'HALT'
+            if with_opcode['state'] != expected or without_opcode['state'] != 'HALT':
+                self.logger.warning(f"Unexpected {case.opcode.name} state: {with_opcode.get('exception')}, "
+                                    f"baseline: {without_opcode.get('exception')}")
+                continue
+            prices[case.opcode] = int(with_opcode['gasconsumed']) - int(without_opcode['gasconsumed'])
+        return prices
+
+    def _measure_case(self, case: OpcodeCase, price: int | None):
+        extra = {"opcode": case.opcode.value}
+        if price is not None:
+            extra['gasconsumed'] = price
+
+        if not case.repeatable or price is None:
+            result = BenchmarkResult(f"opcode/{case.opcode.name}", 0, 0, 0.0, 1, extra=extra)
+            self.results.append(result)
+            return
+
+        script = case.script(self.repeat)
+        baseline = case.script(self.repeat, with_opcode=False)
+
+        async def run_script(client: AsyncRpcClient, _: int):
+            result = await client.invoke_script(script)
+            assert result['state'] == 'HALT', f"Expected HALT, got {result}"
+
+        async def run_baseline(client: AsyncRpcClient, _: int):
+            result = await client.invoke_script(baseline)
+            assert result['state'] == 'HALT', f"Expected HALT, got {result}"
+
+        result = self.measure(f"opcode/{case.opcode.name}", run_script)
+        base = self.measure(f"opcode-baseline/{case.opcode.name}", run_baseline)
+        self.results.remove(base)
+        if len(result.latencies) > 0 and len(base.latencies) > 0:
+            elapsed = statistics.median(result.latencies) - statistics.median(base.latencies)
+            extra['latency_ns'] = round(max(elapsed, 0.0) / self.repeat * 1e9, 1)
+        result.extra = extra
+
+    def table(self) -> str:
+        lines = [f"{'opcode':<12} {'code':>6} {'price':>10} {'latency(ns)':>12}"]
+        for result in self.results:
+            extra = result.extra
+            price = extra.get('gasconsumed', '-')
+            latency = extra.get('latency_ns', '-')
+            lines.append(f"{result.name[len('opcode/'):]:<12} {extra['opcode']:>#6x} {price:>10} {latency:>12}")
+        lines += [f"{name:<12} unsupported: {reason}" for (name, reason) in self.unsupported.items()]
+        return "\n".join(lines)
+
+
+# Run with: python3 -B -m benchmarks.opcode_matrix [requests] [repeat]
+if __name__ == "__main__":
+    matrix = OpcodeMatrix(*[int(arg) for arg in sys.argv[1:3]])
+    matrix.run()
@@ -0,0 +1,70 @@
+import argparse
+import json
+import logging
+import sys
+
+from typing import Callable
+
+from benchmarks.base import Benchmark
+from benchmarks.block import BlockBenchmark
+from benchmarks.finality import FinalityBenchmark
+from benchmarks.gas_profile import GasProfile
+from benchmarks.history import ResultHistory
+from benchmarks.invoke import InvokeBenchmark
+from benchmarks.network_fee import NetworkFeeBenchmark
+from benchmarks.opcode_matrix import OpcodeMatrix
+
+
+# The benchmark name -> the factory of the benchmark with (requests, concurrency)
+BENCHMARKS: dict[str, Callable[[int, int], Benchmark]] = {
+    "invoke": InvokeBenchmark,
+    "network_fee": NetworkFeeBenchmark,
+    "block": BlockBenchmark,
+    "gas_profile": lambda requests, concurrency: GasProfile(),
+    "opcode_matrix": lambda requests, concurrency: OpcodeMatrix(),
+    # sends transactions, the pool accounts must be funded by the initial testcase
+    "finality": lambda requests, concurrency: FinalityBenchmark(),
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the benchmarks and write the results as JSON.")
+    parser.add_argument('--benchmarks', default=','.join(BENCHMARKS),
+                        help="the benchmarks to run, separated by comma or space, i.e. 'invoke,block'")
+    parser.add_argument('--requests', type=int, default=1000, help="the number of requests of each measured case")
+    parser.add_argument('--concurrency', type=int, default=16, help="the number of concurrent requests")
+    parser.add_argument('--output', default='benchmark-results.json', help="the JSON file to write the results")
+    parser.add_argument('--history', default='',
+                        help="append the results to the JSONL history file, i.e. 'benchmark-history.jsonl'")
+    args = parser.parse_args(argv)
+
+    logger = logging.getLogger("BenchmarkRunner")
+    selected = args.benchmarks.replace(',', ' ').split()
+    for name in selected:
+        if name not in BENCHMARKS:
+            logger.error(f"Invalid benchmark: {name}")
+            return 1
+
+    metadata, results = {}, []
+    for name in selected:
+        benchmark = BENCHMARKS[name](args.requests, args.concurrency)
+        benchmark.run()
+        metadata = metadata or benchmark.result_metadata()
+        results.extend(benchmark.results)
+
+    run = {**metadata, "results": [r.as_dict() for r in results]}
+    with open(args.output, 'w') as f:
+        json.dump(run, f, indent=2)
+
+    logger.info("Benchmark results:\n" + "\n".join(r.summary() for r in results))
+    logger.info(f"Results are written to {args.output}")
+    if args.history:
+        run = ResultHistory(args.history).append(run)
+        logger.info(f"Results are appended to {args.history} with key {run['key']}")
+    return 0
+
+
+# Run with: python3 -B -m benchmarks.runner [--benchmarks invoke,block,...] [--requests N] [--concurrency N]
+#  [--output file] [--history file]
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,6 @@
 
+import functools
+import hashlib
 import json
 import os
 from typing import Self
@@ -8,6 +10,15 @@ from dataclasses_json import dataclass_json
 
 from neo import Account
 
+# The order of the secp256r1 curve, the private key must be in range [1, order).
+SECP256R1_ORDER = 0xFFFFFFFF00000000FFFFFFFFFFFFFFFFBCE6FAADA7179E84F3B9CAC2FC632551
+
+
+# Creating an Account derives the public key and the script hash, so the accounts are created once per process.
+@functools.lru_cache(maxsize=None)
+def account_of(private_key: int) -> Account:
+    return Account(private_key=private_key.to_bytes(32, 'big'))
+
 
 # Hardfork config, all hardforks are enabled in default.
 @dataclass_json
@@ -46,16 +57,32 @@ class Env:
     # Whether to enable neo4 features
     neo4_enable: bool = False
 
+    # The seed to derive the pool accounts deterministically. The pool accounts are funded by the initial testcase,
+    # and each running test can lease a distinct one, so the parallel tests don't share balances.
+    account_seed: str = "neo-testcases"
+
+    # The number of the pool accounts, it should be greater than the number of the parallel tests.
+    account_pool_size: int = 16
+
     def is_hardfork_enabled(self, hardfork: str, block_index: int) -> bool:
         return hasattr(self.hardforks, hardfork) and getattr(self.hardforks, hardfork) <= block_index
 
+    def pool_accounts(self) -> list[Account]:
+        accounts = []
+        for index in range(self.account_pool_size):
+            digest = hashlib.sha256(f"{self.account_seed}:{index}".encode('utf-8')).digest()
+            accounts.append(account_of(int.from_bytes(digest, 'big') % (SECP256R1_ORDER - 1) + 1))
+        return accounts
+
     def as_dict(self) -> dict:
         return {
             "rpc_endpoint": self.rpc_endpoint,
             "network": self.network,
             "hardforks": asdict(self.hardforks),
             "validators": ['0x' + v.private_key[::-1].to_hex() for v in self.validators],
-            "others": ['0x' + o.private_key[::-1].to_hex() for o in self.others]
+            "others": ['0x' + o.private_key[::-1].to_hex() for o in self.others],
+            "account_seed": self.account_seed,
+            "account_pool_size": self.account_pool_size,
         }
 
     @classmethod
@@ -70,6 +97,8 @@ class Env:
             rpc_endpoint=data['rpc_endpoint'],
             network=data['network'],
             hardforks=data['hardforks'] if isinstance(data['hardforks'], Hardfork) else Hardfork(**data['hardforks']),
-            validators=[Account(private_key=int(v, 16).to_bytes(32, 'big')) for v in data['validators']],
-            others=[Account(private_key=int(o, 16).to_bytes(32, 'big')) for o in data['others']]
+            validators=[account_of(int(v, 16)) for v in data['validators']],
+            others=[account_of(int(o, 16)) for o in data['others']],
+            account_seed=data.get('account_seed', cls.account_seed),
+            account_pool_size=data.get('account_pool_size', cls.account_pool_size),
         )
@@ -0,0 +1,189 @@
+import atexit
+import base64
+import gzip
+import json
+import os
+import threading
+import time
+
+from typing import Callable
+
+from neo3.network.payloads.transaction import Transaction
+
+RECORD = "record"
+REPLAY = "replay"
+
+# The raw transactions have a random nonce and signatures, so they're matched by the order only.
+_TX_METHODS = {"sendrawtransaction", "calculatenetworkfee"}
+
+# The block index(or hash) of the block queries depends on when the call is made, i.e. the polling of BlockNotifier.
+_BLOCK_METHODS = {"getblock", "getblockheader", "getblockhash"}
+
+
+class CassetteError(Exception):
+    pass
+
+
+def normalize_params(method: str, params: list) -> list:
+    """
+    Replaces the non-deterministic params with placeholders, the calls with the same normalized params are
+    replayed in the recorded order.
+    """
+    if method in _TX_METHODS:
+        return ["<tx>"]
+    if method in _BLOCK_METHODS and len(params) > 0:
+        return ["<block>"] + params[1:]
+    return params
+
+
+def tx_hash_of(raw_tx: bytes) -> str:
+    return '0x' + Transaction.deserialize_from_bytes(raw_tx).hash().to_array()[::-1].hex()
+
+
+class Cassette:
+    """
+    Records the JSON-RPC requests and responses of RpcClient to a file, and replays them without the node,
+    so the assertions of a test can run again in seconds instead of waiting for the blocks. For example:
+
+        client = RpcClient(endpoint, cassette=Cassette("run.jsonl.gz", RECORD))  # or REPLAY
+
+    Or set the environment variable `NEO_RPC_RECORD` or `NEO_RPC_REPLAY` to the cassette path, then all RpcClients
+    in the process share the cassette, see `from_env`.
+
+    The file has one call per line: {"method", "params", "result" or "error", "elapsed", "scope"}, it's gzipped if
+    the path ends with '.gz', and it can be loaded by `StubNode.load_responses` too. The calls are matched by the
+    scope, the method and the normalized params(see `normalize_params`), and the responses of the same call are
+    replayed in the recorded order, the last one is repeated if the call is made more times, i.e. polling the block
+    count. The scope is the `cassette_scope` of the RpcClient, i.e. the test which makes the call, so the calls of
+    the tests running in parallel don't take the responses of each other.
+    The tx hashes of the replayed `sendrawtransaction` are aliased to the recorded ones, so the tx hashes computed
+    by the test are matched too.
+    """
+
+    _shared: dict[str, 'Cassette'] = {}
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, path: str, mode: str) -> 'Cassette':
+        """
+        Returns the cassette of `path` shared in the process, it's closed at exit so the gzip trailer is written.
+        """
+        with cls._shared_lock:
+            if path not in cls._shared:
+                cassette = cls(path, mode)
+                atexit.register(cassette.close)
+                cls._shared[path] = cassette
+            return cls._shared[path]
+
+    @classmethod
+    def from_env(cls) -> 'Cassette | None':
+        record, replay = os.getenv('NEO_RPC_RECORD'), os.getenv('NEO_RPC_REPLAY')
+        if record and replay:
+            raise CassetteError("Only one of NEO_RPC_RECORD and NEO_RPC_REPLAY can be set")
+        if record:
+            return cls.shared(record, RECORD)
+        if replay:
+            return cls.shared(replay, REPLAY)
+        return None
+
+    def __init__(self, path: str, mode: str = REPLAY, speed: float = 0.0,
+                 normalize: Callable[[str, list], list] = normalize_params):
+        """
+        `speed` is the factor of the recorded elapsed time to sleep in replay, 0 for no sleep and 1 for the real time.
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.speed = speed
+        self.normalize = normalize
+        self._lock = threading.Lock()
+        self._file = None
+        self._calls: dict[str, list[dict]] = {}  # the call key -> the recorded responses
+        self._replayed: dict[str, int] = {}  # the call key -> the number of the replayed responses
+        self._aliases: dict[str, str] = {}  # the tx hash in replay -> the recorded tx hash
+
+        if mode == RECORD:
+            self._file = gzip.open(path, 'wt') if path.endswith('.gz') else open(path, 'w')
+        else:
+            with gzip.open(path, 'rt') if path.endswith('.gz') else open(path, 'r') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        key = self._key(entry.get('scope', ''), entry['method'], entry['params'])
+                        self._calls.setdefault(key, []).append(entry)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _key(self, scope: str, method: str, params: list) -> str:
+        params = [self._aliases.get(p, p) if isinstance(p, str) else p for p in params]
+        return f"{scope}:{method}:{json.dumps(self.normalize(method, params), sort_keys=True, separators=(',', ':'))}"
+
+    def record(self, req: dict | list, rsp: dict | list, elapsed: float, scope: str = ""):
+        """
+        Writes the calls of a request(or a batch request) and their responses, the elapsed time of a batch is
+        divided evenly to its calls.
+        """
+        reqs = req if isinstance(req, list) else [req]
+        if isinstance(rsp, list):
+            rsps = {item.get('id'): item for item in rsp}
+        else:  # a single response, or the error of the whole batch
+            rsps = {r.get('id'): rsp for r in reqs}
+
+        lines = []
+        for r in reqs:
+            item = rsps.get(r['id'], {'error': {'code': -32603, 'message': "No response in the batch"}})
+            entry = {'method': r['method'], 'params': r['params']}
+            entry.update({'error': item['error']} if 'error' in item else {'result': item.get('result')})
+            entry['elapsed'] = round(elapsed / len(reqs), 6)
+            if scope:
+                entry['scope'] = scope
+            lines.append(json.dumps(entry, separators=(',', ':')))
+
+        with self._lock:
+            if self._file is None:
+                raise CassetteError(f"The cassette {self.path} is closed or not recording")
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+
+    def replay(self, req: dict | list, scope: str = "") -> dict | list:
+        """
+        Returns the recorded response of a request(or a batch request), raises CassetteError if it's not recorded.
+        """
+        reqs = req if isinstance(req, list) else [req]
+        rsps, elapsed = [], 0.0
+        with self._lock:
+            for r in reqs:
+                entry = self._next(scope, r['method'], r['params'])
+                elapsed += entry.get('elapsed', 0.0)
+                rsp = {'jsonrpc': '2.0', 'id': r['id']}
+                rsp.update({'error': entry['error']} if 'error' in entry else {'result': entry.get('result')})
+                rsps.append(rsp)
+
+        if self.speed > 0:
+            time.sleep(elapsed * self.speed)
+        return rsps if isinstance(req, list) else rsps[0]
+
+    def _next(self, scope: str, method: str, params: list) -> dict:
+        # Must be called with the self._lock locked.
+        key = self._key(scope, method, params)
+        entries = self._calls.get(key)
+        if not entries:
+            raise CassetteError(f"No recorded response for {method} {params} in {self.path}")
+
+        index = self._replayed.get(key, 0)
+        if index >= len(entries) and method in _TX_METHODS:  # a tx is not sent twice
+            raise CassetteError(f"{method} is called more than the {len(entries)} recorded times in {self.path}")
+        self._replayed[key] = index + 1
+        entry = entries[min(index, len(entries) - 1)]
+        if method == "sendrawtransaction" and 'result' in entry:
+            self._aliases[tx_hash_of(base64.b64decode(params[0]))] = entry['result']['hash']
+        return entry
@@ -1,9 +1,12 @@
 
-import hashlib
+import base64
+import functools
 from typing import Self
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 
 from neo import UInt160, CallFlags, OpCode
+from neo.disassembler import iter_instructions
+from neo.interop import INTEROP_CODES, interop_hash
 
 NEO_CONTRACT_HASH = '0xef4073a0f2b305a38ec4050e4d3d28bc40ea63f5'
 GAS_CONTRACT_HASH = '0xd2a4cff31913016155e38e474a2c06d08be276cf'
@@ -40,13 +43,90 @@ class ContractParameter:
     type: str
     value: any
 
-    def to_dict(self):
-        return asdict(self)
+    def to_dict(self) -> dict:
+        # Not `asdict`, it deep-copies the value recursively on every call.
+        return {'type': self.type, 'value': _json_value(self.value)}
+
+
+def _json_value(value: any) -> any:
+    # The RPC JSON of a ContractParameter value, the nested parameters(Array, Map) are converted too.
+    if isinstance(value, ContractParameter):
+        return value.to_dict()
+    if isinstance(value, list) or isinstance(value, tuple):
+        return [_json_value(item) for item in value]
+    if isinstance(value, dict):  # a Map pair, i.e. {'key': ..., 'value': ...}
+        return {k: _json_value(v) for (k, v) in value.items()}
+    if isinstance(value, bytes) or isinstance(value, bytearray):
+        return base64.b64encode(value).decode('utf-8')
+    if hasattr(value, 'to_array'):
+        return str(value)  # UInt160, UInt256, ECPoint
+    return value
+
+
+def _hash_bytes(value: str | bytes, size: int) -> bytes:
+    # The little-endian bytes of a Hash160 or Hash256, the string is big-endian hex with optional '0x' prefix.
+    if isinstance(value, str):
+        value = bytes.fromhex(value[2:] if value.startswith('0x') else value)[::-1]
+    elif not isinstance(value, bytes):
+        value = value.to_array()  # UInt160, UInt256
+    if len(value) != size:
+        raise ValueError(f"Expected {size} bytes hash, got {len(value)}")
+    return value
+
+
+def parameters_of_script(script: bytes | bytearray | memoryview) -> list[ContractParameter]:
+    """
+    Decodes a push-only script, i.e. the arguments part of `emit_dynamic_call`, into the pushed ContractParameters
+    from the bottom to the top of the stack. The byte strings are decoded as ByteArray, because the push opcodes
+    don't keep the type, so a Hash160, PublicKey or String is decoded as ByteArray too.
+    Raises ValueError if the script has an opcode other than the push, PACK, PACKMAP, NEWARRAY0 and NEWMAP.
+    """
+    stack: list[ContractParameter] = []
+
+    def pop_count(offset: int) -> int:
+        if len(stack) == 0 or stack[-1].type != 'Integer' or stack[-1].value < 0 or stack[-1].value > len(stack) - 1:
+            raise ValueError(f"Invalid item count at offset {offset}")
+        return stack.pop().value
+
+    for instruction in iter_instructions(script):
+        op = instruction.opcode
+        if op <= OpCode.PUSHINT256:
+            stack.append(ContractParameter('Integer', instruction.operand_int()))
+        elif op == OpCode.PUSHT or op == OpCode.PUSHF:
+            stack.append(ContractParameter('Boolean', op == OpCode.PUSHT))
+        elif op == OpCode.PUSHNULL:
+            stack.append(ContractParameter('Any', None))
+        elif op == OpCode.PUSHDATA1 or op == OpCode.PUSHDATA2 or op == OpCode.PUSHDATA4:
+            stack.append(ContractParameter('ByteArray', base64.b64encode(instruction.operand).decode('utf-8')))
+        elif OpCode.PUSHM1 <= op <= OpCode.PUSH16:
+            stack.append(ContractParameter('Integer', op - OpCode.PUSH0))
+        elif op == OpCode.NEWARRAY0:
+            stack.append(ContractParameter('Array', []))
+        elif op == OpCode.NEWMAP:
+            stack.append(ContractParameter('Map', []))
+        elif op == OpCode.PACK:  # the top item is the first one
+            count = pop_count(instruction.offset)
+            items = stack[len(stack) - count:]
+            del stack[len(stack) - count:]
+            stack.append(ContractParameter('Array', items[::-1]))
+        elif op == OpCode.PACKMAP:  # the key is above its value
+            count = pop_count(instruction.offset)
+            if 2 * count > len(stack):
+                raise ValueError(f"Invalid map size at offset {instruction.offset}")
+            pairs = []
+            for _ in range(count):
+                key = stack.pop()
+                pairs.append({'key': key, 'value': stack.pop()})
+            stack.append(ContractParameter('Map', pairs))
+        else:
+            raise ValueError(f"Unsupported opcode {op.name} at offset {instruction.offset}")
+    return stack
 
 
 def syscall_code(syscall_name: str) -> int:
-    # first 4 bytes of the sha256 hash of the syscall name
-    return int.from_bytes(hashlib.sha256(syscall_name.encode('utf-8')).digest()[:4], 'little')
+    # the `System.*` syscalls are precomputed, the others are hashed once and cached
+    code = INTEROP_CODES.get(syscall_name)
+    return code if code is not None else interop_hash(syscall_name)
 
 
 class ScriptBuilder:
@@ -123,10 +203,61 @@ class ScriptBuilder:
             if not isinstance(item, bytes):
                 raise ValueError(f"Unsupported item type: {type(item)}")
             self.emit_push_bytes(item)
-        else:  # TODO: ContractParameter
+        elif isinstance(item, ContractParameter):
+            self.emit_push_parameter(item)
+        else:
             raise ValueError(f"Unsupported item type: {type(item)}")
         return self
 
+    def emit_push_parameter(self, param: ContractParameter) -> Self:
+        """
+        Pushes the ContractParameter as the node does for `invokefunction`, the value is in the RPC JSON form,
+        i.e. base64 for ByteArray, hex for PublicKey, '0x'-prefixed hex for Hash160, or the raw bytes and types.
+        """
+        (kind, value) = (param.type, param.value)
+        if value is None:
+            self.emit(0x0B)  # PUSHNULL
+        elif kind == 'Integer':
+            self.emit_push_int(int(value))
+        elif kind == 'Boolean':
+            self.emit(0x08 if (value if isinstance(value, bool) else str(value).lower() == 'true') else 0x09)
+        elif kind == 'ByteArray' or kind == 'Signature':
+            self.emit_push_bytes(base64.b64decode(value) if isinstance(value, str) else value)
+        elif kind == 'String':
+            self.emit_push_bytes(value.encode('utf-8'))
+        elif kind == 'Hash160':
+            self.emit_push_bytes(_hash_bytes(value, 20))
+        elif kind == 'Hash256':
+            self.emit_push_bytes(_hash_bytes(value, 32))
+        elif kind == 'PublicKey':
+            self.emit_push_bytes(bytes.fromhex(value) if isinstance(value, str) else bytes(value.to_array()))
+        elif kind == 'Array':
+            self.emit_push_array(value)
+        elif kind == 'Map':
+            self.emit_push_map(value)
+        else:
+            raise ValueError(f"Unsupported parameter type: {kind}")
+        return self
+
+    def emit_push_map(self, pairs: list[dict | tuple] | dict) -> Self:
+        """
+        Pushes a Map, the pairs are `{'key': ..., 'value': ...}` as in the RPC JSON, or (key, value) tuples,
+        or a dict.
+        """
+        if isinstance(pairs, dict):
+            pairs = list(pairs.items())
+        if len(pairs) == 0:
+            self.emit(0xC8)  # NEWMAP
+            return self
+
+        for pair in reversed(pairs):  # in reverse order, the value first and then the key
+            (key, value) = (pair['key'], pair['value']) if isinstance(pair, dict) else pair
+            self.emit_push(value)
+            self.emit_push(key)
+        self.emit_push_int(len(pairs))
+        self.emit(0xBE)  # PACKMAP
+        return self
+
     def emit_push_array(self, array: list | tuple) -> Self:
         if len(array) == 0:
             self.emit(0xC2)  # NEWARRAY0
@@ -141,10 +272,8 @@ class ScriptBuilder:
     def emit_dynamic_call(
             self, script_hash: str | UInt160, method: str, call_flags: int | CallFlags, args: list | tuple = []) -> Self:
         self.emit_push_array(args)
-        self.emit_push_int(call_flags if isinstance(call_flags, int) else call_flags.value)
-        self.emit_push(method)
-        self.emit_push(UInt160.from_string(script_hash) if isinstance(script_hash, str) else script_hash)
-        self.emit_syscall('System.Contract.Call')
+        self._script.extend(_dynamic_call_suffix(
+            script_hash if isinstance(script_hash, str) else script_hash.to_array(), method, int(call_flags)))
         return self
 
     def emit_syscall(self, syscall: int | str, args: list | tuple = []) -> Self:
@@ -158,3 +287,59 @@ class ScriptBuilder:
 
     def to_bytes(self):
         return bytes(self._script)
+
+
+@functools.lru_cache(maxsize=1024)
+def _dynamic_call_suffix(script_hash: str | bytes, method: str, call_flags: int) -> bytes:
+    # The part of `emit_dynamic_call` after the arguments: the call flags, the method, the script hash and the syscall.
+    sb = ScriptBuilder().emit_push_int(call_flags).emit_push(method)
+    sb.emit_push_bytes(UInt160.from_string(script_hash).to_array() if isinstance(script_hash, str) else script_hash)
+    sb.emit_syscall('System.Contract.Call')
+    return sb.to_bytes()
+
+
+class CallTemplate:
+    """
+    The precompiled `emit_dynamic_call` of the same (script_hash, method, call_flags), only the arguments are encoded
+    for each call, and the script is built in a reused buffer. For example, building the transfer scripts:
+
+        transfer = CallTemplate(GAS_CONTRACT_HASH, 'transfer', CallFlags.STATES | CallFlags.ALLOW_CALL)
+        scripts = [transfer.build([source, dest, amount, None]) for (source, dest) in pairs]
+
+    It's not thread-safe, use a template per thread.
+    """
+
+    def __init__(self, script_hash: str | UInt160, method: str, call_flags: int | CallFlags):
+        self._suffix = _dynamic_call_suffix(
+            script_hash if isinstance(script_hash, str) else script_hash.to_array(), method, int(call_flags))
+        self._builder = ScriptBuilder()
+
+    def build(self, args: list | tuple = []) -> bytes:
+        sb = self._builder
+        script = sb._script
+        del script[:]
+        if len(args) == 0:
+            script.append(0xC2)  # NEWARRAY0
+        else:
+            for item in reversed(args):  # the fast paths of `emit_push` for the common arguments
+                kind = type(item)
+                if item is None:
+                    script.append(0x0B)  # PUSHNULL
+                elif kind is int and -1 <= item <= 16:
+                    script.append(0x10 + item)  # PUSHM1, PUSH0, ..., PUSH16
+                elif kind is UInt160:
+                    script += b'\x0c\x14'  # PUSHDATA1 20
+                    script += item.to_array()
+                elif kind is bytes and len(item) <= 0xFF:
+                    script.append(0x0C)  # PUSHDATA1
+                    script.append(len(item))
+                    script += item
+                else:
+                    sb.emit_push(item)
+            sb.emit_push_int(len(args))
+            script.append(0xC0)  # PACK
+        script += self._suffix
+        return bytes(script)
+
+    def build_many(self, args_list: list[list | tuple]) -> list[bytes]:
+        return [self.build(args) for args in args_list]
@@ -0,0 +1,110 @@
+import base64
+
+from dataclasses import dataclass
+from typing import Iterator
+
+from neo.interop import syscall_name
+from neo.opcode import OPCODES, OPERAND_SIZE, OPERAND_SIZE_PREFIX, OpCode
+
+
+class DisassembleError(ValueError):
+    def __init__(self, offset: int, message: str):
+        super().__init__(f"Invalid script at offset {offset}: {message}")
+        self.offset = offset
+
+
+@dataclass(slots=True)
+class Instruction:
+    offset: int  # the offset of the instruction in the script
+    opcode: OpCode
+    operand: memoryview  # the operand without the size prefix, it's a view of the script
+    size: int  # the size of the instruction, includes the opcode, the size prefix and the operand
+
+    @property
+    def next_offset(self) -> int:
+        return self.offset + self.size
+
+    def operand_int(self) -> int:
+        """
+        The operand as a little-endian signed integer, i.e. the value of PUSHINT* or the offset of JMP*.
+        """
+        return int.from_bytes(self.operand, 'little', signed=True)
+
+    def jump_target(self) -> int:
+        """
+        The target offset of the JMP*, CALL*, ENDTRY* and PUSHA, the operand is an offset from this instruction.
+        """
+        return self.offset + self.operand_int()
+
+    def __str__(self) -> str:
+        if self.opcode == OpCode.SYSCALL:
+            name = syscall_name(self.operand)
+            if name is not None:
+                return f"{self.offset:04} SYSCALL {name}"
+        if len(self.operand) == 0:
+            return f"{self.offset:04} {self.opcode.name}"
+        return f"{self.offset:04} {self.opcode.name} {self.operand.hex()}"
+
+
+def iter_instructions(script: bytes | bytearray | memoryview) -> Iterator[Instruction]:
+    """
+    Decodes the script into instructions without copying, the operands are views of the script.
+    Raises DisassembleError if an opcode is invalid or an operand is out of the script.
+    """
+    view = script if isinstance(script, memoryview) else memoryview(script)
+    offset = 0
+    while offset < len(view):
+        instruction = decode_instruction(view, offset)
+        yield instruction
+        offset = instruction.next_offset
+
+
+def decode_instruction(script: memoryview, offset: int) -> Instruction:
+    """
+    Decodes the instruction at the offset, the offset needn't be at an instruction boundary of `iter_instructions`,
+    i.e. the target of a jump. Raises DisassembleError as `iter_instructions`.
+    """
+    end = len(script)
+    if offset < 0 or offset >= end:
+        raise DisassembleError(offset, "offset out of script")
+
+    op = script[offset]
+    opcode = OPCODES[op]
+    if opcode is None:
+        raise DisassembleError(offset, f"invalid opcode 0x{op:02x}")
+
+    start = offset + 1
+    prefix = OPERAND_SIZE_PREFIX[op]
+    if prefix > 0:
+        if start + prefix > end:
+            raise DisassembleError(offset, f"{opcode.name} size prefix out of script")
+        size = int.from_bytes(script[start:start + prefix], 'little')
+        start += prefix
+    else:
+        size = OPERAND_SIZE[op]
+
+    if start + size > end:
+        raise DisassembleError(offset, f"{opcode.name} operand out of script")
+    return Instruction(offset, opcode, script[start:start + size], start + size - offset)
+
+
+def disassemble(script: bytes | bytearray | memoryview) -> list[Instruction]:
+    return list(iter_instructions(script))
+
+
+def format_script(script: bytes | bytearray | memoryview) -> str:
+    return "\n".join(str(instruction) for instruction in iter_instructions(script))
+
+
+def block_tx_scripts(block: dict) -> Iterator[tuple[str, bytes]]:
+    """
+    The (tx hash, script) of the transactions in a verbose block from `getblock`.
+    """
+    for tx in block.get('tx', []):
+        yield tx['hash'], base64.b64decode(tx['script'])
+
+
+# Run with: python3 -B -m neo.disassembler <base64-script>
+if __name__ == "__main__":
+    import sys
+    print(format_script(base64.b64decode(sys.argv[1])))
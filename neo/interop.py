@@ -0,0 +1,68 @@
+import functools
+import hashlib
+
+# The `System.*` interop services of neo N3, the SYSCALL operand is the id of the service name.
+SYSCALLS = [
+    "System.Contract.Call",
+    "System.Contract.CallNative",
+    "System.Contract.GetCallFlags",
+    "System.Contract.CreateStandardAccount",
+    "System.Contract.CreateMultisigAccount",
+    "System.Contract.NativeOnPersist",
+    "System.Contract.NativePostPersist",
+    "System.Crypto.CheckSig",
+    "System.Crypto.CheckMultisig",
+    "System.Iterator.Next",
+    "System.Iterator.Value",
+    "System.Runtime.Platform",
+    "System.Runtime.GetNetwork",
+    "System.Runtime.GetAddressVersion",
+    "System.Runtime.GetTrigger",
+    "System.Runtime.GetTime",
+    "System.Runtime.GetScriptContainer",
+    "System.Runtime.GetExecutingScriptHash",
+    "System.Runtime.GetCallingScriptHash",
+    "System.Runtime.GetEntryScriptHash",
+    "System.Runtime.LoadScript",
+    "System.Runtime.CheckWitness",
+    "System.Runtime.GetInvocationCounter",
+    "System.Runtime.GetRandom",
+    "System.Runtime.Log",
+    "System.Runtime.Notify",
+    "System.Runtime.GetNotifications",
+    "System.Runtime.GasLeft",
+    "System.Runtime.BurnGas",
+    "System.Runtime.CurrentSigners",
+    "System.Storage.GetContext",
+    "System.Storage.GetReadOnlyContext",
+    "System.Storage.AsReadOnly",
+    "System.Storage.Get",
+    "System.Storage.Find",
+    "System.Storage.Put",
+    "System.Storage.Delete",
+    "System.Storage.Local.Get",  # since HF_Faun
+    "System.Storage.Local.Find",  # since HF_Faun
+    "System.Storage.Local.Put",  # since HF_Faun
+    "System.Storage.Local.Delete",  # since HF_Faun
+]
+
+
+@functools.lru_cache(maxsize=None)
+def interop_hash(name: str) -> int:
+    # first 4 bytes of the sha256 hash of the syscall name
+    return int.from_bytes(hashlib.sha256(name.encode('utf-8')).digest()[:4], 'little')
+
+
+# The syscall name -> id, and the id -> name.
+INTEROP_CODES: dict[str, int] = {name: interop_hash(name) for name in SYSCALLS}
+INTEROP_NAMES: dict[int, str] = {code: name for (name, code) in INTEROP_CODES.items()}
+
+
+def syscall_name(code: int | bytes | memoryview) -> str | None:
+    """
+    The name of the syscall id, the id can be the 4-bytes little-endian SYSCALL operand.
+    Returns None if the id is not a known `System.*` service.
+    """
+    if not isinstance(code, int):
+        code = int.from_bytes(code, 'little')
+    return INTEROP_NAMES.get(code)
@@ -0,0 +1,118 @@
+import logging
+import threading
+import time
+
+from neo.contract import POLICY_CONTRACT_HASH
+from neo.rpc import RpcClient, RpcError
+
+
+class BlockNotifier:
+    """
+    Wakes up the waiters as soon as a new block arrives. The RpcServer plugin has no notification endpoint,
+    so one background thread polls `getblockcount` for all waiters of the same endpoint in the process.
+
+    The polling is adaptive: the thread sleeps until the next block is expected(the last block time plus the
+    `MillisecondsPerBlock`), then polls every `fast_poll_interval` seconds until the block arrives.
+    """
+
+    _shared: dict[str, 'BlockNotifier'] = {}
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, endpoint: str) -> 'BlockNotifier':
+        with cls._shared_lock:
+            if endpoint not in cls._shared:
+                cls._shared[endpoint] = cls(endpoint)
+            return cls._shared[endpoint]
+
+    def __init__(self, endpoint: str, fast_poll_interval: float = 0.05, max_poll_interval: float = 1.0,
+                 idle_timeout: float = 60.0):
+        self._client = RpcClient(endpoint, pool_size=1)
+        self._fast_poll_interval = fast_poll_interval
+        self._max_poll_interval = max_poll_interval
+        self._idle_timeout = idle_timeout
+        self._logger = logging.getLogger("BlockNotifier")
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._waiters = 0
+        self._idle_since = time.monotonic()
+        self._block_index = -1
+        self._block_time = 0.0  # the timestamp of the latest block, in seconds
+        self._ms_per_block = 0
+
+    @property
+    def block_index(self) -> int:
+        with self._cond:
+            return self._block_index
+
+    def wait_for_block(self, block_index: int, timeout: float) -> int:
+        """
+        Waits until the block at `block_index` is persisted, and returns the latest block index.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._waiters += 1
+            try:
+                self._ensure_started()
+                while self._block_index < block_index:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"Timeout waiting for block {block_index} after {timeout}s")
+                    self._cond.wait(remaining)
+                return self._block_index
+            finally:
+                self._waiters -= 1
+                if self._waiters == 0:
+                    self._idle_since = time.monotonic()
+
+    def _ensure_started(self):
+        # Must be called with the self._cond locked.
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._poll_blocks, name="BlockNotifier", daemon=True)
+            self._thread.start()
+
+    def _poll_blocks(self):
+        while True:
+            with self._cond:
+                if self._waiters == 0 and time.monotonic() - self._idle_since > self._idle_timeout:
+                    self._thread = None
+                    return
+
+            try:
+                block_index = self._client.get_block_index()
+                if block_index > self._block_index:
+                    self._on_new_block(block_index)
+            except Exception as e:  # the node may be restarting, keep polling
+                self._logger.warning(f"Failed to poll block count: {e}")
+                time.sleep(self._max_poll_interval)
+                continue
+
+            time.sleep(self._next_poll_delay())
+
+    def _on_new_block(self, block_index: int):
+        with self._client.batch() as batch:
+            header = batch.get_block_header(block_index, True)
+            ms_per_block = batch.invoke_function(POLICY_CONTRACT_HASH, "getMillisecondsPerBlock", [])
+
+        block_time = header.result()['time'] / 1000.0
+        try:
+            result = ms_per_block.result()
+            ms_per_block = int(result['stack'][0]['value']) if result.get('state') == 'HALT' else 0
+        except RpcError:
+            ms_per_block = 0
+
+        if ms_per_block <= 0 and self._ms_per_block <= 0:  # before HF_Echidna, it's in the protocol settings
+            ms_per_block = int(self._client.get_version()['protocol']['msperblock'])
+
+        with self._cond:
+            self._block_index = block_index
+            self._block_time = block_time
+            if ms_per_block > 0:
+                self._ms_per_block = ms_per_block
+            self._cond.notify_all()
+
+    def _next_poll_delay(self) -> float:
+        with self._cond:
+            expected = self._block_time + self._ms_per_block / 1000.0
+        remaining = expected - time.time()
+        return min(max(remaining, self._fast_poll_interval), self._max_poll_interval)
@@ -933,3 +933,27 @@ class OpCode(IntEnum):
     # The top item should be string or can be converted to string.
     # The execution will be faulted if the top item is not string or cannot be converted to string.
     ASSERTMSG = 0xE1
+
+
+# The operand layout of the opcodes, it's the `OperandSizeAttribute` in neo-vm.
+# The operand is `OPERAND_SIZE[op]` bytes if `OPERAND_SIZE_PREFIX[op]` is 0, otherwise the operand is a
+# `OPERAND_SIZE_PREFIX[op]`-bytes little-endian unsigned size followed by the data of the size.
+_OPERAND_SIZES = {
+    OpCode.PUSHINT8: 1, OpCode.PUSHINT16: 2, OpCode.PUSHINT32: 4, OpCode.PUSHINT64: 8,
+    OpCode.PUSHINT128: 16, OpCode.PUSHINT256: 32, OpCode.PUSHA: 4,
+    OpCode.JMP: 1, OpCode.JMP_L: 4, OpCode.JMPIF: 1, OpCode.JMPIF_L: 4, OpCode.JMPIFNOT: 1, OpCode.JMPIFNOT_L: 4,
+    OpCode.JMPEQ: 1, OpCode.JMPEQ_L: 4, OpCode.JMPNE: 1, OpCode.JMPNE_L: 4, OpCode.JMPGT: 1, OpCode.JMPGT_L: 4,
+    OpCode.JMPGE: 1, OpCode.JMPGE_L: 4, OpCode.JMPLT: 1, OpCode.JMPLT_L: 4, OpCode.JMPLE: 1, OpCode.JMPLE_L: 4,
+    OpCode.CALL: 1, OpCode.CALL_L: 4, OpCode.CALLT: 2,
+    OpCode.TRY: 2, OpCode.TRY_L: 8, OpCode.ENDTRY: 1, OpCode.ENDTRY_L: 4, OpCode.SYSCALL: 4,
+    OpCode.INITSSLOT: 1, OpCode.INITSLOT: 2, OpCode.LDSFLD: 1, OpCode.STSFLD: 1, OpCode.LDLOC: 1, OpCode.STLOC: 1,
+    OpCode.LDARG: 1, OpCode.STARG: 1, OpCode.NEWARRAY_T: 1, OpCode.ISTYPE: 1, OpCode.CONVERT: 1,
+}
+_OPERAND_SIZE_PREFIXES = {OpCode.PUSHDATA1: 1, OpCode.PUSHDATA2: 2, OpCode.PUSHDATA4: 4}
+
+_VALID_OPCODES = {op.value for op in OpCode}
+
+# The 256-entries tables indexed by the opcode byte, `OPCODES[op]` is None if the byte is not a valid opcode.
+OPCODES: tuple[OpCode | None, ...] = tuple(OpCode(op) if op in _VALID_OPCODES else None for op in range(256))
+OPERAND_SIZE: tuple[int, ...] = tuple(_OPERAND_SIZES.get(op, 0) for op in range(256))
+OPERAND_SIZE_PREFIX: tuple[int, ...] = tuple(_OPERAND_SIZE_PREFIXES.get(op, 0) for op in range(256))
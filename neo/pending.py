@@ -0,0 +1,46 @@
+from typing import Callable, Self
+
+# The JSON-RPC error and the result of a batched call, they have no HTTP dependencies, so the local VM uses them too.
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str):
+        self.code = code
+        self.message = message
+
+
+class RpcPending:
+    """
+    The result of a call in a JSON-RPC batch. It's available after the batch is sent.
+    """
+
+    def __init__(self, method: str):
+        self.method = method
+        self._done = False
+        self._result = None
+        self._error: RpcError | None = None
+        self._transform: Callable[[any], any] | None = None
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def set_result(self, result: any):
+        self._result = result
+        self._done = True
+
+    def set_error(self, error: RpcError):
+        self._error = error
+        self._done = True
+
+    def then(self, transform: Callable[[any], any]) -> Self:
+        previous = self._transform
+        self._transform = transform if previous is None else lambda x: transform(previous(x))
+        return self
+
+    def result(self) -> any:
+        if not self._done:
+            raise RuntimeError(f"The batch of '{self.method}' is not sent yet")
+        if self._error is not None:
+            raise self._error
+        return self._result if self._transform is None else self._transform(self._result)
@@ -1,39 +1,120 @@
-
+import asyncio
+import threading
+import time
 import requests
 import base64
 
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+if TYPE_CHECKING:
+    import aiohttp
+
 from neo import UInt160
+from neo.cassette import Cassette
 from neo.contract import ContractParameter, GAS_CONTRACT_HASH, NEO_CONTRACT_HASH
+from neo.pending import RpcError, RpcPending
 
 
-class RpcError(Exception):
-    def __init__(self, code: int, message: str):
-        self.code = code
-        self.message = message
+@dataclass
+class RpcLatency:
+    calls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
 
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls > 0 else 0.0
 
-class RpcClient:
-    def __init__(self, endpoint: str):
-        self._endpoint = endpoint
-        self._id = 0
+    def record(self, elapsed: float):
+        self.calls += 1
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
 
-    def send(self, method: str, params: list):
-        self._id += 1
-        req = {
-            "jsonrpc": "2.0",
-            "id": self._id,
-            "method": method,
-            "params": params
-        }
 
-        endpoint = self._endpoint
-        if not endpoint.startswith("http") and not endpoint.startswith("https"):
-            endpoint = f"http://{endpoint}"
+class RpcStats:
+    """
+    Per-method latency counters of the RPC calls, it's thread-safe.
+    """
 
-        rsp = requests.post(endpoint, json=req).json()
-        if 'error' in rsp:
-            raise RpcError(rsp['error']['code'], rsp['error']['message'])
-        return rsp['result'] if 'result' in rsp else None
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._methods: dict[str, RpcLatency] = {}
+
+    def record(self, method: str, elapsed: float):
+        with self._lock:
+            self._methods.setdefault(method, RpcLatency()).record(elapsed)
+
+    def snapshot(self) -> dict[str, RpcLatency]:
+        with self._lock:
+            return {k: RpcLatency(v.calls, v.total_seconds, v.max_seconds) for k, v in self._methods.items()}
+
+    def total(self) -> RpcLatency:
+        total = RpcLatency()
+        for latency in self.snapshot().values():
+            total.calls += latency.calls
+            total.total_seconds += latency.total_seconds
+            total.max_seconds = max(total.max_seconds, latency.max_seconds)
+        return total
+
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+
+    def summary(self) -> str:
+        lines = []
+        for method, latency in sorted(self.snapshot().items(), key=lambda x: -x[1].total_seconds):
+            lines.append(f"{method}: calls={latency.calls}, total={latency.total_seconds:.3f}s, "
+                         f"mean={latency.mean_seconds * 1000:.2f}ms, max={latency.max_seconds * 1000:.2f}ms")
+        return "\n".join(lines)
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    if not endpoint.startswith("http://") and not endpoint.startswith("https://"):
+        endpoint = f"http://{endpoint}"
+    return endpoint
+
+
+# The methods which change the chain, they must not be retried if the node may have processed them.
+NON_IDEMPOTENT_METHODS = {"sendrawtransaction", "submitblock"}
+
+
+def _changes_chain(req: dict | list) -> bool:
+    reqs = req if isinstance(req, list) else [req]
+    return any(r['method'] in NON_IDEMPOTENT_METHODS for r in reqs)
+
+
+def _session_of(pool_size: int, retries: int, backoff_factor: float, status_forcelist: tuple) -> requests.Session:
+    retry = Retry(total=retries, connect=retries, read=0, status=retries, other=0,
+                  status_forcelist=status_forcelist, allowed_methods=None,
+                  backoff_factor=backoff_factor, raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _first_int(result: dict) -> int:
+    # The integer on the top of the result stack of an invocation, i.e. `balanceOf`.
+    return int(result['stack'][0]['value'])
+
+
+class RpcMethods:
+    """
+    The RPC methods which are built from the method name and the params only, they're shared by RpcClient,
+    RpcBatch and AsyncRpcClient. The result is what `send` returns: the result for RpcClient, a RpcPending for
+    RpcBatch and an awaitable for AsyncRpcClient.
+    """
+
+    def send(self, method: str, params: list):
+        raise NotImplementedError
+
+    def _balance_of(self, token: str, account: str | UInt160):
+        account = str(account) if isinstance(account, UInt160) else account
+        return self.invoke_function(token, "balanceOf", [ContractParameter(type="Hash160", value=account)])
 
     def get_block(self, block_hash_or_index: str | int, verbose: bool = False) -> dict:
         return self.send("getblock", [block_hash_or_index, verbose])
@@ -41,9 +122,6 @@ class RpcClient:
     def get_block_count(self) -> int:
         return self.send("getblockcount", [])
 
-    def get_block_index(self) -> int:
-        return self.send("getblockcount", []) - 1
-
     def get_block_hash(self, index: int) -> str:
         return self.send("getblockhash", [index])
 
@@ -60,18 +138,6 @@ class RpcClient:
         address = str(address) if isinstance(address, UInt160) else address
         return self.send("getwalletbalance", [address])
 
-    def get_neo_balance(self, account: str | UInt160) -> int:
-        account = str(account) if isinstance(account, UInt160) else account
-        result = self.invoke_function(NEO_CONTRACT_HASH, "balanceOf", [
-                                      ContractParameter(type="Hash160", value=account)])
-        return int(result['stack'][0]['value'])
-
-    def get_gas_balance(self, account: str | UInt160) -> int:
-        account = str(account) if isinstance(account, UInt160) else account
-        result = self.invoke_function(GAS_CONTRACT_HASH, "balanceOf",
-                                      [ContractParameter(type="Hash160", value=account)])
-        return int(result['stack'][0]['value'])
-
     def invoke_function(
             self, script_hash: str | UInt160, method: str, args: list[ContractParameter | dict] = []) -> any:
         script_hash = str(script_hash) if isinstance(script_hash, UInt160) else script_hash
@@ -95,3 +161,304 @@ class RpcClient:
         From Plugin ApplicationLogs.
         """
         return self.send("getapplicationlog", [tx_hash, trigger_type])
+
+    def get_transaction_height(self, tx_hash: str) -> int:
+        return self.send("gettransactionheight", [tx_hash])
+
+
+class RpcClient(RpcMethods):
+    """
+    JSON-RPC client of the RpcServer plugin.
+    The HTTP connections are kept alive and pooled, so the RPC calls don't pay for the TCP handshake every time.
+    Only the failed connections and the 502/503/504 responses are retried. A 502 or 504 from a proxy may come after
+    the node has processed the request, so the calls which change the chain(i.e. `sendrawtransaction`) are sent in
+    another session which retries the failed connections and the 503 only, they're not sent twice.
+    The calls are recorded to or replayed from the `cassette`, or the one from the environment variables,
+    see `Cassette.from_env`, in the `cassette_scope` which keeps apart the calls of the clients sharing the cassette.
+    """
+
+    def __init__(self, endpoint: str, pool_size: int = 10, timeout: float = 30.0,
+                 retries: int = 3, backoff_factor: float = 0.2, cassette: Cassette | None = None,
+                 cassette_scope: str = ""):
+        self._endpoint = normalize_endpoint(endpoint)
+        self._id = 0
+        self._id_lock = threading.Lock()
+        self._timeout = timeout
+        self._cassette = cassette if cassette is not None else Cassette.from_env()
+        self._cassette_scope = cassette_scope
+        self.stats = RpcStats()
+
+        self._session = _session_of(pool_size, retries, backoff_factor, (502, 503, 504))
+        self._send_session = _session_of(pool_size, retries, backoff_factor, (503,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._session.close()
+        self._send_session.close()
+
+    def _next_id(self) -> int:
+        with self._id_lock:
+            self._id += 1
+            return self._id
+
+    def _post(self, method: str, req: dict | list) -> dict | list:
+        start = time.perf_counter()
+        try:
+            if self._cassette is not None and self._cassette.replaying:
+                return self._cassette.replay(req, self._cassette_scope)
+            session = self._send_session if _changes_chain(req) else self._session
+            rsp = session.post(self._endpoint, json=req, timeout=self._timeout).json()
+            if self._cassette is not None:
+                self._cassette.record(req, rsp, time.perf_counter() - start, self._cassette_scope)
+            return rsp
+        finally:
+            self.stats.record(method, time.perf_counter() - start)
+
+    def send(self, method: str, params: list):
+        req = {
+            "jsonrpc": "2.0",
+            "id": self._next_id(),
+            "method": method,
+            "params": params
+        }
+
+        rsp = self._post(method, req)
+        if 'error' in rsp:
+            raise RpcError(rsp['error']['code'], rsp['error']['message'])
+        return rsp['result'] if 'result' in rsp else None
+
+    def send_batch(self, calls: list[tuple[str, list]], max_batch_size: int = 100) -> list['RpcPending']:
+        """
+        Sends the calls as JSON-RPC batch requests, at most `max_batch_size` calls per HTTP request.
+        The responses are matched by `id`, and `RpcPending.result()` raises the RpcError of the item if it failed.
+        """
+        pendings = [RpcPending(method) for (method, _) in calls]
+        self._send_batch(calls, pendings, max_batch_size)
+        return pendings
+
+    def batch(self, max_batch_size: int = 100) -> 'RpcBatch':
+        return RpcBatch(self, max_batch_size)
+
+    def _send_batch(self, calls: list[tuple[str, list]], pendings: list['RpcPending'], max_batch_size: int):
+        for start in range(0, len(calls), max_batch_size):
+            waiting = {}
+            reqs = []
+            for (method, params), pending in zip(calls[start:start + max_batch_size],
+                                                 pendings[start:start + max_batch_size]):
+                req_id = self._next_id()
+                waiting[req_id] = pending
+                reqs.append({"jsonrpc": "2.0", "id": req_id, "method": method, "params": params})
+
+            rsp = self._post("batch", reqs)
+            if isinstance(rsp, dict):  # the whole batch is rejected, i.e. invalid request
+                error = rsp.get('error', {})
+                for pending in waiting.values():
+                    pending.set_error(RpcError(error.get('code', -32600), error.get('message', 'Invalid batch')))
+                continue
+
+            for item in rsp:
+                pending = waiting.pop(item.get('id'), None)
+                if pending is None:
+                    continue
+                if 'error' in item:
+                    pending.set_error(RpcError(item['error']['code'], item['error']['message']))
+                else:
+                    pending.set_result(item['result'] if 'result' in item else None)
+
+            for pending in waiting.values():
+                pending.set_error(RpcError(-32603, f"No response for '{pending.method}' in the batch"))
+
+    def get_block_index(self) -> int:
+        return self.send("getblockcount", []) - 1
+
+    def get_neo_balance(self, account: str | UInt160) -> int:
+        return _first_int(self._balance_of(NEO_CONTRACT_HASH, account))
+
+    def get_gas_balance(self, account: str | UInt160) -> int:
+        return _first_int(self._balance_of(GAS_CONTRACT_HASH, account))
+
+    def get_persisted_application_logs(self, tx_hashes: list[str]) -> tuple[dict[str, dict], dict[str, RpcError]]:
+        """
+        Returns the application logs of the persisted transactions in one batch request,
+        and the errors of the transactions which are not persisted(or the logs are not available) yet.
+        """
+        calls = []
+        for tx_hash in tx_hashes:
+            calls.append(("gettransactionheight", [tx_hash]))
+            calls.append(("getapplicationlog", [tx_hash, ""]))
+
+        logs, errors = {}, {}
+        pendings = self.send_batch(calls)
+        for i, tx_hash in enumerate(tx_hashes):
+            try:
+                pendings[2 * i].result()
+                logs[tx_hash] = pendings[2 * i + 1].result()
+            except RpcError as e:
+                errors[tx_hash] = e
+        return logs, errors
+
+    def wait_for_application_log(self, tx_hashes: str | list[str], timeout: float = 60.0, poll_interval: float = 0.2,
+                                 wait: Callable[[float], None] | None = None) -> dict | list[dict]:
+        """
+        Waits until the transactions are persisted and returns their application logs.
+        If `tx_hashes` is a list, the logs are returned in the same order, the repeated hashes are waited once.
+        `wait` is called with the remaining seconds between the checks, it sleeps `poll_interval` by default.
+        """
+        hashes = [tx_hashes] if isinstance(tx_hashes, str) else list(tx_hashes)
+        waiting = list(dict.fromkeys(hashes))
+        deadline = time.monotonic() + timeout
+        logs, errors = {}, {}
+        while True:
+            pending = [h for h in waiting if h not in logs]
+            persisted, errors = self.get_persisted_application_logs(pending)
+            logs.update(persisted)
+            if len(logs) == len(waiting):
+                break
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Timeout waiting for transactions after {timeout}s: "
+                                   f"{[f'{h}: {e.message}' for h, e in errors.items()]}")
+            if wait is not None:
+                wait(remaining)
+            else:
+                time.sleep(min(poll_interval, remaining))
+
+        return logs[tx_hashes] if isinstance(tx_hashes, str) else [logs[h] for h in hashes]
+
+
+class RpcBatch(RpcMethods):
+    """
+    Queues the calls and sends them in JSON-RPC batch requests when leaving the `with` block.
+    The RPC methods return a RpcPending instead of the result, for example:
+
+        with client.batch() as batch:
+            result1 = batch.invoke_script(script1)
+            result2 = batch.get_block_index()
+        result1.result(), result2.result()
+    """
+
+    def __init__(self, client: RpcClient, max_batch_size: int = 100):
+        self._client = client
+        self._max_batch_size = max_batch_size
+        self._calls: list[tuple[str, list]] = []
+        self._pendings: list[RpcPending] = []
+        self.stats = client.stats
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+
+    def send(self, method: str, params: list) -> RpcPending:
+        pending = RpcPending(method)
+        self._calls.append((method, params))
+        self._pendings.append(pending)
+        return pending
+
+    def flush(self):
+        calls, pendings = self._calls, self._pendings
+        self._calls, self._pendings = [], []
+        if len(calls) > 0:
+            self._client._send_batch(calls, pendings, self._max_batch_size)
+
+    def get_block_index(self) -> RpcPending:
+        return self.send("getblockcount", []).then(lambda count: count - 1)
+
+    def get_neo_balance(self, account: str | UInt160) -> RpcPending:
+        return self._balance_of(NEO_CONTRACT_HASH, account).then(_first_int)
+
+    def get_gas_balance(self, account: str | UInt160) -> RpcPending:
+        return self._balance_of(GAS_CONTRACT_HASH, account).then(_first_int)
+
+
+class AsyncRpcClient(RpcMethods):
+    """
+    Asyncio JSON-RPC client of the RpcServer plugin, it has the same methods as RpcClient, the `aiohttp` is imported
+    only when the client is used.
+    At most `max_concurrency` calls are in flight at the same time, for example:
+
+        async with AsyncRpcClient(endpoint) as client:
+            results = await asyncio.gather(*[client.invoke_script(script) for script in scripts])
+    """
+
+    def __init__(self, endpoint: str, max_concurrency: int = 16, timeout: float = 30.0,
+                 retries: int = 3, backoff_factor: float = 0.2):
+        self._endpoint = normalize_endpoint(endpoint)
+        self._id = 0
+        self._max_concurrency = max_concurrency
+        self._timeout = timeout
+        self._retries = retries
+        self._backoff_factor = backoff_factor
+        self._session: 'aiohttp.ClientSession | None' = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self.stats = RpcStats()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _ensure_session(self) -> 'aiohttp.ClientSession':
+        # The session must be created in the running event loop.
+        if self._session is None:
+            import aiohttp
+            connector = aiohttp.TCPConnector(limit=self._max_concurrency)
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=self._timeout))
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._session
+
+    async def _post(self, method: str, req: dict | list) -> dict | list:
+        import aiohttp
+        session = self._ensure_session()
+        async with self._semaphore:
+            start = time.perf_counter()
+            try:
+                for attempt in range(self._retries + 1):
+                    try:
+                        async with session.post(self._endpoint, json=req) as rsp:
+                            return await rsp.json(content_type=None)
+                    except aiohttp.ClientConnectorError:
+                        # Only retry if the connection cannot be established, the request is not sent in this case.
+                        if attempt >= self._retries:
+                            raise
+                        await asyncio.sleep(self._backoff_factor * (2 ** attempt))
+            finally:
+                self.stats.record(method, time.perf_counter() - start)
+
+    async def send(self, method: str, params: list):
+        self._id += 1
+        req = {
+            "jsonrpc": "2.0",
+            "id": self._id,
+            "method": method,
+            "params": params
+        }
+
+        rsp = await self._post(method, req)
+        if 'error' in rsp:
+            raise RpcError(rsp['error']['code'], rsp['error']['message'])
+        return rsp['result'] if 'result' in rsp else None
+
+    async def get_block_index(self) -> int:
+        return await self.send("getblockcount", []) - 1
+
+    async def get_neo_balance(self, account: str | UInt160) -> int:
+        return _first_int(await self._balance_of(NEO_CONTRACT_HASH, account))
+
+    async def get_gas_balance(self, account: str | UInt160) -> int:
+        return _first_int(await self._balance_of(GAS_CONTRACT_HASH, account))
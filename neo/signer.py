@@ -0,0 +1,108 @@
+import os
+import threading
+
+from concurrent.futures import ProcessPoolExecutor
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+from cryptography.hazmat.backends import default_backend
+
+
+class SignerRegistry:
+    """
+    Derives each secp256r1 private key once and keeps the signing key object, so signing a message doesn't
+    derive the key again. The signatures are 64 bytes(r || s), as the neo witnesses require.
+    """
+
+    _default: 'SignerRegistry | None' = None
+    _default_lock = threading.Lock()
+
+    @classmethod
+    def default(cls) -> 'SignerRegistry':
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def __init__(self):
+        self._keys: dict[int, ec.EllipticCurvePrivateKey] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._keys)
+
+    def key(self, private_key: int | bytes) -> ec.EllipticCurvePrivateKey:
+        private_key = int.from_bytes(private_key, 'big') if isinstance(private_key, bytes) else private_key
+        with self._lock:
+            sk = self._keys.get(private_key)
+        if sk is None:  # deriving outside the lock, a duplicate derivation is harmless
+            sk = ec.derive_private_key(private_key, ec.SECP256R1(), default_backend())
+            with self._lock:
+                sk = self._keys.setdefault(private_key, sk)
+        return sk
+
+    def sign(self, private_key: int | bytes, message: bytes) -> bytes:
+        der = self.key(private_key).sign(message, ec.ECDSA(hashes.SHA256()))
+        (r, s) = decode_dss_signature(der)
+        return r.to_bytes(32, 'big') + s.to_bytes(32, 'big')
+
+    def sign_batch(self, private_keys: list[int | bytes], message: bytes) -> list[bytes]:
+        """
+        Signs the same message with each private key, the signatures are in the order of `private_keys`.
+        """
+        return [self.sign(private_key, message) for private_key in private_keys]
+
+
+def _sign_jobs(jobs: list[tuple[list[int], bytes]]) -> list[list[bytes]]:
+    # Runs in the worker process, each worker has its own default registry, so a key is derived once per worker.
+    registry = SignerRegistry.default()
+    return [registry.sign_batch(private_keys, message) for (private_keys, message) in jobs]
+
+
+class SigningPool:
+    """
+    Spreads the bulk signing across worker processes, since ECDSA signing holds the GIL.
+    The small batches(less than `min_parallel` messages) are signed in the current process.
+    """
+
+    def __init__(self, workers: int | None = None, min_parallel: int = 64, chunk_size: int = 32):
+        self._workers = workers or os.cpu_count() or 1
+        self._min_parallel = min_parallel
+        self._chunk_size = chunk_size
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'SigningPool':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def sign_many(self, jobs: list[tuple[list[int | bytes], bytes]]) -> list[list[bytes]]:
+        """
+        Signs each message with its private keys, the results are in the order of `jobs`.
+        """
+        jobs = [([int.from_bytes(k, 'big') if isinstance(k, bytes) else k for k in keys], message)
+                for (keys, message) in jobs]
+        if len(jobs) < self._min_parallel or self._workers <= 1:
+            return _sign_jobs(jobs)
+
+        chunks = [jobs[i:i + self._chunk_size] for i in range(0, len(jobs), self._chunk_size)]
+        results = []
+        for signs in self._ensure_executor().map(_sign_jobs, chunks):
+            results.extend(signs)
+        return results
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self._workers)
+            return self._executor
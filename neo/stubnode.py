@@ -0,0 +1,506 @@
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+from neo3.network.payloads.transaction import Transaction
+
+from neo.contract import ContractParameter, GAS_CONTRACT_HASH, NEO_CONTRACT_HASH, POLICY_CONTRACT_HASH, ScriptBuilder
+from neo.rpc import RpcError
+from neo.vm import (
+    DEFAULT_EXEC_FEE_FACTOR, SYSCALLS, Boolean, ByteString, ExecutionEngine, Integer, StackItem,
+    UnsupportedFault, execution_result,
+)
+
+# The error codes of the RpcServer plugin.
+ERROR_UNKNOWN_BLOCK = -101
+ERROR_UNKNOWN_TRANSACTION = -103
+ERROR_ALREADY_EXISTS = -501
+ERROR_ALREADY_IN_POOL = -503
+ERROR_EXPIRED_TRANSACTION = -510
+ERROR_METHOD_NOT_FOUND = -32601
+ERROR_INVALID_PARAMS = -32602
+ERROR_PARSE = -32700
+
+# The size and the verification cost of a single-signature witness, for the `calculatenetworkfee`.
+_SIGNATURE_WITNESS_SIZE = 1 + 66 + 1 + 40  # the invocation and the verification script with their size prefixes
+_SIGNATURE_VERIFY_PRICE = (1 << 3) * 2 + (1 << 15)  # PUSHDATA1 * 2 + System.Crypto.CheckSig
+
+# A contract method of the stub node, it gets the arguments and returns the result, None for the void methods.
+ContractFunction = Callable[[list[StackItem]], StackItem | int | bool | bytes | str | None]
+
+
+@dataclass
+class StubBlock:
+    """
+    A block in the N3 format with the zero nonce, primary and next consensus, and an empty witness.
+    The hash is the SHA256 of the unsigned header, as the hash of the real blocks.
+    """
+    index: int
+    prev_hash: str
+    time: int  # in milliseconds
+    txs: list[tuple[str, bytes, bytes]] = field(default_factory=list)  # (tx hash, script, raw tx)
+    hash: str = field(init=False)
+
+    def __post_init__(self):
+        self.hash = '0x' + hashlib.sha256(self._unsigned_header()).digest()[::-1].hex()
+
+    def _unsigned_header(self) -> bytes:
+        # version, prev hash, merkle root, timestamp, nonce, index, primary index, next consensus
+        merkle_root = _merkle_root([_uint256_of(tx_hash) for (tx_hash, _, _) in self.txs])
+        return (bytes(4) + _uint256_of(self.prev_hash) + merkle_root + self.time.to_bytes(8, 'little') + bytes(8)
+                + self.index.to_bytes(4, 'little') + bytes(1) + bytes(20))
+
+    def serialize_header(self) -> bytes:
+        return self._unsigned_header() + b'\x01' + b'\x00\x00'  # one witness with the empty scripts
+
+    def serialize(self) -> bytes:
+        return self.serialize_header() + _var_int(len(self.txs)) + b''.join(raw for (_, _, raw) in self.txs)
+
+    def header(self) -> dict:
+        return {'hash': self.hash, 'index': self.index, 'time': self.time, 'size': len(self.serialize_header()),
+                'version': 0, 'previousblockhash': self.prev_hash, 'nonce': '0000000000000000', 'primary': 0,
+                'witnesses': [{'invocation': '', 'verification': ''}]}
+
+    def block(self) -> dict:
+        return {**self.header(), 'size': len(self.serialize()),
+                'tx': [{'hash': h, 'script': base64.b64encode(s).decode('utf-8')} for (h, s, _) in self.txs]}
+
+
+def _var_int(value: int) -> bytes:
+    if value < 0xFD:
+        return value.to_bytes(1, 'little')
+    if value <= 0xFFFF:
+        return b'\xfd' + value.to_bytes(2, 'little')
+    if value <= 0xFFFFFFFF:
+        return b'\xfe' + value.to_bytes(4, 'little')
+    return b'\xff' + value.to_bytes(8, 'little')
+
+
+def _uint256_of(hash: str) -> bytes:
+    # The '0x' hash string is in the reversed order of the serialized UInt256.
+    return bytes.fromhex(hash[2:])[::-1]
+
+
+def _merkle_root(hashes: list[bytes]) -> bytes:
+    # The odd node is paired with itself, as the MerkleTree of neo.
+    if len(hashes) == 0:
+        return bytes(32)
+    while len(hashes) > 1:
+        if len(hashes) % 2 == 1:
+            hashes = hashes + [hashes[-1]]
+        hashes = [hashlib.sha256(hashlib.sha256(hashes[i] + hashes[i + 1]).digest()).digest()
+                  for i in range(0, len(hashes), 2)]
+    return hashes[0]
+
+
+class StubNode:
+    """
+    An in-process JSON-RPC server with the subset of the RpcServer(and ApplicationLogs) that `neo.rpc` uses,
+    so the harness can be developed and benchmarked without the localnet. For example:
+
+        with StubNode(block_time=0.1) as node:
+            client = RpcClient(node.endpoint)
+            client.invoke_script(script)
+
+    The scripts(`invokescript`, `invokefunction` and the txs) run on the local VM, the contract calls are served by
+    the functions in `functions`, see `register_function`. The txs in the mempool are persisted when a block is
+    produced, every `block_time` seconds, or by `produce_block()` if `block_time` is 0.
+    The canned responses(`set_response` or `load_responses`) are replayed before the methods are handled, and
+    the served responses are recorded in `recorded` if `record` is True.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, block_time: float = 1.0, network: int = 1234567890,
+                 exec_fee_factor: int = DEFAULT_EXEC_FEE_FACTOR, fee_per_byte: int = 1000, record: bool = False):
+        self.host = host
+        self.port = port
+        self.block_time = block_time
+        self.network = network
+        self.exec_fee_factor = exec_fee_factor
+        self.fee_per_byte = fee_per_byte
+        self.record = record
+        self.recorded: list[dict] = []
+        self.logger = logging.getLogger("StubNode")
+
+        self._lock = threading.RLock()  # the scripts run in the lock too, see `execute`
+        self._blocks: list[StubBlock] = []
+        self._mempool: dict[str, tuple[Transaction, bytes]] = {}  # the tx hash -> (tx, raw tx)
+        self._heights: dict[str, int] = {}  # the persisted tx hash -> block index
+        self._logs: dict[str, dict] = {}  # the persisted tx hash -> application log
+        self._responses: dict[str, dict] = {}  # the request key -> canned response
+        self._server: ThreadingHTTPServer | None = None
+        self._threads: list[threading.Thread] = []
+        self._stopped = threading.Event()
+
+        self.balances: dict[tuple[str, str], int] = {}  # (token hash, account '0x' hash) -> balance
+        self.functions: dict[tuple[str, str], ContractFunction] = {}
+        self._register_natives()
+        self.produce_block()  # the genesis block
+
+        self._methods: dict[str, Callable[[list], any]] = {
+            'getblockcount': lambda params: self.block_count,
+            'getblockhash': lambda params: self._block_of(params[0]).hash,
+            'getblock': self._get_block,
+            'getblockheader': self._get_block_header,
+            'getversion': self._get_version,
+            'invokefunction': self._invoke_function,
+            'invokescript': self._invoke_script,
+            'sendrawtransaction': self._send_raw_tx,
+            'getrawmempool': self._get_raw_mempool,
+            'calculatenetworkfee': self._calculate_network_fee,
+            'getapplicationlog': self._get_application_log,
+            'gettransactionheight': self._get_transaction_height,
+        }
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def block_count(self) -> int:
+        with self._lock:
+            return len(self._blocks)
+
+    def start(self):
+        self._server = ThreadingHTTPServer((self.host, self.port), _handler_of(self))
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]  # the port 0 is assigned by the OS
+        self._stopped.clear()
+        self._threads = [threading.Thread(target=self._server.serve_forever, name="StubNode", daemon=True)]
+        if self.block_time > 0:
+            self._threads.append(threading.Thread(target=self._produce_blocks, name="StubNodeBlocks", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        self.logger.info(f"StubNode is serving on {self.endpoint}, block time: {self.block_time}s")
+
+    def stop(self):
+        self._stopped.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def serve_forever(self):
+        self.start()
+        try:
+            self._stopped.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def _produce_blocks(self):
+        while not self._stopped.wait(self.block_time):
+            self.produce_block()
+
+    def produce_block(self) -> StubBlock:
+        """
+        Persists the txs in the mempool in a new block, the tx scripts run on the local VM for the application logs.
+        """
+        with self._lock:
+            index = len(self._blocks)
+            prev_hash = self._blocks[-1].hash if index > 0 else '0x' + '00' * 32
+            txs = []
+            for (tx_hash, (tx, raw_tx)) in self._mempool.items():
+                script = bytes(tx.script)
+                txs.append((tx_hash, script, raw_tx))
+                self._heights[tx_hash] = index
+                self._logs[tx_hash] = self._execute_tx(tx_hash, tx, script)
+            self._mempool.clear()
+            block = StubBlock(index, prev_hash, int(time.time() * 1000), txs)
+            self._blocks.append(block)
+            return block
+
+    def _execute_tx(self, tx_hash: str, tx: Transaction, script: bytes) -> dict:
+        result = self.execute(script, tx.system_fee, persist=True)
+        return {'txid': tx_hash, 'executions': [{
+            'trigger': 'Application',
+            'vmstate': result['state'],
+            'exception': result['exception'],
+            'gasconsumed': result['gasconsumed'],
+            'stack': result['stack'],
+            'notifications': [],
+        }]}
+
+    def execute(self, script: bytes, gas_limit: int = 20_00000000, persist: bool = False) -> dict:
+        """
+        Runs the script on the local VM, the changes of the balances are kept only if `persist` is True.
+        """
+        engine = ExecutionEngine(gas_limit, self.exec_fee_factor, self.network)
+        engine.syscalls = {**SYSCALLS, 'System.Contract.Call': (1 << 15, self._contract_call)}
+        engine.load_script(script)
+        with self._lock:
+            balances = dict(self.balances)
+            engine.execute()
+            if not persist or engine.state != 'HALT':
+                self.balances = balances
+        return execution_result(engine, script)
+
+    def register_function(self, script_hash: str, method: str, function: ContractFunction):
+        self.functions[(script_hash.lower(), method)] = function
+
+    def _register_natives(self):
+        # The native methods the harness reads, the others are registered by the tests if needed.
+        self.register_function(POLICY_CONTRACT_HASH, 'getExecFeeFactor', lambda args: self.exec_fee_factor)
+        self.register_function(POLICY_CONTRACT_HASH, 'getFeePerByte', lambda args: self.fee_per_byte)
+        self.register_function(POLICY_CONTRACT_HASH, 'getMillisecondsPerBlock',
+                               lambda args: int(self.block_time * 1000))
+        for token in (NEO_CONTRACT_HASH, GAS_CONTRACT_HASH):
+            self.register_function(token, 'balanceOf', self._balance_of(token))
+            self.register_function(token, 'transfer', self._transfer(token))
+        self.register_function(NEO_CONTRACT_HASH, 'symbol', lambda args: 'NEO')
+        self.register_function(NEO_CONTRACT_HASH, 'decimals', lambda args: 0)
+        self.register_function(GAS_CONTRACT_HASH, 'symbol', lambda args: 'GAS')
+        self.register_function(GAS_CONTRACT_HASH, 'decimals', lambda args: 8)
+
+    def _balance_of(self, token: str) -> ContractFunction:
+        return lambda args: self.balances.get((token, _hash160_of(args[0])), 0)
+
+    def _transfer(self, token: str) -> ContractFunction:
+        def transfer(args: list[StackItem]) -> bool:
+            (source, dest, amount) = (_hash160_of(args[0]), _hash160_of(args[1]), args[2].to_int())
+            if amount < 0 or self.balances.get((token, source), 0) < amount:
+                return False
+            self.balances[(token, source)] = self.balances.get((token, source), 0) - amount
+            self.balances[(token, dest)] = self.balances.get((token, dest), 0) + amount
+            return True
+        return transfer
+
+    def _contract_call(self, engine: ExecutionEngine):
+        script_hash = '0x' + engine.pop_bytes()[::-1].hex()
+        method = engine.pop_bytes().decode('utf-8')
+        engine.pop_int()  # the call flags
+        args = engine.pop_array()
+        function = self.functions.get((script_hash, method))
+        if function is None:
+            raise UnsupportedFault(f"Method {method} of {script_hash} is not registered in the stub node")
+        result = function(list(args.items))
+        if result is not None:
+            engine.push(_stack_item_of(result))
+
+    def set_response(self, method: str, params: list | None, result: any = None, error: RpcError | None = None):
+        """
+        Replays the result or the error for the method, for the params or for any params if `params` is None.
+        """
+        response = {'error': {'code': error.code, 'message': error.message}} if error else {'result': result}
+        self._responses[_request_key(method, params)] = response
+
+    def load_responses(self, path: str):
+        # One JSON object per line: {"method": ..., "params": ..., "result": ...} or with "error", as `save_responses`
+        # and the cassettes of `neo.cassette`, it's gzipped if the path ends with '.gz'.
+        with gzip.open(path, 'rt') if path.endswith('.gz') else open(path, 'r') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    response = {'error': entry['error']} if 'error' in entry else {'result': entry.get('result')}
+                    self._responses[_request_key(entry['method'], entry.get('params'))] = response
+
+    def save_responses(self, path: str):
+        with open(path, 'w') as f:
+            for entry in self.recorded:
+                f.write(json.dumps(entry, separators=(',', ':')) + "\n")
+
+    def handle(self, req: dict) -> dict:
+        """
+        Handles a JSON-RPC request object and returns the response object.
+        """
+        (req_id, method, params) = (req.get('id'), req.get('method'), req.get('params', []))
+        response = self._responses.get(_request_key(method, params)) or self._responses.get(_request_key(method, None))
+        if response is None:
+            try:
+                handler = self._methods.get(method)
+                if handler is None:
+                    raise RpcError(ERROR_METHOD_NOT_FOUND, f"Method not found: {method}")
+                response = {'result': handler(params)}
+            except RpcError as e:
+                response = {'error': {'code': e.code, 'message': e.message}}
+            except (IndexError, KeyError, TypeError, ValueError) as e:
+                response = {'error': {'code': ERROR_INVALID_PARAMS, 'message': f"Invalid params: {e}"}}
+
+        if self.record:
+            with self._lock:
+                self.recorded.append({'method': method, 'params': params, **response})
+        return {'jsonrpc': '2.0', 'id': req_id, **response}
+
+    def _block_of(self, hash_or_index: str | int) -> StubBlock:
+        with self._lock:
+            if isinstance(hash_or_index, int):
+                if 0 <= hash_or_index < len(self._blocks):
+                    return self._blocks[hash_or_index]
+            else:
+                block = next((b for b in self._blocks if b.hash == hash_or_index.lower()), None)
+                if block is not None:
+                    return block
+        raise RpcError(ERROR_UNKNOWN_BLOCK, f"Unknown block: {hash_or_index}")
+
+    def _get_block(self, params: list) -> dict | str:
+        block = self._block_of(params[0])
+        return block.block() if len(params) > 1 and params[1] else base64.b64encode(block.serialize()).decode('utf-8')
+
+    def _get_block_header(self, params: list) -> dict | str:
+        block = self._block_of(params[0])
+        if len(params) > 1 and params[1]:
+            return block.header()
+        return base64.b64encode(block.serialize_header()).decode('utf-8')
+
+    def _get_version(self, params: list) -> dict:
+        return {
+            'tcpport': 0,
+            'nonce': 0,
+            'useragent': '/StubNode/',
+            'protocol': {
+                'network': self.network,
+                'addressversion': 53,
+                'msperblock': int(self.block_time * 1000),
+                'maxvaliduntilblockincrement': 5760,
+                'maxtraceableblocks': 2102400,
+                'validatorscount': 7,
+                'hardforks': [],
+            },
+        }
+
+    def _invoke_function(self, params: list) -> dict:
+        args = [_parameter_of(arg) for arg in (params[2] if len(params) > 2 else [])]
+        script = ScriptBuilder().emit_dynamic_call(params[0], params[1], 0x0F, args).to_bytes()  # CallFlags.All
+        return self.execute(script)
+
+    def _invoke_script(self, params: list) -> dict:
+        return self.execute(base64.b64decode(params[0]))
+
+    def _send_raw_tx(self, params: list) -> dict:
+        raw_tx = base64.b64decode(params[0])
+        tx = Transaction.deserialize_from_bytes(raw_tx)
+        tx_hash = '0x' + tx.hash().to_array()[::-1].hex()
+        with self._lock:
+            if tx_hash in self._heights:
+                raise RpcError(ERROR_ALREADY_EXISTS, f"Transaction already exists: {tx_hash}")
+            if tx_hash in self._mempool:
+                raise RpcError(ERROR_ALREADY_IN_POOL, f"Transaction already in the pool: {tx_hash}")
+            if tx.valid_until_block <= len(self._blocks) - 1:
+                raise RpcError(ERROR_EXPIRED_TRANSACTION, f"Expired transaction: {tx_hash}")
+            self._mempool[tx_hash] = (tx, raw_tx)
+        return {'hash': tx_hash}
+
+    def _get_raw_mempool(self, params: list) -> list | dict:
+        with self._lock:
+            verified = list(self._mempool.keys())
+            height = len(self._blocks) - 1
+        if len(params) > 0 and params[0]:
+            return {'height': height, 'verified': verified, 'unverified': []}
+        return verified
+
+    def _calculate_network_fee(self, params: list) -> dict:
+        # Assumes each signer has a single-signature account, the multi-signature accounts are not known here.
+        raw_tx = base64.b64decode(params[0])
+        signers = len(Transaction.deserialize_from_bytes(raw_tx).signers)
+        size = len(raw_tx) + _SIGNATURE_WITNESS_SIZE * signers
+        fee = size * self.fee_per_byte + _SIGNATURE_VERIFY_PRICE * self.exec_fee_factor * signers
+        return {'networkfee': str(fee)}
+
+    def _get_application_log(self, params: list) -> dict:
+        with self._lock:
+            log = self._logs.get(params[0].lower())
+        if log is None:
+            raise RpcError(ERROR_UNKNOWN_TRANSACTION, f"Unknown transaction: {params[0]}")
+        return log
+
+    def _get_transaction_height(self, params: list) -> int:
+        with self._lock:
+            height = self._heights.get(params[0].lower())
+        if height is None:
+            raise RpcError(ERROR_UNKNOWN_TRANSACTION, f"Unknown transaction: {params[0]}")
+        return height
+
+
+def _request_key(method: str, params: list | None) -> str:
+    return f"{method}:{json.dumps(params, sort_keys=True, separators=(',', ':'))}"
+
+
+def _hash160_of(item: StackItem) -> str:
+    return '0x' + item.to_bytes()[::-1].hex()
+
+
+def _stack_item_of(value: StackItem | int | bool | bytes | str) -> StackItem:
+    if isinstance(value, StackItem):
+        return value
+    if isinstance(value, bool):
+        return Boolean(value)
+    if isinstance(value, int):
+        return Integer(value)
+    if isinstance(value, str):
+        return ByteString(value.encode('utf-8'))
+    if isinstance(value, bytes):
+        return ByteString(value)
+    raise ValueError(f"Unsupported result type: {type(value)}")
+
+
+def _parameter_of(arg: dict) -> ContractParameter:
+    # The `invokefunction` arguments in the RPC JSON, the items of Array and Map are the parameters too.
+    (kind, value) = (arg['type'], arg.get('value'))
+    if kind == 'Array' and value is not None:
+        value = [_parameter_of(item) for item in value]
+    elif kind == 'Map' and value is not None:
+        value = [(_parameter_of(pair['key']), _parameter_of(pair['value'])) for pair in value]
+    return ContractParameter(type=kind, value=value)
+
+
+def _handler_of(node: StubNode) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, as the pooled sessions of RpcClient
+        disable_nagle_algorithm = True  # the headers and the body are written separately
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            try:
+                req = json.loads(body)
+                rsp = [node.handle(r) for r in req] if isinstance(req, list) else node.handle(req)
+            except json.JSONDecodeError as e:
+                rsp = {'jsonrpc': '2.0', 'id': None, 'error': {'code': ERROR_PARSE, 'message': f"Parse error: {e}"}}
+
+            data = json.dumps(rsp, separators=(',', ':')).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args):
+            pass  # not a line per request
+
+    return Handler
+
+
+# Run with: python3 -B -m neo.stubnode [--port 10332] [--block-time 1.0] [--responses file]
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve a stub JSON-RPC node for the offline test development.")
+    parser.add_argument('--host', default="127.0.0.1", help="the host to listen")
+    parser.add_argument('--port', type=int, default=10332, help="the port to listen, the localnet RPC port in default")
+    parser.add_argument('--block-time', type=float, default=1.0, help="the seconds per block, 0 for no block")
+    parser.add_argument('--network', type=int, default=1234567890, help="the network id")
+    parser.add_argument('--responses', default='', help="the canned responses to replay, a JSON object per line")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    node = StubNode(args.host, args.port, args.block_time, args.network)
+    if args.responses:
+        node.load_responses(args.responses)
+    node.serve_forever()
@@ -0,0 +1,1593 @@
+import base64
+import math
+
+from enum import IntEnum
+
+from neo.disassembler import DisassembleError, Instruction, decode_instruction
+from neo.interop import INTEROP_NAMES
+from neo.opcode import OpCode
+from neo.pending import RpcPending
+
+# The limits of the neo-vm, it's the `ExecutionEngineLimits.Default`.
+MAX_SHIFT = 256
+MAX_STACK_SIZE = 2 * 1024
+MAX_ITEM_SIZE = 1024 * 1024
+MAX_COMPARABLE_SIZE = 65536
+MAX_INVOCATION_STACK_SIZE = 1024
+MAX_TRY_NESTING_DEPTH = 16
+MAX_INTEGER_SIZE = 32
+MAX_KEY_SIZE = 64
+
+DEFAULT_EXEC_FEE_FACTOR = 30
+DEFAULT_GAS_LIMIT = 20_00000000  # 20 GAS, the default `MaxGasInvoke` of the RpcServer
+
+_MIN_INTEGER = -(1 << (MAX_INTEGER_SIZE * 8 - 1))
+_MAX_INTEGER = (1 << (MAX_INTEGER_SIZE * 8 - 1)) - 1
+
+
+class StackItemType(IntEnum):
+    Any = 0x00
+    Pointer = 0x10
+    Boolean = 0x20
+    Integer = 0x21
+    ByteString = 0x28
+    Buffer = 0x30
+    Array = 0x40
+    Struct = 0x41
+    Map = 0x48
+    InteropInterface = 0x60
+
+
+class VMState:
+    NONE = "NONE"
+    HALT = "HALT"
+    FAULT = "FAULT"
+    BREAK = "BREAK"
+
+
+class VMFault(Exception):
+    """
+    The error which faults the execution, it can't be caught by TRY.
+    """
+    pass
+
+
+class CatchableFault(VMFault):
+    """
+    The error which is thrown as a ByteString exception, so it can be caught by TRY, i.e. PICKITEM out of range.
+    """
+    pass
+
+
+class UnsupportedFault(VMFault):
+    """
+    The instruction needs the blockchain or the contracts, which are not available in the local VM.
+    """
+    pass
+
+
+class StackItem:
+    __slots__ = ()
+    type = StackItemType.Any
+
+    def to_bool(self) -> bool:
+        return True
+
+    def to_int(self) -> int:
+        raise VMFault(f"{self.type.name} can't be converted to Integer")
+
+    def to_bytes(self) -> bytes:
+        raise VMFault(f"{self.type.name} can't be converted to ByteString")
+
+    def equals(self, other: 'StackItem') -> bool:
+        return self is other
+
+    def convert(self, type: int) -> 'StackItem':
+        if type == self.type:
+            return self
+        if type == StackItemType.Boolean:
+            return Boolean(self.to_bool())
+        raise VMFault(f"{self.type.name} can't be converted to {_type_name(type)}")
+
+    def to_json(self, visited: set[int]) -> dict:
+        return {'type': self.type.name}
+
+
+class Null(StackItem):
+    __slots__ = ()
+
+    def to_bool(self) -> bool:
+        return False
+
+    def equals(self, other: StackItem) -> bool:
+        return other is NULL
+
+    def convert(self, type: int) -> StackItem:
+        if type == StackItemType.Any or type not in StackItemType._value2member_map_:
+            raise VMFault(f"Null can't be converted to {_type_name(type)}")
+        return self
+
+
+NULL = Null()
+
+
+class PrimitiveType(StackItem):
+    __slots__ = ()
+
+    @property
+    def size(self) -> int:
+        return len(self.to_bytes())
+
+    def key(self) -> tuple:
+        # The key in the Map, the items of different types are different keys.
+        return (self.type, self.value)
+
+    def convert(self, type: int) -> StackItem:
+        if type == self.type:
+            return self
+        if type == StackItemType.Integer:
+            return Integer(self.to_int())
+        if type == StackItemType.ByteString:
+            return ByteString(self.to_bytes())
+        if type == StackItemType.Buffer:
+            return Buffer(bytearray(self.to_bytes()))
+        if type == StackItemType.Boolean:
+            return Boolean(self.to_bool())
+        return super().convert(type)
+
+
+class Boolean(PrimitiveType):
+    __slots__ = ('value',)
+    type = StackItemType.Boolean
+
+    def __init__(self, value: bool):
+        self.value = value
+
+    @property
+    def size(self) -> int:
+        return 1
+
+    def to_bool(self) -> bool:
+        return self.value
+
+    def to_int(self) -> int:
+        return 1 if self.value else 0
+
+    def to_bytes(self) -> bytes:
+        return b'\x01' if self.value else b'\x00'
+
+    def equals(self, other: StackItem) -> bool:
+        return isinstance(other, Boolean) and other.value == self.value
+
+    def to_json(self, visited: set[int]) -> dict:
+        return {'type': 'Boolean', 'value': self.value}
+
+
+class Integer(PrimitiveType):
+    __slots__ = ('value',)
+    type = StackItemType.Integer
+
+    def __init__(self, value: int):
+        if value < _MIN_INTEGER or value > _MAX_INTEGER:
+            raise VMFault(f"Integer out of {MAX_INTEGER_SIZE} bytes: {value}")
+        self.value = value
+
+    def to_bool(self) -> bool:
+        return self.value != 0
+
+    def to_int(self) -> int:
+        return self.value
+
+    def to_bytes(self) -> bytes:
+        return int_to_bytes(self.value)
+
+    def equals(self, other: StackItem) -> bool:
+        return isinstance(other, Integer) and other.value == self.value
+
+    def to_json(self, visited: set[int]) -> dict:
+        return {'type': 'Integer', 'value': str(self.value)}
+
+
+class ByteString(PrimitiveType):
+    __slots__ = ('value',)
+    type = StackItemType.ByteString
+
+    def __init__(self, value: bytes):
+        self.value = value
+
+    @property
+    def size(self) -> int:
+        return len(self.value)
+
+    def to_bool(self) -> bool:
+        if len(self.value) > MAX_INTEGER_SIZE:
+            raise VMFault(f"ByteString of {len(self.value)} bytes can't be converted to Boolean")
+        return any(self.value)
+
+    def to_int(self) -> int:
+        if len(self.value) > MAX_INTEGER_SIZE:
+            raise VMFault(f"ByteString of {len(self.value)} bytes can't be converted to Integer")
+        return int.from_bytes(self.value, 'little', signed=True)
+
+    def to_bytes(self) -> bytes:
+        return self.value
+
+    def equals(self, other: StackItem) -> bool:
+        if len(self.value) > MAX_COMPARABLE_SIZE:
+            raise VMFault(f"ByteString of {len(self.value)} bytes is too large to compare")
+        if not isinstance(other, ByteString):
+            return False
+        if len(other.value) > MAX_COMPARABLE_SIZE:
+            raise VMFault(f"ByteString of {len(other.value)} bytes is too large to compare")
+        return other.value == self.value
+
+    def to_json(self, visited: set[int]) -> dict:
+        return {'type': 'ByteString', 'value': base64.b64encode(self.value).decode('utf-8')}
+
+
+class Buffer(StackItem):
+    __slots__ = ('value',)
+    type = StackItemType.Buffer
+
+    def __init__(self, value: bytearray):
+        self.value = value
+
+    @property
+    def size(self) -> int:
+        return len(self.value)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.value)
+
+    def convert(self, type: int) -> StackItem:
+        if type == StackItemType.Integer:
+            if len(self.value) > MAX_INTEGER_SIZE:
+                raise VMFault(f"Buffer of {len(self.value)} bytes can't be converted to Integer")
+            return Integer(int.from_bytes(self.value, 'little', signed=True))
+        if type == StackItemType.ByteString:
+            return ByteString(bytes(self.value))
+        return super().convert(type)
+
+    def to_json(self, visited: set[int]) -> dict:
+        return {'type': 'Buffer', 'value': base64.b64encode(self.value).decode('utf-8')}
+
+
+class Pointer(StackItem):
+    __slots__ = ('script', 'position')
+    type = StackItemType.Pointer
+
+    def __init__(self, script: bytes, position: int):
+        self.script = script
+        self.position = position
+
+    def equals(self, other: StackItem) -> bool:
+        return isinstance(other, Pointer) and other.script is self.script and other.position == self.position
+
+    def to_json(self, visited: set[int]) -> dict:
+        return {'type': 'Pointer', 'value': self.position}
+
+
+class Array(StackItem):
+    __slots__ = ('items',)
+    type = StackItemType.Array
+
+    def __init__(self, items: list[StackItem] | None = None):
+        self.items = items if items is not None else []
+
+    def children(self) -> list[StackItem]:
+        return self.items
+
+    def convert(self, type: int) -> StackItem:
+        if type == StackItemType.Struct:
+            return Struct(list(self.items))
+        return super().convert(type)
+
+    def to_json(self, visited: set[int]) -> dict:
+        if id(self) in visited:
+            raise VMFault("Circular reference")
+        visited.add(id(self))
+        value = [item.to_json(visited) for item in self.items]
+        visited.remove(id(self))
+        return {'type': self.type.name, 'value': value}
+
+
+class Struct(Array):
+    __slots__ = ()
+    type = StackItemType.Struct
+
+    def convert(self, type: int) -> StackItem:
+        if type == StackItemType.Array:
+            return Array(list(self.items))
+        return StackItem.convert(self, type)
+
+    def clone(self) -> 'Struct':
+        # Copies the nested structs too, the other items are shared.
+        count = MAX_STACK_SIZE - 1
+        result = Struct()
+        pending = [(self, result)]
+        while len(pending) > 0:
+            (source, target) = pending.pop()
+            for item in source.items:
+                count -= 1
+                if count < 0:
+                    raise VMFault("Beyond the struct clone limits")
+                if isinstance(item, Struct):
+                    copy = Struct()
+                    pending.append((item, copy))
+                    item = copy
+                target.items.append(item)
+        return result
+
+    def equals(self, other: StackItem) -> bool:
+        if not isinstance(other, Struct):
+            return False
+        count = MAX_STACK_SIZE
+        comparable = MAX_COMPARABLE_SIZE
+        (left, right) = ([self], [other])
+        while len(left) > 0:
+            count -= 1
+            if count < 0:
+                raise VMFault("Too many struct items to compare")
+            (a, b) = (left.pop(), right.pop())
+            if isinstance(a, ByteString):
+                if a.size > comparable or (isinstance(b, ByteString) and b.size > comparable):
+                    raise VMFault("The struct items are too large to compare")
+                comparable -= max(a.size, b.size if isinstance(b, ByteString) else 0, 1)
+                if not a.equals(b):
+                    return False
+                continue
+
+            if comparable == 0:
+                raise VMFault("The struct items are too large to compare")
+            comparable -= 1
+            if isinstance(a, Struct):
+                if a is b:
+                    continue
+                if not isinstance(b, Struct) or len(a.items) != len(b.items):
+                    return False
+                left.extend(a.items)
+                right.extend(b.items)
+            elif not a.equals(b):
+                return False
+        return True
+
+
+class Map(StackItem):
+    __slots__ = ('entries',)
+    type = StackItemType.Map
+
+    def __init__(self):
+        self.entries: dict[tuple, tuple[PrimitiveType, StackItem]] = {}  # key() -> (key, value), in insertion order
+
+    @staticmethod
+    def check_key(key: PrimitiveType) -> tuple:
+        if key.size > MAX_KEY_SIZE:
+            raise VMFault(f"Map key of {key.size} bytes exceeds {MAX_KEY_SIZE}")
+        return key.key()
+
+    def children(self) -> list[StackItem]:
+        return [item for pair in self.entries.values() for item in pair]
+
+    def to_json(self, visited: set[int]) -> dict:
+        if id(self) in visited:
+            raise VMFault("Circular reference")
+        visited.add(id(self))
+        value = [{'key': key.to_json(visited), 'value': item.to_json(visited)} for (key, item) in self.entries.values()]
+        visited.remove(id(self))
+        return {'type': 'Map', 'value': value}
+
+
+def int_to_bytes(value: int) -> bytes:
+    # The minimal two's complement little-endian bytes as `BigInteger.ToByteArray`, zero is empty.
+    if value == 0:
+        return b''
+    return value.to_bytes((value + (value < 0)).bit_length() // 8 + 1, 'little', signed=True)
+
+
+def _type_name(type: int) -> str:
+    return StackItemType(type).name if type in StackItemType._value2member_map_ else f"0x{type:02x}"
+
+
+def _truncated_div(x: int, y: int) -> int:
+    # The integer division of C#, it truncates toward zero.
+    if y == 0:
+        raise VMFault("Division by zero")
+    q = abs(x) // abs(y)
+    return q if (x >= 0) == (y >= 0) else -q
+
+
+def _truncated_mod(x: int, y: int) -> int:
+    # The remainder of C#, it has the sign of the dividend.
+    return x - y * _truncated_div(x, y)
+
+
+# The base price of each opcode, the fee is `price * exec_fee_factor`. It's the `OpCodePriceTable` of neo.
+_OPCODE_PRICES = {
+    OpCode.PUSHINT128: 1 << 2, OpCode.PUSHINT256: 1 << 2, OpCode.PUSHA: 1 << 2,
+    OpCode.PUSHDATA1: 1 << 3, OpCode.PUSHDATA2: 1 << 9, OpCode.PUSHDATA4: 1 << 12,
+    OpCode.CALL: 1 << 9, OpCode.CALL_L: 1 << 9, OpCode.CALLA: 1 << 9, OpCode.CALLT: 1 << 15,
+    OpCode.ABORT: 0, OpCode.THROW: 1 << 9, OpCode.TRY: 1 << 2, OpCode.TRY_L: 1 << 2,
+    OpCode.ENDTRY: 1 << 2, OpCode.ENDTRY_L: 1 << 2, OpCode.ENDFINALLY: 1 << 2, OpCode.RET: 0, OpCode.SYSCALL: 0,
+    OpCode.XDROP: 1 << 4, OpCode.CLEAR: 1 << 4, OpCode.ROLL: 1 << 4, OpCode.REVERSEN: 1 << 4,
+    OpCode.INITSSLOT: 1 << 4, OpCode.INITSLOT: 1 << 6,
+    OpCode.NEWBUFFER: 1 << 8, OpCode.MEMCPY: 1 << 11, OpCode.CAT: 1 << 11, OpCode.SUBSTR: 1 << 11,
+    OpCode.LEFT: 1 << 11, OpCode.RIGHT: 1 << 11,
+    OpCode.INVERT: 1 << 2, OpCode.AND: 1 << 3, OpCode.OR: 1 << 3, OpCode.XOR: 1 << 3,
+    OpCode.EQUAL: 1 << 5, OpCode.NOTEQUAL: 1 << 5,
+    OpCode.SIGN: 1 << 2, OpCode.ABS: 1 << 2, OpCode.NEGATE: 1 << 2, OpCode.INC: 1 << 2, OpCode.DEC: 1 << 2,
+    OpCode.ADD: 1 << 3, OpCode.SUB: 1 << 3, OpCode.MUL: 1 << 3, OpCode.DIV: 1 << 3, OpCode.MOD: 1 << 3,
+    OpCode.POW: 1 << 6, OpCode.SQRT: 1 << 6, OpCode.MODMUL: 1 << 5, OpCode.MODPOW: 1 << 11,
+    OpCode.SHL: 1 << 3, OpCode.SHR: 1 << 3, OpCode.NOT: 1 << 2, OpCode.BOOLAND: 1 << 3, OpCode.BOOLOR: 1 << 3,
+    OpCode.NZ: 1 << 2, OpCode.NUMEQUAL: 1 << 3, OpCode.NUMNOTEQUAL: 1 << 3, OpCode.LT: 1 << 3, OpCode.LE: 1 << 3,
+    OpCode.GT: 1 << 3, OpCode.GE: 1 << 3, OpCode.MIN: 1 << 3, OpCode.MAX: 1 << 3, OpCode.WITHIN: 1 << 3,
+    OpCode.PACKMAP: 1 << 11, OpCode.PACKSTRUCT: 1 << 11, OpCode.PACK: 1 << 11, OpCode.UNPACK: 1 << 11,
+    OpCode.NEWARRAY0: 1 << 4, OpCode.NEWARRAY: 1 << 9, OpCode.NEWARRAY_T: 1 << 9,
+    OpCode.NEWSTRUCT0: 1 << 4, OpCode.NEWSTRUCT: 1 << 9, OpCode.NEWMAP: 1 << 3, OpCode.SIZE: 1 << 2,
+    OpCode.HASKEY: 1 << 6, OpCode.KEYS: 1 << 4, OpCode.VALUES: 1 << 13, OpCode.PICKITEM: 1 << 6,
+    OpCode.APPEND: 1 << 13, OpCode.SETITEM: 1 << 13, OpCode.REVERSEITEMS: 1 << 13, OpCode.REMOVE: 1 << 4,
+    OpCode.CLEARITEMS: 1 << 4, OpCode.POPITEM: 1 << 4, OpCode.CONVERT: 1 << 13, OpCode.ABORTMSG: 0,
+}
+# The others are 1 << 1, except the pushes, NOP, ASSERT and ASSERTMSG are 1 << 0.
+_CHEAPEST = {OpCode.PUSHINT8, OpCode.PUSHINT16, OpCode.PUSHINT32, OpCode.PUSHINT64, OpCode.PUSHT, OpCode.PUSHF,
+             OpCode.PUSHNULL, OpCode.NOP, OpCode.ASSERT, OpCode.ASSERTMSG} | \
+            {op for op in OpCode if OpCode.PUSHM1 <= op <= OpCode.PUSH16}
+OPCODE_PRICE: tuple[int, ...] = tuple(
+    _OPCODE_PRICES.get(op, 1 << 0 if op in _CHEAPEST else 1 << 1) for op in range(256))
+
+
+class _SharedStates:
+    # The states shared by the contexts of the same script, a CALL shares them with the caller.
+    __slots__ = ('script', 'view', 'stack', 'static_fields', 'instructions')
+
+    def __init__(self, script: bytes):
+        self.script = script
+        self.view = memoryview(script)
+        self.stack: list[StackItem] = []
+        self.static_fields: list[StackItem] | None = None
+        self.instructions: dict[int, Instruction] = {}
+
+
+class _TryContext:
+    __slots__ = ('catch_pointer', 'finally_pointer', 'end_pointer', 'state')
+
+    def __init__(self, catch_pointer: int, finally_pointer: int):
+        self.catch_pointer = catch_pointer  # -1 if no catch block
+        self.finally_pointer = finally_pointer  # -1 if no finally block
+        self.end_pointer = -1
+        self.state = 'try'  # 'try', 'catch' or 'finally'
+
+
+class ExecutionContext:
+    __slots__ = ('shared', 'ip', 'rvcount', 'local_variables', 'arguments', 'try_stack')
+
+    def __init__(self, shared: _SharedStates, ip: int = 0, rvcount: int = -1):
+        self.shared = shared
+        self.ip = ip
+        self.rvcount = rvcount
+        self.local_variables: list[StackItem] | None = None
+        self.arguments: list[StackItem] | None = None
+        self.try_stack: list[_TryContext] = []
+
+    @property
+    def stack(self) -> list[StackItem]:
+        return self.shared.stack
+
+    def current_instruction(self) -> Instruction | None:
+        # None if the ip is at the end of the script, it's an implicit RET.
+        shared = self.shared
+        instruction = shared.instructions.get(self.ip)
+        if instruction is None:
+            if self.ip >= len(shared.script):
+                return None
+            try:
+                instruction = decode_instruction(shared.view, self.ip)
+            except DisassembleError as e:
+                raise VMFault(str(e))
+            shared.instructions[self.ip] = instruction
+        return instruction
+
+
+_RET = Instruction(0, OpCode.RET, memoryview(b''), 1)
+
+
+class ExecutionEngine:
+    """
+    A pure-Python neo-vm with the fee model of the ApplicationEngine, it runs the scripts without the blockchain,
+    so only a few syscalls without the chain state are supported, see `SYSCALLS`. More syscalls can be added to
+    the `syscalls` of an engine, i.e. the contract calls of the stub node. For example:
+
+        engine = ExecutionEngine()
+        engine.load_script(script)
+        engine.execute()  # VMState.HALT or VMState.FAULT
+        engine.result_stack, engine.gas_consumed, engine.fault_exception
+
+    The stack limit is checked with the number of references like the `ReferenceCounter` of the neo-vm.
+    """
+
+    def __init__(self, gas_limit: int = DEFAULT_GAS_LIMIT, exec_fee_factor: int = DEFAULT_EXEC_FEE_FACTOR,
+                 network: int = 0, address_version: int = 53):
+        self.gas_limit = gas_limit
+        self.exec_fee_factor = exec_fee_factor
+        self.network = network
+        self.address_version = address_version
+        self.syscalls = SYSCALLS  # name -> (price, handler), replace it to add the syscalls
+
+        self.state = VMState.BREAK
+        self.gas_consumed = 0
+        self.invocation_stack: list[ExecutionContext] = []
+        self.result_stack: list[StackItem] = []
+        self.fault_exception: str | None = None
+        self.unsupported = False  # the execution faulted at an instruction which the local VM doesn't support
+        self.logs: list[str] = []
+        self.coverage: set[tuple[OpCode, str]] | None = None  # the (opcode, class of the top item) executed, if set
+        self.uncaught_exception: StackItem | None = None
+        self._jumping = False
+        self._has_compound = False  # the references of the compound items must be counted
+        self._jump_table = [getattr(self, f"_op_{OpCode(op).name.lower()}") if op in OpCode._value2member_map_
+                            else None for op in range(256)]
+
+    @property
+    def current_context(self) -> ExecutionContext | None:
+        return self.invocation_stack[-1] if len(self.invocation_stack) > 0 else None
+
+    def load_script(self, script: bytes, rvcount: int = -1) -> ExecutionContext:
+        return self._load_context(ExecutionContext(_SharedStates(bytes(script)), 0, rvcount))
+
+    def execute(self) -> str:
+        if self.state == VMState.BREAK:
+            self.state = VMState.NONE
+        while self.state == VMState.NONE:
+            self.execute_next()
+        return self.state
+
+    def execute_next(self):
+        if len(self.invocation_stack) == 0:
+            self.state = VMState.HALT
+            return
+
+        context = self.invocation_stack[-1]
+        try:
+            instruction = context.current_instruction() or _RET
+            if self.coverage is not None:
+                stack = context.shared.stack
+                self.coverage.add((instruction.opcode, type(stack[-1]).__name__ if len(stack) > 0 else "Empty"))
+            self.add_fee(OPCODE_PRICE[instruction.opcode] * self.exec_fee_factor)
+            try:
+                self._jump_table[instruction.opcode](instruction)
+            except CatchableFault as e:
+                self._execute_throw(ByteString(str(e).encode('utf-8')))
+            except (ArithmeticError, ValueError) as e:  # i.e. the overflow of the int operands
+                raise VMFault(str(e))
+
+            if self._has_compound or len(context.stack) > MAX_STACK_SIZE // 2:
+                self._check_stack_size()
+            if not self._jumping:
+                context.ip += instruction.size
+            self._jumping = False
+        except VMFault as e:
+            self.state = VMState.FAULT
+            self.fault_exception = str(e)
+            self.unsupported = isinstance(e, UnsupportedFault)
+
+    def add_fee(self, datoshi: int):
+        self.gas_consumed += datoshi
+        if self.gas_consumed > self.gas_limit:
+            raise VMFault("Insufficient GAS.")
+
+    # The stack helpers.
+    def push(self, item: StackItem):
+        self.invocation_stack[-1].shared.stack.append(item)
+
+    def pop(self) -> StackItem:
+        stack = self.invocation_stack[-1].shared.stack
+        if len(stack) == 0:
+            raise VMFault("The evaluation stack is empty")
+        return stack.pop()
+
+    def peek(self, n: int = 0) -> StackItem:
+        stack = self.invocation_stack[-1].shared.stack
+        if n < 0 or n >= len(stack):
+            raise VMFault(f"Peek {n} out of the evaluation stack of {len(stack)} items")
+        return stack[-1 - n]
+
+    def remove(self, n: int) -> StackItem:
+        stack = self.invocation_stack[-1].shared.stack
+        if n < 0 or n >= len(stack):
+            raise VMFault(f"Remove {n} out of the evaluation stack of {len(stack)} items")
+        return stack.pop(-1 - n)
+
+    def pop_int(self) -> int:
+        return self.pop().to_int()
+
+    def pop_int32(self) -> int:
+        # The `(int)Pop().GetInteger()` of the neo-vm, it overflows if out of the int32 range.
+        value = self.pop().to_int()
+        if value < -0x80000000 or value > 0x7FFFFFFF:
+            raise VMFault(f"Value {value} out of the int32 range")
+        return value
+
+    def pop_bool(self) -> bool:
+        return self.pop().to_bool()
+
+    def pop_bytes(self) -> bytes:
+        item = self.pop()
+        if isinstance(item, Buffer):
+            return bytes(item.value)
+        return item.to_bytes()
+
+    def pop_primitive(self) -> PrimitiveType:
+        item = self.pop()
+        if not isinstance(item, PrimitiveType):
+            raise VMFault(f"Expected a primitive type, got {item.type.name}")
+        return item
+
+    def pop_array(self) -> Array:
+        item = self.pop()
+        if not isinstance(item, Array):
+            raise VMFault(f"Expected Array or Struct, got {item.type.name}")
+        return item
+
+    def push_int(self, value: int):
+        self.push(Integer(value))
+
+    def push_bool(self, value: bool):
+        self.push(Boolean(value))
+
+    def _new_compound(self, item: StackItem) -> StackItem:
+        self._has_compound = True
+        return item
+
+    def _check_stack_size(self):
+        # Counts the references from the stacks, the slots and the compound items, as the `ReferenceCounter`.
+        roots: list[StackItem] = []
+        seen_shared = set()
+        for context in self.invocation_stack:
+            if id(context.shared) not in seen_shared:
+                seen_shared.add(id(context.shared))
+                roots += context.shared.stack
+                roots += context.shared.static_fields or []
+            roots += context.local_variables or []
+            roots += context.arguments or []
+
+        count = len(roots)
+        if not self._has_compound:
+            if count > MAX_STACK_SIZE:
+                raise VMFault(f"MaxStackSize exceed: {count}")
+            return
+
+        visited = set()
+        pending = [item for item in roots if isinstance(item, (Array, Map))]
+        while len(pending) > 0:
+            item = pending.pop()
+            if id(item) in visited:
+                continue
+            visited.add(id(item))
+            children = item.children()
+            count += len(children)
+            if count > MAX_STACK_SIZE:
+                raise VMFault(f"MaxStackSize exceed: {count}")
+            pending += [child for child in children if isinstance(child, (Array, Map)) and id(child) not in visited]
+        if count > MAX_STACK_SIZE:
+            raise VMFault(f"MaxStackSize exceed: {count}")
+
+    def _load_context(self, context: ExecutionContext) -> ExecutionContext:
+        if len(self.invocation_stack) >= MAX_INVOCATION_STACK_SIZE:
+            raise VMFault(f"MaxInvocationStackSize exceed: {len(self.invocation_stack)}")
+        self.invocation_stack.append(context)
+        return context
+
+    def _jump(self, position: int):
+        context = self.invocation_stack[-1]
+        if position < 0 or position >= len(context.shared.script):
+            raise VMFault(f"Jump out of range for position: {position}")
+        context.ip = position
+        self._jumping = True
+
+    def _jump_offset(self, instruction: Instruction):
+        self._jump(instruction.offset + instruction.operand_int())
+
+    def _call(self, position: int):
+        context = self.invocation_stack[-1]
+        if position < 0 or position >= len(context.shared.script):
+            raise VMFault(f"Call out of range for position: {position}")
+        self._load_context(ExecutionContext(context.shared, position))
+
+    def _execute_throw(self, item: StackItem):
+        self.uncaught_exception = item
+        self._handle_exception()
+
+    def _handle_exception(self):
+        pop = 0
+        for context in reversed(self.invocation_stack):
+            while len(context.try_stack) > 0:
+                try_context = context.try_stack[-1]
+                if try_context.state == 'finally' or (try_context.state == 'catch' and try_context.finally_pointer < 0):
+                    context.try_stack.pop()
+                    continue
+
+                for _ in range(pop):
+                    self.invocation_stack.pop()
+                if try_context.state == 'try' and try_context.catch_pointer >= 0:
+                    try_context.state = 'catch'
+                    self.push(self.uncaught_exception)
+                    context.ip = try_context.catch_pointer
+                    self.uncaught_exception = None
+                else:
+                    try_context.state = 'finally'
+                    context.ip = try_context.finally_pointer
+                self._jumping = True
+                return
+            pop += 1
+        raise VMFault(f"An unhandled exception was thrown. {_exception_message(self.uncaught_exception)}")
+
+    # Constants
+    def _op_pushint8(self, instruction: Instruction):
+        self.push(Integer(instruction.operand_int()))
+
+    _op_pushint16 = _op_pushint32 = _op_pushint64 = _op_pushint128 = _op_pushint256 = _op_pushint8
+
+    def _op_pusht(self, instruction: Instruction):
+        self.push_bool(True)
+
+    def _op_pushf(self, instruction: Instruction):
+        self.push_bool(False)
+
+    def _op_pusha(self, instruction: Instruction):
+        shared = self.invocation_stack[-1].shared
+        position = instruction.offset + instruction.operand_int()
+        if position < 0 or position > len(shared.script):
+            raise VMFault(f"Bad pointer address: {position}")
+        self.push(Pointer(shared.script, position))
+
+    def _op_pushnull(self, instruction: Instruction):
+        self.push(NULL)
+
+    def _op_pushdata1(self, instruction: Instruction):
+        if len(instruction.operand) > MAX_ITEM_SIZE:
+            raise VMFault(f"MaxItemSize exceed: {len(instruction.operand)}")
+        self.push(ByteString(bytes(instruction.operand)))
+
+    _op_pushdata2 = _op_pushdata4 = _op_pushdata1
+
+    def _op_pushm1(self, instruction: Instruction):
+        self.push(Integer(instruction.opcode - OpCode.PUSH0))
+
+    _op_push0 = _op_push1 = _op_push2 = _op_push3 = _op_push4 = _op_push5 = _op_push6 = _op_push7 = _op_pushm1
+    _op_push8 = _op_push9 = _op_push10 = _op_push11 = _op_push12 = _op_push13 = _op_push14 = _op_pushm1
+    _op_push15 = _op_push16 = _op_pushm1
+
+    # Flow control
+    def _op_nop(self, instruction: Instruction):
+        pass
+
+    def _op_jmp(self, instruction: Instruction):
+        self._jump_offset(instruction)
+
+    _op_jmp_l = _op_jmp
+
+    def _op_jmpif(self, instruction: Instruction):
+        if self.pop_bool():
+            self._jump_offset(instruction)
+
+    _op_jmpif_l = _op_jmpif
+
+    def _op_jmpifnot(self, instruction: Instruction):
+        if not self.pop_bool():
+            self._jump_offset(instruction)
+
+    _op_jmpifnot_l = _op_jmpifnot
+
+    def _jump_compare(self, instruction: Instruction, compare):
+        x2 = self.pop_int()
+        x1 = self.pop_int()
+        if compare(x1, x2):
+            self._jump_offset(instruction)
+
+    def _op_jmpeq(self, instruction: Instruction):
+        self._jump_compare(instruction, lambda x1, x2: x1 == x2)
+
+    def _op_jmpne(self, instruction: Instruction):
+        self._jump_compare(instruction, lambda x1, x2: x1 != x2)
+
+    def _op_jmpgt(self, instruction: Instruction):
+        self._jump_compare(instruction, lambda x1, x2: x1 > x2)
+
+    def _op_jmpge(self, instruction: Instruction):
+        self._jump_compare(instruction, lambda x1, x2: x1 >= x2)
+
+    def _op_jmplt(self, instruction: Instruction):
+        self._jump_compare(instruction, lambda x1, x2: x1 < x2)
+
+    def _op_jmple(self, instruction: Instruction):
+        self._jump_compare(instruction, lambda x1, x2: x1 <= x2)
+
+    _op_jmpeq_l, _op_jmpne_l, _op_jmpgt_l = _op_jmpeq, _op_jmpne, _op_jmpgt
+    _op_jmpge_l, _op_jmplt_l, _op_jmple_l = _op_jmpge, _op_jmplt, _op_jmple
+
+    def _op_call(self, instruction: Instruction):
+        self._call(instruction.offset + instruction.operand_int())
+
+    _op_call_l = _op_call
+
+    def _op_calla(self, instruction: Instruction):
+        pointer = self.pop()
+        if not isinstance(pointer, Pointer):
+            raise VMFault(f"Expected Pointer, got {pointer.type.name}")
+        if pointer.script is not self.invocation_stack[-1].shared.script:
+            raise VMFault("Pointers can't be shared between scripts")
+        self._call(pointer.position)
+
+    def _op_callt(self, instruction: Instruction):
+        raise UnsupportedFault("CALLT needs the method tokens of a deployed contract")
+
+    def _op_abort(self, instruction: Instruction):
+        raise VMFault("ABORT is executed.")
+
+    def _op_assert(self, instruction: Instruction):
+        if not self.pop_bool():
+            raise VMFault("ASSERT is executed with false result.")
+
+    def _op_throw(self, instruction: Instruction):
+        self._execute_throw(self.pop())
+
+    def _try(self, catch_offset: int, finally_offset: int, instruction: Instruction):
+        if catch_offset == 0 and finally_offset == 0:
+            raise VMFault("Both catch and finally offsets can't be 0")
+        context = self.invocation_stack[-1]
+        if len(context.try_stack) >= MAX_TRY_NESTING_DEPTH:
+            raise VMFault("MaxTryNestingDepth exceed")
+        catch_pointer = -1 if catch_offset == 0 else instruction.offset + catch_offset
+        finally_pointer = -1 if finally_offset == 0 else instruction.offset + finally_offset
+        context.try_stack.append(_TryContext(catch_pointer, finally_pointer))
+
+    def _op_try(self, instruction: Instruction):
+        operand = instruction.operand
+        self._try(int.from_bytes(operand[0:1], 'little', signed=True),
+                  int.from_bytes(operand[1:2], 'little', signed=True), instruction)
+
+    def _op_try_l(self, instruction: Instruction):
+        operand = instruction.operand
+        self._try(int.from_bytes(operand[0:4], 'little', signed=True),
+                  int.from_bytes(operand[4:8], 'little', signed=True), instruction)
+
+    def _op_endtry(self, instruction: Instruction):
+        context = self.invocation_stack[-1]
+        if len(context.try_stack) == 0:
+            raise VMFault("The corresponding TRY block cannot be found")
+        try_context = context.try_stack[-1]
+        if try_context.state == 'finally':
+            raise VMFault("The opcode ENDTRY can't be executed in a FINALLY block")
+
+        end_pointer = instruction.offset + instruction.operand_int()
+        if try_context.finally_pointer >= 0:
+            try_context.state = 'finally'
+            try_context.end_pointer = end_pointer
+            context.ip = try_context.finally_pointer
+        else:
+            context.try_stack.pop()
+            context.ip = end_pointer
+        self._jumping = True
+
+    _op_endtry_l = _op_endtry
+
+    def _op_endfinally(self, instruction: Instruction):
+        context = self.invocation_stack[-1]
+        if len(context.try_stack) == 0:
+            raise VMFault("The corresponding TRY block cannot be found")
+        try_context = context.try_stack.pop()
+        if self.uncaught_exception is None:
+            context.ip = try_context.end_pointer
+        else:
+            self._handle_exception()
+        self._jumping = True
+
+    def _op_ret(self, instruction: Instruction):
+        context = self.invocation_stack.pop()
+        stack = self.result_stack if len(self.invocation_stack) == 0 else self.invocation_stack[-1].shared.stack
+        if context.shared.stack is not stack:
+            if context.rvcount >= 0 and len(context.shared.stack) != context.rvcount:
+                raise VMFault("RVCount doesn't match with EvaluationStack")
+            stack += context.shared.stack
+            context.shared.stack.clear()
+        if len(self.invocation_stack) == 0:
+            self.state = VMState.HALT
+        self._jumping = True
+
+    def _op_syscall(self, instruction: Instruction):
+        code = int.from_bytes(instruction.operand, 'little')
+        name = INTEROP_NAMES.get(code)
+        if name is None:
+            raise VMFault(f"Syscall not found: 0x{code:08x}")
+        syscall = self.syscalls.get(name)
+        if syscall is None:
+            raise UnsupportedFault(f"Syscall {name} needs the blockchain, it's not supported by the local VM")
+        (price, handler) = syscall
+        self.add_fee(price * self.exec_fee_factor)
+        handler(self)
+
+    # Stack
+    def _op_depth(self, instruction: Instruction):
+        self.push_int(len(self.invocation_stack[-1].shared.stack))
+
+    def _op_drop(self, instruction: Instruction):
+        self.pop()
+
+    def _op_nip(self, instruction: Instruction):
+        self.remove(1)
+
+    def _op_xdrop(self, instruction: Instruction):
+        n = self.pop_int32()
+        if n < 0:
+            raise VMFault(f"The negative value {n} is invalid for XDROP")
+        self.remove(n)
+
+    def _op_clear(self, instruction: Instruction):
+        self.invocation_stack[-1].shared.stack.clear()
+
+    def _op_dup(self, instruction: Instruction):
+        self.push(self.peek())
+
+    def _op_over(self, instruction: Instruction):
+        self.push(self.peek(1))
+
+    def _op_pick(self, instruction: Instruction):
+        n = self.pop_int32()
+        if n < 0:
+            raise VMFault(f"The negative value {n} is invalid for PICK")
+        self.push(self.peek(n))
+
+    def _op_tuck(self, instruction: Instruction):
+        stack = self.invocation_stack[-1].shared.stack
+        if len(stack) < 2:
+            raise VMFault("TUCK needs 2 items")
+        stack.insert(len(stack) - 2, stack[-1])
+
+    def _op_swap(self, instruction: Instruction):
+        self.push(self.remove(1))
+
+    def _op_rot(self, instruction: Instruction):
+        self.push(self.remove(2))
+
+    def _op_roll(self, instruction: Instruction):
+        n = self.pop_int32()
+        if n < 0:
+            raise VMFault(f"The negative value {n} is invalid for ROLL")
+        if n > 0:
+            self.push(self.remove(n))
+
+    def _reverse(self, n: int):
+        stack = self.invocation_stack[-1].shared.stack
+        if n < 0 or n > len(stack):
+            raise VMFault(f"Reverse {n} out of the evaluation stack of {len(stack)} items")
+        if n > 1:
+            stack[len(stack) - n:] = stack[len(stack) - n:][::-1]
+
+    def _op_reverse3(self, instruction: Instruction):
+        self._reverse(3)
+
+    def _op_reverse4(self, instruction: Instruction):
+        self._reverse(4)
+
+    def _op_reversen(self, instruction: Instruction):
+        self._reverse(self.pop_int32())
+
+    # Slot
+    def _op_initsslot(self, instruction: Instruction):
+        shared = self.invocation_stack[-1].shared
+        if shared.static_fields is not None:
+            raise VMFault("INITSSLOT cannot be executed twice")
+        if instruction.operand[0] == 0:
+            raise VMFault("The operand 0 is invalid for INITSSLOT")
+        shared.static_fields = [NULL] * instruction.operand[0]
+
+    def _op_initslot(self, instruction: Instruction):
+        context = self.invocation_stack[-1]
+        if context.local_variables is not None or context.arguments is not None:
+            raise VMFault("INITSLOT cannot be executed twice")
+        (locals_count, arguments_count) = (instruction.operand[0], instruction.operand[1])
+        if locals_count == 0 and arguments_count == 0:
+            raise VMFault("The operand 0 is invalid for INITSLOT")
+        if locals_count > 0:
+            context.local_variables = [NULL] * locals_count
+        if arguments_count > 0:
+            context.arguments = [self.pop() for _ in range(arguments_count)]
+
+    def _slot(self, instruction: Instruction) -> tuple[list[StackItem], int]:
+        # The slot and the index of the LD*/ST* instruction.
+        op = instruction.opcode
+        context = self.invocation_stack[-1]
+        if op <= OpCode.STSFLD:
+            (slot, first) = (context.shared.static_fields, OpCode.LDSFLD0 if op <= OpCode.LDSFLD else OpCode.STSFLD0)
+        elif op <= OpCode.STLOC:
+            (slot, first) = (context.local_variables, OpCode.LDLOC0 if op <= OpCode.LDLOC else OpCode.STLOC0)
+        else:
+            (slot, first) = (context.arguments, OpCode.LDARG0 if op <= OpCode.LDARG else OpCode.STARG0)
+        index = op - first if op - first < 7 else instruction.operand[0]
+        if slot is None:
+            raise VMFault(f"The slot of {op.name} is not initialized")
+        if index >= len(slot):
+            raise VMFault(f"The index {index} of {op.name} is out of the slot of {len(slot)} items")
+        return slot, index
+
+    def _op_ldsfld0(self, instruction: Instruction):
+        (slot, index) = self._slot(instruction)
+        self.push(slot[index])
+
+    def _op_stsfld0(self, instruction: Instruction):
+        (slot, index) = self._slot(instruction)
+        slot[index] = self.pop()
+
+    _op_ldsfld1 = _op_ldsfld2 = _op_ldsfld3 = _op_ldsfld4 = _op_ldsfld5 = _op_ldsfld6 = _op_ldsfld = _op_ldsfld0
+    _op_ldloc0 = _op_ldloc1 = _op_ldloc2 = _op_ldloc3 = _op_ldloc4 = _op_ldloc5 = _op_ldloc6 = _op_ldloc = _op_ldsfld0
+    _op_ldarg0 = _op_ldarg1 = _op_ldarg2 = _op_ldarg3 = _op_ldarg4 = _op_ldarg5 = _op_ldarg6 = _op_ldarg = _op_ldsfld0
+    _op_stsfld1 = _op_stsfld2 = _op_stsfld3 = _op_stsfld4 = _op_stsfld5 = _op_stsfld6 = _op_stsfld = _op_stsfld0
+    _op_stloc0 = _op_stloc1 = _op_stloc2 = _op_stloc3 = _op_stloc4 = _op_stloc5 = _op_stloc6 = _op_stloc = _op_stsfld0
+    _op_starg0 = _op_starg1 = _op_starg2 = _op_starg3 = _op_starg4 = _op_starg5 = _op_starg6 = _op_starg = _op_stsfld0
+
+    # Splice
+    def _check_item_size(self, size: int):
+        if size < 0 or size > MAX_ITEM_SIZE:
+            raise VMFault(f"MaxItemSize exceed: {size}")
+
+    def _pop_non_negative(self, name: str) -> int:
+        value = self.pop_int32()
+        if value < 0:
+            raise VMFault(f"The {name} can't be negative: {value}")
+        return value
+
+    def _op_newbuffer(self, instruction: Instruction):
+        length = self.pop_int32()
+        self._check_item_size(length)
+        self.push(Buffer(bytearray(length)))
+
+    def _op_memcpy(self, instruction: Instruction):
+        count = self._pop_non_negative("count")
+        source_index = self._pop_non_negative("source index")
+        source = self.pop_bytes()
+        if source_index + count > len(source):
+            raise VMFault(f"The source range is out of {len(source)} bytes")
+        dest_index = self._pop_non_negative("destination index")
+        dest = self.pop()
+        if not isinstance(dest, Buffer):
+            raise VMFault(f"Expected Buffer, got {dest.type.name}")
+        if dest_index + count > len(dest.value):
+            raise VMFault(f"The destination range is out of {len(dest.value)} bytes")
+        dest.value[dest_index:dest_index + count] = source[source_index:source_index + count]
+
+    def _op_cat(self, instruction: Instruction):
+        x2 = self.pop_bytes()
+        x1 = self.pop_bytes()
+        self._check_item_size(len(x1) + len(x2))
+        self.push(Buffer(bytearray(x1 + x2)))
+
+    def _op_substr(self, instruction: Instruction):
+        count = self._pop_non_negative("count")
+        index = self._pop_non_negative("index")
+        x = self.pop_bytes()
+        if index + count > len(x):
+            raise VMFault(f"The range is out of {len(x)} bytes")
+        self.push(Buffer(bytearray(x[index:index + count])))
+
+    def _op_left(self, instruction: Instruction):
+        count = self._pop_non_negative("count")
+        x = self.pop_bytes()
+        if count > len(x):
+            raise VMFault(f"The count {count} is out of {len(x)} bytes")
+        self.push(Buffer(bytearray(x[:count])))
+
+    def _op_right(self, instruction: Instruction):
+        count = self._pop_non_negative("count")
+        x = self.pop_bytes()
+        if count > len(x):
+            raise VMFault(f"The count {count} is out of {len(x)} bytes")
+        self.push(Buffer(bytearray(x[len(x) - count:])))
+
+    # Bitwise logic
+    def _op_invert(self, instruction: Instruction):
+        self.push_int(~self.pop_int())
+
+    def _binary(self, operation):
+        x2 = self.pop_int()
+        x1 = self.pop_int()
+        self.push(Integer(operation(x1, x2)))
+
+    def _op_and(self, instruction: Instruction):
+        self._binary(lambda x1, x2: x1 & x2)
+
+    def _op_or(self, instruction: Instruction):
+        self._binary(lambda x1, x2: x1 | x2)
+
+    def _op_xor(self, instruction: Instruction):
+        self._binary(lambda x1, x2: x1 ^ x2)
+
+    def _op_equal(self, instruction: Instruction):
+        x2 = self.pop()
+        x1 = self.pop()
+        self.push_bool(x1.equals(x2))
+
+    def _op_notequal(self, instruction: Instruction):
+        x2 = self.pop()
+        x1 = self.pop()
+        self.push_bool(not x1.equals(x2))
+
+    # Arithmetic
+    def _op_sign(self, instruction: Instruction):
+        x = self.pop_int()
+        self.push_int((x > 0) - (x < 0))
+
+    def _op_abs(self, instruction: Instruction):
+        self.push_int(abs(self.pop_int()))
+
+    def _op_negate(self, instruction: Instruction):
+        self.push_int(-self.pop_int())
+
+    def _op_inc(self, instruction: Instruction):
+        self.push_int(self.pop_int() + 1)
+
+    def _op_dec(self, instruction: Instruction):
+        self.push_int(self.pop_int() - 1)
+
+    def _op_add(self, instruction: Instruction):
+        self._binary(lambda x1, x2: x1 + x2)
+
+    def _op_sub(self, instruction: Instruction):
+        self._binary(lambda x1, x2: x1 - x2)
+
+    def _op_mul(self, instruction: Instruction):
+        self._binary(lambda x1, x2: x1 * x2)
+
+    def _op_div(self, instruction: Instruction):
+        self._binary(_truncated_div)
+
+    def _op_mod(self, instruction: Instruction):
+        self._binary(_truncated_mod)
+
+    def _check_shift(self, shift: int):
+        if shift < 0 or shift > MAX_SHIFT:
+            raise VMFault(f"Invalid shift value: {shift}")
+
+    def _op_pow(self, instruction: Instruction):
+        exponent = self.pop_int32()
+        self._check_shift(exponent)
+        self.push_int(self.pop_int() ** exponent)
+
+    def _op_sqrt(self, instruction: Instruction):
+        x = self.pop_int()
+        if x < 0:
+            raise VMFault("The value can't be negative for SQRT")
+        self.push_int(math.isqrt(x))
+
+    def _op_modmul(self, instruction: Instruction):
+        modulus = self.pop_int()
+        x2 = self.pop_int()
+        x1 = self.pop_int()
+        self.push_int(_truncated_mod(x1 * x2, modulus))
+
+    def _op_modpow(self, instruction: Instruction):
+        modulus = self.pop_int()
+        exponent = self.pop_int()
+        value = self.pop_int()
+        if exponent == -1:
+            if value <= 0 or modulus < 2:
+                raise VMFault("Invalid ModInverse arguments")
+            self.push_int(pow(value, -1, modulus))  # ValueError if no inverse
+            return
+        if exponent < 0:
+            raise VMFault(f"The exponent can't be negative: {exponent}")
+        if modulus == 0:
+            raise VMFault("Division by zero")
+        result = pow(abs(value), exponent, abs(modulus))  # the result of C# has the sign of the value
+        self.push_int(-result if value < 0 and exponent % 2 == 1 else result)
+
+    def _op_shl(self, instruction: Instruction):
+        shift = self.pop_int32()
+        self._check_shift(shift)
+        if shift != 0:
+            self.push_int(self.pop_int() << shift)
+
+    def _op_shr(self, instruction: Instruction):
+        shift = self.pop_int32()
+        self._check_shift(shift)
+        if shift != 0:
+            self.push_int(self.pop_int() >> shift)
+
+    def _op_not(self, instruction: Instruction):
+        self.push_bool(not self.pop_bool())
+
+    def _op_booland(self, instruction: Instruction):
+        x2 = self.pop_bool()
+        x1 = self.pop_bool()
+        self.push_bool(x1 and x2)
+
+    def _op_boolor(self, instruction: Instruction):
+        x2 = self.pop_bool()
+        x1 = self.pop_bool()
+        self.push_bool(x1 or x2)
+
+    def _op_nz(self, instruction: Instruction):
+        self.push_bool(self.pop_int() != 0)
+
+    def _compare(self, compare, null_result: bool | None = None):
+        x2 = self.pop()
+        x1 = self.pop()
+        if null_result is not None and (x1 is NULL or x2 is NULL):
+            self.push_bool(null_result)
+        else:
+            self.push_bool(compare(x1.to_int(), x2.to_int()))
+
+    def _op_numequal(self, instruction: Instruction):
+        self._compare(lambda x1, x2: x1 == x2)
+
+    def _op_numnotequal(self, instruction: Instruction):
+        self._compare(lambda x1, x2: x1 != x2)
+
+    def _op_lt(self, instruction: Instruction):
+        self._compare(lambda x1, x2: x1 < x2, False)
+
+    def _op_le(self, instruction: Instruction):
+        self._compare(lambda x1, x2: x1 <= x2, False)
+
+    def _op_gt(self, instruction: Instruction):
+        self._compare(lambda x1, x2: x1 > x2, False)
+
+    def _op_ge(self, instruction: Instruction):
+        self._compare(lambda x1, x2: x1 >= x2, False)
+
+    def _op_min(self, instruction: Instruction):
+        self._binary(min)
+
+    def _op_max(self, instruction: Instruction):
+        self._binary(max)
+
+    def _op_within(self, instruction: Instruction):
+        b = self.pop_int()
+        a = self.pop_int()
+        x = self.pop_int()
+        self.push_bool(a <= x < b)
+
+    # Compound-type
+    def _op_packmap(self, instruction: Instruction):
+        size = self.pop_int32()
+        if size < 0 or size * 2 > len(self.invocation_stack[-1].shared.stack):
+            raise VMFault(f"The map size {size} is out of the evaluation stack")
+        result = Map()
+        for _ in range(size):
+            key = self.pop_primitive()
+            value = self.pop()
+            result.entries[Map.check_key(key)] = (key, value)
+        self.push(self._new_compound(result))
+
+    def _pack(self, result: Array):
+        size = self.pop_int32()
+        if size < 0 or size > len(self.invocation_stack[-1].shared.stack):
+            raise VMFault(f"The array size {size} is out of the evaluation stack")
+        result.items = [self.pop() for _ in range(size)]
+        self.push(self._new_compound(result))
+
+    def _op_packstruct(self, instruction: Instruction):
+        self._pack(Struct())
+
+    def _op_pack(self, instruction: Instruction):
+        self._pack(Array())
+
+    def _op_unpack(self, instruction: Instruction):
+        compound = self.pop()
+        if isinstance(compound, Map):
+            for (key, value) in reversed(list(compound.entries.values())):
+                self.push(value)
+                self.push(key)
+            self.push_int(len(compound.entries))
+        elif isinstance(compound, Array):
+            for item in reversed(compound.items):
+                self.push(item)
+            self.push_int(len(compound.items))
+        else:
+            raise VMFault(f"Expected Array, Struct or Map, got {compound.type.name}")
+
+    def _op_newarray0(self, instruction: Instruction):
+        self.push(self._new_compound(Array()))
+
+    def _new_array_size(self) -> int:
+        n = self.pop_int32()
+        if n < 0 or n > MAX_STACK_SIZE:
+            raise VMFault(f"MaxStackSize exceed: {n}")
+        return n
+
+    def _op_newarray(self, instruction: Instruction):
+        self.push(self._new_compound(Array([NULL] * self._new_array_size())))
+
+    def _op_newarray_t(self, instruction: Instruction):
+        n = self._new_array_size()
+        type = instruction.operand[0]
+        if type not in StackItemType._value2member_map_:
+            raise VMFault(f"Invalid type for NEWARRAY_T: 0x{type:02x}")
+        if type == StackItemType.Boolean:
+            items = [Boolean(False) for _ in range(n)]
+        elif type == StackItemType.Integer:
+            items = [Integer(0) for _ in range(n)]
+        elif type == StackItemType.ByteString:
+            items = [ByteString(b'') for _ in range(n)]
+        else:
+            items = [NULL] * n
+        self.push(self._new_compound(Array(items)))
+
+    def _op_newstruct0(self, instruction: Instruction):
+        self.push(self._new_compound(Struct()))
+
+    def _op_newstruct(self, instruction: Instruction):
+        self.push(self._new_compound(Struct([NULL] * self._new_array_size())))
+
+    def _op_newmap(self, instruction: Instruction):
+        self.push(self._new_compound(Map()))
+
+    def _op_size(self, instruction: Instruction):
+        x = self.pop()
+        if isinstance(x, Array):
+            self.push_int(len(x.items))
+        elif isinstance(x, Map):
+            self.push_int(len(x.entries))
+        elif isinstance(x, (PrimitiveType, Buffer)):
+            self.push_int(x.size)
+        else:
+            raise VMFault(f"Invalid type for SIZE: {x.type.name}")
+
+    def _op_haskey(self, instruction: Instruction):
+        key = self.pop_primitive()
+        x = self.pop()
+        if isinstance(x, Map):
+            self.push_bool(Map.check_key(key) in x.entries)
+            return
+        if not isinstance(x, (Array, Buffer, ByteString)):
+            raise VMFault(f"Invalid type for HASKEY: {x.type.name}")
+        index = key.to_int()
+        if index < 0:
+            raise VMFault(f"The negative value {index} is invalid for HASKEY")
+        self.push_bool(index < (len(x.items) if isinstance(x, Array) else x.size))
+
+    def _op_keys(self, instruction: Instruction):
+        x = self.pop()
+        if not isinstance(x, Map):
+            raise VMFault(f"Expected Map, got {x.type.name}")
+        self.push(self._new_compound(Array([key for (key, _) in x.entries.values()])))
+
+    def _op_values(self, instruction: Instruction):
+        x = self.pop()
+        if isinstance(x, Array):
+            values = x.items
+        elif isinstance(x, Map):
+            values = [value for (_, value) in x.entries.values()]
+        else:
+            raise VMFault(f"Invalid type for VALUES: {x.type.name}")
+        self.push(self._new_compound(Array([v.clone() if isinstance(v, Struct) else v for v in values])))
+
+    def _op_pickitem(self, instruction: Instruction):
+        key = self.pop_primitive()
+        x = self.pop()
+        if isinstance(x, Map):
+            pair = x.entries.get(Map.check_key(key))
+            if pair is None:
+                raise CatchableFault("Key not found in Map")
+            self.push(pair[1])
+            return
+
+        index = key.to_int()
+        if isinstance(x, Array):
+            if index < 0 or index >= len(x.items):
+                raise CatchableFault(f"The value {index} is out of range.")
+            self.push(x.items[index])
+        elif isinstance(x, (PrimitiveType, Buffer)):
+            data = x.value if isinstance(x, Buffer) else x.to_bytes()
+            if index < 0 or index >= len(data):
+                raise CatchableFault(f"The value {index} is out of range.")
+            self.push_int(data[index])
+        else:
+            raise VMFault(f"Invalid type for PICKITEM: {x.type.name}")
+
+    def _op_append(self, instruction: Instruction):
+        item = self.pop()
+        array = self.pop_array()
+        array.items.append(item.clone() if isinstance(item, Struct) else item)
+
+    def _op_setitem(self, instruction: Instruction):
+        value = self.pop()
+        if isinstance(value, Struct):
+            value = value.clone()
+        key = self.pop_primitive()
+        x = self.pop()
+        if isinstance(x, Map):
+            x.entries[Map.check_key(key)] = (key, value)
+        elif isinstance(x, Array):
+            index = key.to_int()
+            if index < 0 or index >= len(x.items):
+                raise CatchableFault(f"The value {index} is out of range.")
+            x.items[index] = value
+        elif isinstance(x, Buffer):
+            index = key.to_int()
+            if index < 0 or index >= len(x.value):
+                raise CatchableFault(f"The value {index} is out of range.")
+            if not isinstance(value, PrimitiveType):
+                raise VMFault(f"Expected a primitive value, got {value.type.name}")
+            b = value.to_int()
+            if b < -128 or b > 255:
+                raise VMFault(f"Overflow in SETITEM, {b} is not a byte")
+            x.value[index] = b & 0xFF
+        else:
+            raise VMFault(f"Invalid type for SETITEM: {x.type.name}")
+
+    def _op_reverseitems(self, instruction: Instruction):
+        x = self.pop()
+        if isinstance(x, Array):
+            x.items.reverse()
+        elif isinstance(x, Buffer):
+            x.value.reverse()
+        else:
+            raise VMFault(f"Invalid type for REVERSEITEMS: {x.type.name}")
+
+    def _op_remove(self, instruction: Instruction):
+        key = self.pop_primitive()
+        x = self.pop()
+        if isinstance(x, Map):
+            x.entries.pop(Map.check_key(key), None)
+        elif isinstance(x, Array):
+            index = key.to_int()
+            if index < 0 or index >= len(x.items):
+                raise CatchableFault(f"The value {index} is out of range.")
+            del x.items[index]
+        else:
+            raise VMFault(f"Invalid type for REMOVE: {x.type.name}")
+
+    def _op_clearitems(self, instruction: Instruction):
+        x = self.pop()
+        if isinstance(x, Array):
+            x.items.clear()
+        elif isinstance(x, Map):
+            x.entries.clear()
+        else:
+            raise VMFault(f"Invalid type for CLEARITEMS: {x.type.name}")
+
+    def _op_popitem(self, instruction: Instruction):
+        array = self.pop_array()
+        if len(array.items) == 0:
+            raise VMFault("POPITEM from an empty array")
+        self.push(array.items.pop())
+
+    # Types
+    def _op_isnull(self, instruction: Instruction):
+        self.push_bool(self.pop() is NULL)
+
+    def _op_istype(self, instruction: Instruction):
+        x = self.pop()
+        type = instruction.operand[0]
+        if type == StackItemType.Any or type not in StackItemType._value2member_map_:
+            raise VMFault(f"Invalid type for ISTYPE: 0x{type:02x}")
+        self.push_bool(x.type == type)
+
+    def _op_convert(self, instruction: Instruction):
+        result = self.pop().convert(instruction.operand[0])
+        if isinstance(result, (Array, Map)):
+            self._has_compound = True
+        self.push(result)
+
+    # Extensions
+    def _op_abortmsg(self, instruction: Instruction):
+        message = self.pop_bytes().decode('utf-8', errors='replace')
+        raise VMFault(f"ABORTMSG is executed. Reason: {message}")
+
+    def _op_assertmsg(self, instruction: Instruction):
+        message = self.pop_bytes().decode('utf-8', errors='replace')
+        if not self.pop_bool():
+            raise VMFault(f"ASSERTMSG is executed with false result. Reason: {message}")
+
+
+def _exception_message(item: StackItem | None) -> str:
+    if isinstance(item, Array) and len(item.items) > 0:
+        item = item.items[0]
+    if isinstance(item, (ByteString, Buffer)):
+        return bytes(item.value).decode('utf-8', errors='replace')
+    if isinstance(item, PrimitiveType):
+        return str(item.to_int())
+    return item.type.name if item is not None else ""
+
+
+def _syscall_log(engine: ExecutionEngine):
+    message = engine.pop_bytes()
+    if len(message) > 1024:
+        raise VMFault(f"The log message of {len(message)} bytes exceeds 1024")
+    engine.logs.append(message.decode('utf-8'))
+
+
+def _syscall_burn_gas(engine: ExecutionEngine):
+    datoshi = engine.pop_int()
+    if datoshi <= 0:
+        raise VMFault("GAS must be positive.")
+    engine.add_fee(datoshi)
+
+
+# The syscalls without the chain state, name -> (price, handler), the fee is `price * exec_fee_factor`.
+SYSCALLS = {
+    "System.Runtime.Platform": (1 << 3, lambda engine: engine.push(ByteString(b'NEO'))),
+    "System.Runtime.GetNetwork": (1 << 3, lambda engine: engine.push_int(engine.network)),
+    "System.Runtime.GetAddressVersion": (1 << 3, lambda engine: engine.push_int(engine.address_version)),
+    "System.Runtime.GetTrigger": (1 << 3, lambda engine: engine.push_int(0x40)),  # Application
+    "System.Runtime.GasLeft": (1 << 4, lambda engine: engine.push_int(engine.gas_limit - engine.gas_consumed)),
+    "System.Runtime.GetInvocationCounter": (1 << 4, lambda engine: engine.push_int(1)),
+    "System.Runtime.Log": (1 << 15, _syscall_log),
+    "System.Runtime.BurnGas": (1 << 4, _syscall_burn_gas),
+}
+
+
+def invoke_script(script: bytes, gas_limit: int = DEFAULT_GAS_LIMIT, exec_fee_factor: int = DEFAULT_EXEC_FEE_FACTOR,
+                  network: int = 0) -> dict:
+    """
+    Runs the script on the local VM, the result has the same shape as the `invokescript` of the RpcServer.
+    """
+    engine = ExecutionEngine(gas_limit, exec_fee_factor, network)
+    engine.load_script(script)
+    engine.execute()
+    return execution_result(engine, script)
+
+
+def execution_result(engine: ExecutionEngine, script: bytes) -> dict:
+    stack = []
+    if engine.state == VMState.HALT:
+        try:
+            stack = [item.to_json(set()) for item in engine.result_stack]
+        except VMFault as e:
+            stack = f"error: {e}"  # the RpcServer returns the error too, i.e. the recursive reference
+    return {
+        'script': base64.b64encode(script).decode('utf-8'),
+        'state': engine.state,
+        'gasconsumed': str(engine.gas_consumed),
+        'exception': engine.fault_exception,
+        'notifications': [],
+        'stack': stack,
+    }
+
+
+class LocalVM:
+    """
+    The `invoke_script` and `batch` of RpcClient on the local VM, so the tests of the VM semantics can run
+    without a node, for example:
+
+        invoker = LocalVM() if mode == 'vm' else self.client
+        result = invoker.invoke_script(script)
+        with invoker.batch() as batch:
+            pending = batch.invoke_script(script)
+        pending.result()
+    """
+
+    def __init__(self, gas_limit: int = DEFAULT_GAS_LIMIT, exec_fee_factor: int = DEFAULT_EXEC_FEE_FACTOR,
+                 network: int = 0):
+        self.gas_limit = gas_limit
+        self.exec_fee_factor = exec_fee_factor
+        self.network = network
+
+    def invoke_script(self, script: bytes, signers: list[dict] = []) -> dict:
+        return invoke_script(script, self.gas_limit, self.exec_fee_factor, self.network)
+
+    def batch(self) -> '_LocalBatch':
+        return _LocalBatch(self)
+
+
+class _LocalBatch:
+    # The results are available immediately, the batch is for the same code path as RpcBatch.
+    def __init__(self, vm: LocalVM):
+        self._vm = vm
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def invoke_script(self, script: bytes, signers: list[dict] = []) -> RpcPending:
+        pending = RpcPending("invokescript")
+        pending.set_result(self._vm.invoke_script(script, signers))
+        return pending
+
+
+# Run with: python3 -B -m neo.vm <base64-script>
+if __name__ == "__main__":
+    import json
+    import sys
+    print(json.dumps(invoke_script(base64.b64decode(sys.argv[1])), indent=2))
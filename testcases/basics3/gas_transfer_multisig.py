@@ -11,6 +11,7 @@ class GasTransferMultiSign(BasicsTesting):
 
     def __init__(self):
         super().__init__("GasTransferMultiSign")
+        self.declare_resources(writes=['account:bft', 'account:others[0]', 'account:others[1]', 'account:others[2]'])
         self.neo3_only = True # NEO4 has different GAS contract.
 
     def _transfer_gas(self, dest160: UInt160, amount: int):
@@ -18,6 +18,8 @@ from testcases.basics3.base import BasicsTesting
 class NativeNep17(BasicsTesting):
     def __init__(self):
         super().__init__("NativeNep17")
+        # The totalSupply of GAS is checked per block, the fees burned by other tests will change it.
+        self.declare_resources(writes=['*'], sends_txs=False)
         self.claimed_gas_per_block = 5 * 1000_0000  # 0.5 GAS per block
         self.neo3_only = True # NEO4 has different GAS and NEO contract.
 
@@ -11,6 +11,7 @@ class NeoTransfer(BasicsTesting):
 
     def __init__(self):
         super().__init__("NeoTransfer")
+        self.declare_resources(writes=['account:others[0]', 'account:others[1]'])
         self.neo3_only = True # NEO4 has different NEO contract.
 
     def run_test(self):
@@ -11,6 +11,7 @@ class NeoTransferMultiSign(BasicsTesting):
 
     def __init__(self):
         super().__init__("NeoTransferMultiSign")
+        self.declare_resources(writes=['account:bft', 'account:others[0]'])
         self.neo3_only = True # NEO4 has different NEO contract.
 
     def run_test(self):
@@ -15,6 +15,7 @@ from testcases.testing import Testing
 class Contracts(Testing):
     def __init__(self):
         super().__init__("Contracts")
+        self.declare_resources(sends_txs=False)
 
     def _decode_hash(self, hash: str) -> str:
         hash = hash[2:] if hash.startswith('0x') else hash
@@ -10,6 +10,7 @@ from testcases.testing import Testing
 class DeploymentFee(Testing):
     def __init__(self):
         super().__init__("DeploymentFee")
+        self.declare_resources(writes=['contract_management.minimum_deployment_fee'])
         self.default_deployment_fee = 10_00000000  # 10 GAS
         self.deployment_fee = 1_00000000  # 1 GAS
 
@@ -12,6 +12,7 @@ class Keccak256Testing(Testing):
 
     def __init__(self):
         super().__init__("Keccak256Testing")
+        self.declare_resources()
         self.hardfork = Hardforks.HF_Cockatrice
 
     def _check_keccak256_result_stack(self, stack: list, expected_hash: str):
@@ -54,7 +55,7 @@ class Keccak256Testing(Testing):
         # Step 1: create a transaction to invoke the keccak256 hash function
         script = ScriptBuilder().emit_dynamic_call(
             CRYPTO_CONTRACT_HASH, "keccak256", CallFlags.READ_STATES, [b"hello world"]).to_bytes()
-        source = self.env.validators[0]
+        source = self.account
         block_index = self.client.get_block_index()
         tx = self.make_tx(source, script, self.default_sysfee, self.default_netfee, block_index + 10)
         tx_id = self.client.send_raw_tx(tx.to_array())['hash']
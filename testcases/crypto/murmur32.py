@@ -11,6 +11,7 @@ class Murmur32Testing(Testing):
 
     def __init__(self):
         super().__init__("Murmur32Testing")
+        self.declare_resources()
 
     def _check_murmur32_result_stack(self, stack: list, expected_hash: str):
         assert len(stack) == 1, f"Expected 1 item in stack, got {len(stack)}"
@@ -40,7 +41,7 @@ class Murmur32Testing(Testing):
         script = ScriptBuilder().emit_dynamic_call(
             CRYPTO_CONTRACT_HASH, "murmur32", CallFlags.READ_STATES, [None, 0]).to_bytes()
 
-        source = self.env.validators[0]
+        source = self.account
         block_index = self.client.get_block_index()
         tx = self.make_tx(source, script, self.default_sysfee, self.default_netfee, block_index + 10)
         tx_id = self.client.send_raw_tx(tx.to_array())['hash']
@@ -13,6 +13,7 @@ from testcases.testing import Testing
 class RecoverSecp256k1(Testing):
     def __init__(self):
         super().__init__("RecoverSecp256k1")
+        self.declare_resources(sends_txs=False)
         self.secp256k1_private_key = ecdsa.SigningKey.generate(curve=ecdsa.SECP256k1)
         self.SECP256K1_SHA256 = 22
         self.hardfork = Hardforks.HF_Echidna
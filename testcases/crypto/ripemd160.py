@@ -11,6 +11,7 @@ class Ripemd160Testing(Testing):
 
     def __init__(self):
         super().__init__("Ripemd160Testing")
+        self.declare_resources()
 
     def _check_ripemd160_result_stack(self, stack: list, expected_hash: str):
         assert len(stack) == 1, f"Expected 1 item in stack, got {len(stack)}"
@@ -44,7 +45,7 @@ class Ripemd160Testing(Testing):
         script = ScriptBuilder().emit_dynamic_call(
             CRYPTO_CONTRACT_HASH, "ripemd160", CallFlags.READ_STATES, [None]).to_bytes()
 
-        source = self.env.validators[0]
+        source = self.account
         block_index = self.client.get_block_index()
         tx = self.make_tx(source, script, self.default_sysfee, self.default_netfee, block_index + 10)
         tx_id = self.client.send_raw_tx(tx.to_array())['hash']
@@ -4,6 +4,7 @@ from neo.contract import *
 from testcases.testing import Testing
 
 import ecdsa
+import hashlib
 
 
 # Operation: this case tests the native contract CryptoLib.verifyWithEd25519 function.
@@ -17,13 +18,14 @@ import ecdsa
 class VerifyWithEd25519(Testing):
     def __init__(self):
         super().__init__("VerifyWithEd25519")
+        self.declare_resources()
         self.hardfork = Hardforks.HF_Echidna
 
     def _check_verify_with_ed25519(self, args: list[any], result: bool = True, exception: None | str = None):
         block_index = self.client.get_block_index()
         script = ScriptBuilder().emit_dynamic_call(CRYPTO_CONTRACT_HASH, "verifyWithEd25519",
                                                    CallFlags.READ_STATES, args).to_bytes()
-        tx = self.make_tx(self.env.validators[0], script, self.default_sysfee, self.default_netfee, block_index+10)
+        tx = self.make_tx(self.account, script, self.default_sysfee, self.default_netfee, block_index+10)
         tx_id = self.client.send_raw_tx(tx.to_array())['hash']
         self.logger.info(f"Transaction sent: {tx_id}")
 
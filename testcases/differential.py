@@ -0,0 +1,231 @@
+import argparse
+import base64
+import hashlib
+import json
+import os
+import time
+
+from dataclasses import dataclass
+from typing import Callable
+
+from neo.contract import POLICY_CONTRACT_HASH
+from neo.disassembler import DisassembleError, format_script, iter_instructions
+from neo.rpc import RpcError
+from neo.vm import ExecutionEngine, execution_result
+from testcases.testing import Testing
+
+
+def normalize_stack(stack: list | str) -> list | str:
+    # Drops the null values, the node may return {"type": "Any", "value": null} for the Null item.
+    if not isinstance(stack, list):
+        return stack
+    return [_normalize_item(item) for item in stack]
+
+
+def _normalize_item(item: dict) -> dict:
+    item = {k: v for (k, v) in item.items() if v is not None}
+    if item.get('type') in ('Array', 'Struct'):
+        item['value'] = [_normalize_item(x) for x in item['value']]
+    elif item.get('type') == 'Map':
+        item['value'] = [{'key': _normalize_item(p['key']), 'value': _normalize_item(p['value'])}
+                         for p in item['value']]
+    return item
+
+
+def divergence_of(local: dict, node: dict) -> str | None:
+    """
+    The first different field of the two `invokescript` results: 'state', 'stack' or 'gasconsumed',
+    or None if they're the same. The exception messages are not compared, they're different in the two VMs.
+    """
+    if local['state'] != node['state']:
+        return 'state'
+    if local['state'] == 'HALT' and normalize_stack(local['stack']) != normalize_stack(node['stack']):
+        return 'stack'
+    if node.get('gasconsumed') is not None and int(local['gasconsumed']) != int(node['gasconsumed']):
+        return 'gasconsumed'
+    return None
+
+
+def minimize_script(script: bytes, diverges: Callable[[list[bytes]], list[bool]]) -> bytes:
+    """
+    Removes the instructions which are not needed for the divergence, it's the ddmin on the instructions.
+    `diverges` checks a batch of candidate scripts, so the node side of each round is one batch request.
+    The jump offsets are not fixed up, so the candidates which break the jumps are just rejected.
+    """
+    try:
+        units = [bytes(script[i.offset:i.next_offset]) for i in iter_instructions(script)]
+    except DisassembleError:
+        return script
+
+    n = 2
+    while len(units) >= 2:
+        chunk = (len(units) + n - 1) // n
+        candidates = [units[:i] + units[i + chunk:] for i in range(0, len(units), chunk)]
+        results = diverges([b''.join(candidate) for candidate in candidates])
+        reduced = next((candidate for (candidate, result) in zip(candidates, results) if result), None)
+        if reduced is not None:
+            units = reduced
+            n = max(n - 1, 2)
+        elif n >= len(units):
+            break
+        else:
+            n = min(len(units), n * 2)
+    return b''.join(units)
+
+
+@dataclass
+class Divergence:
+    script: bytes
+    kind: str  # the first different field, see `divergence_of`
+    local: dict
+    node: dict
+    minimized: bytes | None = None
+
+    @property
+    def name(self) -> str:
+        return hashlib.sha256(self.script).hexdigest()[:12]
+
+    def as_dict(self) -> dict:
+        minimized = self.minimized if self.minimized is not None else self.script
+        return {
+            'kind': self.kind,
+            'script': base64.b64encode(self.script).decode('utf-8'),
+            'minimized': base64.b64encode(minimized).decode('utf-8'),
+            'disassembly': disassembly_lines(minimized),
+            'local': self.local,
+            'node': self.node,
+        }
+
+
+def disassembly_lines(script: bytes) -> list[str]:
+    try:
+        return format_script(script).split("\n")
+    except DisassembleError as e:
+        return [str(e)]
+
+
+def default_scripts() -> list[bytes]:
+    # The minimal script of each opcode, the results are left on the stack to be compared.
+    # They HALT on the local VM, except the opcodes which fault by design, i.e. ABORT, see tests/test_differential.py.
+    from benchmarks.opcode_matrix import opcode_cases
+    return [case.script(1, True, cleanup=False) for case in opcode_cases()]
+
+
+# Operation: this runner executes the same scripts on the local VM(`neo.vm`) and the node(`invokescript`),
+#  and compares the vmstate, the stack and the gasconsumed. The node side is sent in batch requests.
+#  The divergent scripts are minimized and written as JSON repro files.
+# Expect Result: The local VM and the node have the same results, except the syscalls the local VM doesn't support.
+class DifferentialRunner(Testing):
+
+    def __init__(self, scripts: list[bytes] | None = None, output_dir: str = 'differential', minimize: bool = True,
+                 batch_size: int = 100, loggerName: str = "DifferentialRunner"):
+        super().__init__(loggerName)
+        self.declare_resources(sends_txs=False)
+        self.scripts = scripts
+        self.output_dir = output_dir
+        self.minimize = minimize
+        self.batch_size = batch_size
+        self.exec_fee_factor = 30
+        self.network = 0
+        self.compared = 0
+        self.unsupported = 0
+        self.divergences: list[Divergence] = []
+
+    def pre_test(self):
+        result = self.client.invoke_function(POLICY_CONTRACT_HASH, "getExecFeeFactor", [])
+        self.exec_fee_factor = int(result['stack'][0]['value'])
+        self.network = int(self.client.get_version()['protocol']['network'])
+        self.logger.info(f"ExecFeeFactor: {self.exec_fee_factor}, network: {self.network}")
+
+    def run_test(self):
+        scripts = self.scripts if self.scripts is not None else default_scripts()
+        start_time = time.time()
+        self.divergences = self.compare(scripts)
+        elapsed = time.time() - start_time
+        self.logger.info(f"Compared {self.compared} scripts in {elapsed:.2f}s({self.compared / elapsed:.0f}/s), "
+                         f"{self.unsupported} unsupported by the local VM, {len(self.divergences)} divergences")
+
+        for divergence in self.divergences:
+            if self.minimize:
+                divergence.minimized = self.minimize_divergence(divergence)
+            path = self.write_repro(divergence)
+            self.logger.error(f"Divergence in {divergence.kind}, repro: {path}")
+        assert len(self.divergences) == 0, f"{len(self.divergences)} divergences found, see {self.output_dir}"
+
+    def run_local(self, script: bytes) -> tuple[dict, bool]:
+        """
+        Returns the invokescript-shaped result and whether the script needs what the local VM doesn't support.
+        """
+        engine = ExecutionEngine(exec_fee_factor=self.exec_fee_factor, network=self.network)
+        engine.load_script(script)
+        engine.execute()
+        return execution_result(engine, script), engine.unsupported
+
+    def run_node(self, scripts: list[bytes]) -> list[dict]:
+        pendings = []
+        for i in range(0, len(scripts), self.batch_size):
+            with self.client.batch(self.batch_size) as batch:
+                pendings += [batch.invoke_script(script) for script in scripts[i:i + self.batch_size]]
+
+        results = []
+        for pending in pendings:
+            try:
+                results.append(pending.result())
+            except RpcError as e:  # i.e. the node rejects the script, it's the same as a FAULT
+                results.append({'state': 'FAULT', 'exception': e.message, 'gasconsumed': None, 'stack': []})
+        return results
+
+    def compare(self, scripts: list[bytes]) -> list[Divergence]:
+        locals = [self.run_local(script) for script in scripts]
+        supported = [(script, local) for (script, (local, unsupported)) in zip(scripts, locals) if not unsupported]
+        self.unsupported += len(scripts) - len(supported)
+        self.compared += len(supported)
+
+        nodes = self.run_node([script for (script, _) in supported])
+        divergences = []
+        for ((script, local), node) in zip(supported, nodes):
+            kind = divergence_of(local, node)
+            if kind is not None:
+                divergences.append(Divergence(script, kind, local, node))
+        return divergences
+
+    def minimize_divergence(self, divergence: Divergence) -> bytes:
+        def diverges(candidates: list[bytes]) -> list[bool]:
+            locals = [self.run_local(candidate) for candidate in candidates]
+            nodes = self.run_node(candidates)
+            return [not unsupported and divergence_of(local, node) == divergence.kind
+                    for ((local, unsupported), node) in zip(locals, nodes)]
+
+        minimized = minimize_script(divergence.script, diverges)
+        self.logger.info(f"Minimized the {divergence.kind} divergence from {len(divergence.script)} "
+                         f"to {len(minimized)} bytes")
+        return minimized
+
+    def write_repro(self, divergence: Divergence) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"{divergence.name}.json")
+        with open(path, 'w') as f:
+            json.dump(divergence.as_dict(), f, indent=2)
+        return path
+
+
+def read_scripts(path: str) -> list[bytes]:
+    # One base64 script per line, the empty lines and the lines starting with '#' are skipped.
+    with open(path, 'r') as f:
+        lines = [line.strip() for line in f]
+    return [base64.b64decode(line) for line in lines if line and not line.startswith('#')]
+
+
+# Run with: python3 -B -m testcases.differential [--scripts file] [--output-dir dir] [--no-minimize]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the local VM and the node on the same scripts.")
+    parser.add_argument('--scripts', default='', help="a file of base64 scripts, one per line, "
+                                                      "the minimal script of each opcode in default")
+    parser.add_argument('--output-dir', default='differential', help="the directory of the repro files")
+    parser.add_argument('--no-minimize', action='store_true', help="don't minimize the divergent scripts")
+    parser.add_argument('--batch-size', type=int, default=100, help="the scripts in one batch request")
+    args = parser.parse_args()
+
+    scripts = read_scripts(args.scripts) if args.scripts else None
+    test = DifferentialRunner(scripts, args.output_dir, not args.no_minimize, args.batch_size)
+    test.run()
@@ -0,0 +1,295 @@
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import re
+import time
+
+from neo.contract import ScriptBuilder
+from neo.interop import INTEROP_CODES
+from neo.opcode import OPERAND_SIZE, OPERAND_SIZE_PREFIX, OpCode
+from neo.rpc import RpcError, RpcPending
+from neo.vm import ExecutionEngine, StackItemType, execution_result
+from testcases.differential import DifferentialRunner, Divergence, disassembly_lines, divergence_of, minimize_script
+
+# The saved scripts which crashed the node or diverged, they're replayed by `system/opcode/fuzz_regressions.py`.
+REGRESSIONS_PATH = os.path.join(os.path.dirname(__file__), 'system', 'opcode', 'fuzz_regressions.json')
+
+ITEM_TYPES = ['Null', 'Boolean', 'Integer', 'ByteString', 'Buffer', 'Array', 'Struct', 'Map', 'Pointer']
+INTERESTING_INTS = [0, 1, -1, 2, 16, 17, 127, 128, -128, 255, 256, 0x7FFFFFFF, 0x80000000, -0x80000000,
+                    (1 << 63) - 1, 1 << 63, (1 << 255) - 1, -(1 << 255)]
+BYTE_SIZES = [0, 1, 2, 20, 32, 33, 64, 65]
+MAX_SCRIPT_SIZE = 1024
+
+# The number of the items popped by the opcode, the others pop 2 items.
+_LOADS = {op for op in OpCode if op <= OpCode.PUSH16 or OpCode.LDSFLD0 <= op <= OpCode.LDSFLD or
+          OpCode.LDLOC0 <= op <= OpCode.LDLOC or OpCode.LDARG0 <= op <= OpCode.LDARG}
+_STORES = {op for op in OpCode if OpCode.STSFLD0 <= op <= OpCode.STSFLD or OpCode.STLOC0 <= op <= OpCode.STLOC or
+           OpCode.STARG0 <= op <= OpCode.STARG}
+_ARITY = {
+    **{op: 0 for op in _LOADS},
+    **{op: 1 for op in _STORES},
+    OpCode.NOP: 0, OpCode.JMP: 0, OpCode.JMP_L: 0, OpCode.CALL: 0, OpCode.CALL_L: 0, OpCode.CALLT: 0,
+    OpCode.ABORT: 0, OpCode.TRY: 0, OpCode.TRY_L: 0, OpCode.ENDTRY: 0, OpCode.ENDTRY_L: 0, OpCode.ENDFINALLY: 0,
+    OpCode.RET: 0, OpCode.SYSCALL: 0, OpCode.DEPTH: 0, OpCode.CLEAR: 0, OpCode.INITSSLOT: 0, OpCode.INITSLOT: 0,
+    OpCode.NEWARRAY0: 0, OpCode.NEWSTRUCT0: 0, OpCode.NEWMAP: 0,
+    OpCode.JMPIF: 1, OpCode.JMPIF_L: 1, OpCode.JMPIFNOT: 1, OpCode.JMPIFNOT_L: 1, OpCode.CALLA: 1,
+    OpCode.ASSERT: 1, OpCode.THROW: 1, OpCode.DROP: 1, OpCode.DUP: 1, OpCode.XDROP: 1, OpCode.PICK: 1,
+    OpCode.ROLL: 1, OpCode.REVERSEN: 1, OpCode.NEWBUFFER: 1, OpCode.INVERT: 1, OpCode.SIGN: 1, OpCode.ABS: 1,
+    OpCode.NEGATE: 1, OpCode.INC: 1, OpCode.DEC: 1, OpCode.SQRT: 1, OpCode.NOT: 1, OpCode.NZ: 1,
+    OpCode.PACKMAP: 1, OpCode.PACKSTRUCT: 1, OpCode.PACK: 1, OpCode.UNPACK: 1, OpCode.NEWARRAY: 1,
+    OpCode.NEWARRAY_T: 1, OpCode.NEWSTRUCT: 1, OpCode.SIZE: 1, OpCode.KEYS: 1, OpCode.VALUES: 1,
+    OpCode.REVERSEITEMS: 1, OpCode.CLEARITEMS: 1, OpCode.POPITEM: 1, OpCode.ISNULL: 1, OpCode.ISTYPE: 1,
+    OpCode.CONVERT: 1, OpCode.ABORTMSG: 1,
+    OpCode.ROT: 3, OpCode.REVERSE3: 3, OpCode.SUBSTR: 3, OpCode.MODMUL: 3, OpCode.MODPOW: 3, OpCode.WITHIN: 3,
+    OpCode.SETITEM: 3, OpCode.REVERSE4: 4, OpCode.MEMCPY: 5,
+}
+
+# The opcodes with an offset operand, the offset is small and forward so it may land in the script without a loop,
+# a loop runs until the gas limit(20 GAS) is used up, it's too slow for the local VM.
+_OFFSET_OPCODES = {op for op in OpCode if OpCode.JMP <= op <= OpCode.CALL_L} | \
+                  {OpCode.PUSHA, OpCode.TRY, OpCode.TRY_L, OpCode.ENDTRY, OpCode.ENDTRY_L}
+_TYPE_OPCODES = {OpCode.ISTYPE, OpCode.CONVERT, OpCode.NEWARRAY_T}
+
+
+def normalize_exception(message: str | None) -> str | None:
+    # The numbers and the hashes in the message are replaced, so the same error of different values is one message.
+    if message is None:
+        return None
+    return re.sub(r'0x[0-9a-fA-F]+|\d+', '#', message)
+
+
+class ScriptGenerator:
+    """
+    Generates the random scripts which are aware of the stack item types: each step pushes the inputs of an opcode,
+    the top one is the item of the chosen type, and then emits the opcode with a random operand.
+    The (opcode, type of the top item) pairs and the exception messages are the coverage, the generation is steered
+    toward the less covered pairs, and mutates the scripts which found new coverage.
+    """
+
+    def __init__(self, seed: int | None = None, max_steps: int = 8):
+        self.random = random.Random(seed)
+        self.max_steps = max_steps
+        self.pairs = [(op, t) for op in OpCode for t in ITEM_TYPES]
+        self._pair_set = set(self.pairs)
+        self.hits: dict[tuple[OpCode, str], int] = {}
+        self.exceptions: dict[str, int] = {}
+        self.corpus: list[bytes] = []
+
+    def covered(self) -> int:
+        return len(self.hits)
+
+    def update(self, script: bytes, coverage: set[tuple[OpCode, str]], exception: str | None) -> bool:
+        """
+        Adds the coverage of a script, returns True and keeps the script in the corpus if it found new coverage.
+        The pairs out of `self.pairs`, i.e. the (opcode, "Empty") of the empty stack, are not counted.
+        """
+        new = False
+        for pair in coverage & self._pair_set:
+            new = new or pair not in self.hits
+            self.hits[pair] = self.hits.get(pair, 0) + 1
+        exception = normalize_exception(exception)
+        if exception is not None:
+            new = new or exception not in self.exceptions
+            self.exceptions[exception] = self.exceptions.get(exception, 0) + 1
+        if new:
+            self.corpus.append(script)
+        return new
+
+    def generate(self) -> bytes:
+        if len(self.corpus) > 0 and self.random.random() < 0.5:
+            script = self.mutate(self.random.choice(self.corpus))
+            if len(script) <= MAX_SCRIPT_SIZE:  # the mutated scripts grow, the large ones are replaced
+                return script
+
+        script = b''
+        if self.random.random() < 0.5:  # the slots for the LD*/ST* opcodes
+            script += bytes([OpCode.INITSSLOT, 8, OpCode.INITSLOT, 8, 0])
+        for _ in range(self.random.randint(1, self.max_steps)):
+            script += self.step()
+        return script
+
+    def mutate(self, script: bytes) -> bytes:
+        choice = self.random.randrange(3)
+        if choice == 0:
+            return script + self.step()
+        if choice == 1:
+            return self.step() + script
+        return script + self.random.choice(self.corpus)  # splice
+
+    def step(self) -> bytes:
+        weights = [1.0 / (1 + self.hits.get(pair, 0)) ** 2 for pair in self.pairs]
+        (opcode, top_type) = self.random.choices(self.pairs, weights)[0]
+        inputs = b''.join(self.item(self.random.choice(ITEM_TYPES)) for _ in range(_ARITY.get(opcode, 2) - 1))
+        return inputs + self.item(top_type) + bytes([opcode]) + self.operand(opcode)
+
+    def item(self, type: str, depth: int = 0) -> bytes:
+        r = self.random
+        sb = ScriptBuilder()
+        if type == 'Null':
+            sb.emit(OpCode.PUSHNULL)
+        elif type == 'Boolean':
+            sb.emit(OpCode.PUSHT if r.random() < 0.5 else OpCode.PUSHF)
+        elif type == 'Integer':
+            sb.emit_push_int(r.choice(INTERESTING_INTS) if r.random() < 0.7 else r.randint(-1 << 64, 1 << 64))
+        elif type == 'ByteString':
+            sb.emit_push_bytes(r.randbytes(r.choice(BYTE_SIZES)))
+        elif type == 'Buffer':
+            sb.emit_push_bytes(r.randbytes(r.choice(BYTE_SIZES))).emit(OpCode.CONVERT, bytes([StackItemType.Buffer]))
+        elif type in ('Array', 'Struct', 'Map'):
+            count = 0 if depth > 0 else r.randint(0, 3)
+            item_types = ['Null', 'Boolean', 'Integer', 'ByteString'] if type == 'Map' else ITEM_TYPES
+            for _ in range(count * 2 if type == 'Map' else count):
+                sb._script += self.item(r.choice(item_types), depth + 1)
+            if count == 0:
+                sb.emit({'Array': OpCode.NEWARRAY0, 'Struct': OpCode.NEWSTRUCT0, 'Map': OpCode.NEWMAP}[type])
+            else:
+                sb.emit_push_int(count)
+                sb.emit({'Array': OpCode.PACK, 'Struct': OpCode.PACKSTRUCT, 'Map': OpCode.PACKMAP}[type])
+        elif type == 'Pointer':
+            sb.emit(OpCode.PUSHA, int(0).to_bytes(4, 'little'))  # points to itself
+        return sb.to_bytes()
+
+    def operand(self, opcode: OpCode) -> bytes:
+        r = self.random
+        prefix = OPERAND_SIZE_PREFIX[opcode]
+        if prefix > 0:
+            data = r.randbytes(r.choice(BYTE_SIZES))
+            return len(data).to_bytes(prefix, 'little') + data
+
+        size = OPERAND_SIZE[opcode]
+        if opcode in _TYPE_OPCODES:
+            return bytes([r.choice(list(StackItemType)) if r.random() < 0.9 else r.randrange(256)])
+        if opcode == OpCode.SYSCALL:
+            return r.choice(list(INTEROP_CODES.values())).to_bytes(4, 'little')
+        if opcode in _OFFSET_OPCODES:
+            half = size // 2 if opcode in (OpCode.TRY, OpCode.TRY_L) else size
+            return b''.join(r.randint(1, 12).to_bytes(half, 'little', signed=True) for _ in range(size // half))
+        if opcode in (OpCode.INITSSLOT, OpCode.INITSLOT) or size == 1:
+            return bytes(r.randint(0, 8) for _ in range(size))
+        return r.randbytes(size)
+
+
+def load_regressions(path: str = REGRESSIONS_PATH) -> list[dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_regression(entry: dict, path: str = REGRESSIONS_PATH) -> bool:
+    """
+    Appends the entry to the regressions file, returns False if the same script is saved already.
+    """
+    entries = load_regressions(path)
+    if any(e['name'] == entry['name'] for e in entries):
+        return False
+    entries.append(entry)
+    with open(path, 'w') as f:
+        json.dump(entries, f, indent=2)
+        f.write("\n")
+    return True
+
+
+def _is_error(pending: RpcPending) -> bool:
+    try:
+        pending.result()
+        return False
+    except RpcError:
+        return True
+
+
+# Operation: this fuzzer generates the stack-type-aware random scripts, runs them on the local VM with coverage and
+#  on the node in batched `invokescript` calls. The scripts crashing the node(RPC error) or diverging between the
+#  local VM and the node are minimized and saved as the regressions of `system/opcode/fuzz_regressions.py`.
+# Expect Result: No crash and no divergence.
+class ScriptFuzzer(DifferentialRunner):
+
+    def __init__(self, rounds: int = 100, batch_size: int = 100, max_steps: int = 8, seed: int | None = None,
+                 regressions_path: str = REGRESSIONS_PATH):
+        super().__init__([], minimize=True, batch_size=batch_size, loggerName="ScriptFuzzer")
+        self.rounds = rounds
+        self.generator = ScriptGenerator(seed, max_steps)
+        self.regressions_path = regressions_path
+        self.saved = 0
+
+    def run_test(self):
+        start_time = time.time()
+        for round in range(self.rounds):
+            scripts = [self.generator.generate() for _ in range(self.batch_size)]
+            self._fuzz(scripts)
+            if (round + 1) % 10 == 0 or round + 1 == self.rounds:
+                self.logger.info(f"Round {round + 1}: {self.compared} scripts in {time.time() - start_time:.1f}s, "
+                                 f"{self.generator.covered()}/{len(self.generator.pairs)} pairs, "
+                                 f"{len(self.generator.exceptions)} exceptions, {self.saved} regressions saved")
+        assert self.saved == 0, f"{self.saved} regressions found, see {self.regressions_path}"
+
+    def _fuzz(self, scripts: list[bytes]):
+        locals = []
+        for script in scripts:
+            engine = ExecutionEngine(exec_fee_factor=self.exec_fee_factor, network=self.network)
+            engine.coverage = set()
+            engine.load_script(script)
+            engine.execute()
+            locals.append((execution_result(engine, script), engine.unsupported, engine.coverage))
+
+        with self.client.batch(self.batch_size) as batch:
+            pendings = [batch.invoke_script(script) for script in scripts]
+        self.compared += len(scripts)
+
+        for (script, (local, unsupported, coverage), pending) in zip(scripts, locals, pendings):
+            try:
+                node = pending.result()
+            except RpcError as e:
+                self._save(self.minimize_crash(script), 'crash', local, {'error': e.message}, script)
+                continue
+
+            self.generator.update(script, coverage, node.get('exception'))
+            if unsupported:
+                self.unsupported += 1
+                continue
+            kind = divergence_of(local, node)
+            if kind is not None:
+                minimized = self.minimize_divergence(Divergence(script, kind, local, node))
+                self._save(minimized, f'divergence:{kind}', local, node, script)
+
+    def minimize_crash(self, script: bytes) -> bytes:
+        def crashes(candidates: list[bytes]) -> list[bool]:
+            with self.client.batch(self.batch_size) as batch:
+                pendings = [batch.invoke_script(candidate) for candidate in candidates]
+            return [_is_error(pending) for pending in pendings]
+
+        minimized = minimize_script(script, crashes)
+        self.logger.info(f"Minimized the crash from {len(script)} to {len(minimized)} bytes")
+        return minimized
+
+    def _save(self, script: bytes, kind: str, local: dict, node: dict, original: bytes | None = None):
+        fields = ('state', 'gasconsumed', 'exception', 'stack')
+        entry = {
+            'name': hashlib.sha256(script).hexdigest()[:12],
+            'kind': kind,
+            'script': base64.b64encode(script).decode('utf-8'),
+            'original': base64.b64encode(original or script).decode('utf-8'),
+            'disassembly': disassembly_lines(script),
+            'local': {k: local.get(k) for k in fields},
+            'node': node if 'error' in node else {k: node.get(k) for k in fields},
+            'found': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        }
+        if save_regression(entry, self.regressions_path):
+            self.saved += 1
+            self.logger.error(f"Saved the {kind} regression {entry['name']}: {entry['disassembly']}")
+
+
+# Run with: python3 -B -m testcases.fuzzer [--rounds N] [--batch-size N] [--max-steps N] [--seed N]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fuzz the NeoVM of the node with the stack-type-aware scripts.")
+    parser.add_argument('--rounds', type=int, default=100, help="the number of the batches")
+    parser.add_argument('--batch-size', type=int, default=100, help="the scripts in one batch request")
+    parser.add_argument('--max-steps', type=int, default=8, help="the max opcodes in a generated script")
+    parser.add_argument('--seed', type=int, default=None, help="the random seed")
+    args = parser.parse_args()
+
+    test = ScriptFuzzer(args.rounds, args.batch_size, args.max_steps, args.seed)
+    test.run()
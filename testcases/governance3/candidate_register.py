@@ -17,6 +17,7 @@ class CandidateRegister(Testing):
 
     def __init__(self):
         super().__init__("CandidateRegister")
+        self.declare_resources(writes=['candidates', 'account:others[0]', 'account:others[1]'])
         self.register_price = 1000_00000000  # 1000 GAS
         self.neo3_only = True # NEO4 has different Governance contract.
 
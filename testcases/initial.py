@@ -5,8 +5,10 @@ from testcases.basics3.neo_transfer_multisig import NeoTransferMultiSign
 from testcases.testing import Testing
 
 
-# Operation: this case initializes the NEO and GAS balance of the others[0], validator[0] and committee-address.
-# Expect Result: The NEO and GAS balance of the others[0], validator[0] and committee-address are initialized as expected.
+# Operation: this case initializes the NEO and GAS balance of the others[0], validator[0], committee-address
+#  and the pool accounts(see `Env.pool_accounts`).
+# Expect Result: The NEO and GAS balance of the others[0], validator[0], committee-address
+#  and the pool accounts are initialized as expected.
 class TestingInitial(Testing):
 
     def __init__(self):
@@ -27,6 +29,9 @@ class TestingInitial(Testing):
         # Step 4: initialize the GAS balance from bft-address to validator[0]
         self._initialize_gas_for_validator0()
 
+        # Step 5: initialize the GAS balance from bft-address to the pool accounts
+        self._initialize_gas_for_pool_accounts()
+
     def _initialize_gas_for_validator0(self):
         # Step 1: transfer 10000 GAS from the BFT account to validator[0]
         source160 = self.bft_address()
@@ -49,9 +54,8 @@ class TestingInitial(Testing):
         tx_id = self.client.send_raw_tx(tx.to_array())['hash']
         self.logger.info(f"Transaction for initializing GAS balance of validator[0] sent: {tx_id}")
 
-        # Step 4: wait for the next block
-        block_index = self.client.get_block_index()
-        self.wait_next_block(block_index)
+        # Step 4: wait for the transaction to be persisted
+        application_log = self.wait_for_tx(tx_id)
 
         # Step 5: check the destination GAS balance
         to_balance = self.client.get_gas_balance(dest160)
@@ -59,7 +63,6 @@ class TestingInitial(Testing):
         # assert to_balance == dest_balance + amount, f"Expected to_balance == {dest_balance + amount}, got {to_balance}"
 
         # Step 6: check the application log
-        application_log = self.client.get_application_log(tx_id)
         self.logger.info(f"Application log: {application_log}")
 
     def _initialize_gas_for_committee(self):
@@ -87,9 +90,8 @@ class TestingInitial(Testing):
         tx_id = self.client.send_raw_tx(tx.to_array())['hash']
         self.logger.info(f"Transaction for initializing GAS balance of committee sent: {tx_id}")
 
-        # Step 4: wait for the next block
-        block_index = self.client.get_block_index()
-        self.wait_next_block(block_index)
+        # Step 4: wait for the transaction to be persisted
+        application_log = self.wait_for_tx(tx_id)
 
         # Step 5: check the destination GAS balance
         to_balance = self.client.get_gas_balance(dest160)
@@ -97,9 +99,45 @@ class TestingInitial(Testing):
         #assert to_balance == dest_balance + amount, f"Expected to_balance == {dest_balance + amount}, got {to_balance}"
 
         # Step 6: check the application log
-        application_log = self.client.get_application_log(tx_id)
         self.logger.info(f"Application log: {application_log}")
 
+    def _initialize_gas_for_pool_accounts(self):
+        # Step 1: transfer 1000 GAS from the BFT account to each pool account in one transaction
+        source160 = self.bft_address()
+        accounts = self.env.pool_accounts()
+        amount = 1000_00000000  # 1000 GAS
+        sb = ScriptBuilder()
+        for account in accounts:
+            sb.emit_dynamic_call(
+                script_hash=GAS_CONTRACT_HASH,
+                method='transfer',
+                call_flags=(CallFlags.STATES | CallFlags.ALLOW_CALL | CallFlags.ALLOW_NOTIFY),
+                args=[source160, account.script_hash, amount, None],  # transfer(from, to, 1000 GAS, None)
+            ).emit(OpCode.ASSERT)
+        script = sb.to_bytes()
+
+        # Step 2: get the system fee of the transfers
+        result = self.client.invoke_script(script, [{'account': str(source160), 'scopes': 'CalledByEntry'}])
+        assert result['state'] == 'HALT', f"Expected HALT, got {result}"
+        sysfee = int(result['gasconsumed'])
+
+        # Step 3: send the transaction to the network
+        block_index = self.client.get_block_index()
+        tx = self.make_multisig_tx(script, sysfee, self.default_netfee, block_index + 10)
+        tx_id = self.client.send_raw_tx(tx.to_array())['hash']
+        self.logger.info(f"Transaction for initializing GAS balance of {len(accounts)} pool accounts sent: {tx_id}")
+
+        # Step 4: wait for the transaction to be persisted
+        application_log = self.wait_for_tx(tx_id)
+        assert application_log['executions'][0]['vmstate'] == 'HALT', f"Expected HALT, got {application_log}"
+
+        # Step 5: check the GAS balance of the pool accounts
+        with self.client.batch() as batch:
+            balances = [batch.get_gas_balance(account.script_hash) for account in accounts]
+        for (account, balance) in zip(accounts, balances):
+            self.logger.info(f"Pool account {account.script_hash} GAS balance: {balance.result()}")
+            assert balance.result() >= amount, f"Expected balance >= {amount}, got {balance.result()}"
+
 
 # Run with: python3 -B -m testcases.initial
 if __name__ == "__main__":
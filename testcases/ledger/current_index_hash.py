@@ -13,6 +13,7 @@ from testcases.testing import Testing
 class CurrentIndexHash(Testing):
     def __init__(self):
         super().__init__("CurrentIndexHash")
+        self.declare_resources(sends_txs=False)
 
     def run_test(self):
         # Step 1: check current index
@@ -18,6 +18,7 @@ from testcases.testing import Testing
 class TxFromBlock(Testing):
     def __init__(self):
         super().__init__("TxFromBlock")
+        self.declare_resources(reads=['policy.max_traceable_blocks'], sends_txs=False)
 
     def _check_argument_null(self):
         # Step 1: check argument null with blockIndexOrHash is null
@@ -14,6 +14,7 @@ from testcases.testing import Testing
 class GetTxHeight(Testing):
     def __init__(self):
         super().__init__("GetTxHeight")
+        self.declare_resources(reads=['policy.max_traceable_blocks'], sends_txs=False)
 
     def _check_argument_null(self):
         # Step 1: check argument null
@@ -0,0 +1,207 @@
+import argparse
+import asyncio
+import json
+import math
+import time
+
+from dataclasses import dataclass, field
+
+from neo import CallFlags
+from neo.contract import GAS_CONTRACT_HASH, CallTemplate
+from neo.rpc import AsyncRpcClient, RpcError
+from testcases.testing import Testing
+
+
+def percentile(values: list[float], p: float) -> float:
+    """
+    The nearest-rank percentile of the values, `p` is in range [0, 100].
+    """
+    if len(values) == 0:
+        return math.nan
+    ordered = sorted(values)
+    rank = max(math.ceil(p / 100.0 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+@dataclass
+class LoadReport:
+    txs: int
+    target_tps: float
+    submit_seconds: float = 0.0  # from the first submission to the last one
+    accepted: int = 0
+    rejected: dict[str, int] = field(default_factory=dict)  # error message -> count
+    persisted: int = 0
+    latencies: list[float] = field(default_factory=list)  # submit-to-persist latency of the persisted txs, in seconds
+    mempool: list[dict] = field(default_factory=list)  # the samples of {'time', 'block_index', 'verified', 'unverified'}
+
+    def as_dict(self) -> dict:
+        return {
+            "txs": self.txs,
+            "target_tps": self.target_tps,
+            "submit_tps": self.accepted / self.submit_seconds if self.submit_seconds > 0 else 0.0,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "persisted": self.persisted,
+            "latency": {  # None if no tx is persisted, NaN is not valid JSON
+                "p50": percentile(self.latencies, 50) if len(self.latencies) > 0 else None,
+                "p90": percentile(self.latencies, 90) if len(self.latencies) > 0 else None,
+                "p99": percentile(self.latencies, 99) if len(self.latencies) > 0 else None,
+                "max": max(self.latencies, default=None),
+            },
+            "mempool": self.mempool,
+        }
+
+    def summary(self) -> str:
+        data = self.as_dict()
+        latency = {k: f"{v:.3f}s" if v is not None else "n/a" for (k, v) in data['latency'].items()}
+        lines = [
+            f"submitted {self.txs} txs at target {self.target_tps} TPS, achieved {data['submit_tps']:.1f} TPS",
+            f"accepted {self.accepted}, rejected {sum(self.rejected.values())}, persisted {self.persisted}",
+            f"submit-to-persist latency: p50 {latency['p50']}, p90 {latency['p90']}, "
+            f"p99 {latency['p99']}, max {latency['max']}",
+            f"max mempool depth: {max((s['verified'] + s['unverified'] for s in self.mempool), default=0)}",
+        ]
+        lines += [f"rejected {count}: {message}" for (message, count) in self.rejected.items()]
+        return "\n".join(lines)
+
+
+# Operation: this case pre-builds and pre-signs GAS transfers between the pool accounts(see `Env.pool_accounts`),
+#  and submits them at the target TPS with concurrent `sendrawtransaction`.
+# Expect Result: The report of the submit-to-persist latency and the mempool depth over time.
+#  The pool accounts must be funded by the initial testcase.
+class LoadGenerator(Testing):
+
+    def __init__(self, txs: int = 1000, tps: float = 100.0, accounts: int = 0, concurrency: int = 32,
+                 sample_interval: float = 0.1, persist_timeout: float = 120.0):
+        super().__init__("LoadGenerator")
+        self.txs = txs
+        self.tps = tps
+        self.accounts = accounts if accounts > 0 else self.env.account_pool_size
+        self.concurrency = concurrency
+        self.sample_interval = sample_interval
+        self.persist_timeout = persist_timeout
+        self.report = LoadReport(txs, tps)
+
+    def run_test(self):
+        # Step 1: pre-build and pre-sign the transfers
+        txs = self._make_transfers()
+
+        # Step 2: submit the transfers at the target TPS, and wait for them to be persisted
+        asyncio.run(self._run_load(txs))
+
+        # Step 3: report the result
+        self.logger.info(f"Load result:\n{self.report.summary()}")
+        assert self.report.persisted == self.report.accepted, \
+            f"Expected {self.report.accepted} txs persisted, got {self.report.persisted}"
+
+    def _make_transfers(self) -> list[bytes]:
+        accounts = self.env.pool_accounts()
+        assert self.accounts <= len(accounts), \
+            f"Expected at most {len(accounts)} accounts, got {self.accounts}, increase `account_pool_size` in testbed"
+        accounts = accounts[:self.accounts]
+
+        # All txs must be valid until the end of the run, so use the max `ValidUntilBlock` increment.
+        block_index = self.client.get_block_index()
+        increment = int(self.client.get_version()['protocol']['maxvaliduntilblockincrement'])
+        valid_until_block = block_index + increment - 1
+
+        start_time = time.time()
+        flags = CallFlags.STATES | CallFlags.ALLOW_CALL | CallFlags.ALLOW_NOTIFY
+        transfer = CallTemplate(GAS_CONTRACT_HASH, 'transfer', flags)
+        txs = []
+        for i in range(self.txs):
+            source = accounts[i % len(accounts)]
+            dest = accounts[(i + 1) % len(accounts)]
+            # transfer(from, to, 1 datoshi, None)
+            script = transfer.build([source.script_hash, dest.script_hash, 1, None])
+            tx = self.make_tx(source, script, self.default_sysfee, self.default_netfee, valid_until_block)
+            txs.append(tx.to_array())
+        self.logger.info(f"Built {len(txs)} transfers with {len(accounts)} accounts in {time.time() - start_time:.2f}s")
+        return txs
+
+    async def _run_load(self, txs: list[bytes]):
+        submitted: dict[str, float] = {}  # tx hash -> the time when it's sent
+        persisted: dict[str, float] = {}  # tx hash -> the time when its block is observed
+        submitting = asyncio.Event()
+        submitting.set()
+
+        async with AsyncRpcClient(self.env.rpc_endpoint, max_concurrency=self.concurrency) as sender, \
+                AsyncRpcClient(self.env.rpc_endpoint, max_concurrency=2) as monitor:
+            monitor_task = asyncio.create_task(self._monitor(monitor, submitted, persisted, submitting))
+            try:
+                await self._submit(sender, txs, submitted)
+                submitting.clear()
+                await monitor_task
+            finally:
+                monitor_task.cancel()
+
+        self.report.accepted = len(submitted)
+        self.report.latencies = [persisted[h] - submitted[h] for h in submitted if h in persisted]
+        self.report.persisted = len(self.report.latencies)
+
+    async def _submit(self, client: AsyncRpcClient, txs: list[bytes], submitted: dict[str, float]):
+        async def send(raw_tx: bytes):
+            sent_time = time.time()  # before the await, the block may be observed before the response
+            try:
+                tx_hash = (await client.send_raw_tx(raw_tx))['hash']
+                submitted[tx_hash] = sent_time
+            except RpcError as e:
+                self.report.rejected[e.message] = self.report.rejected.get(e.message, 0) + 1
+
+        start_time = time.time()
+        tasks = []
+        for (i, raw_tx) in enumerate(txs):
+            delay = start_time + i / self.tps - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send(raw_tx)))
+        await asyncio.gather(*tasks)
+        self.report.submit_seconds = time.time() - start_time
+
+    async def _monitor(self, client: AsyncRpcClient, submitted: dict[str, float], persisted: dict[str, float],
+                       submitting: asyncio.Event):
+        start_time = time.time()
+        block_index = await client.get_block_index()
+        deadline = None
+        while True:
+            (latest, mempool) = await asyncio.gather(client.get_block_index(), client.get_mempool(True))
+            now = time.time()
+            self.report.mempool.append({
+                'time': round(now - start_time, 3),
+                'block_index': latest,
+                'verified': len(mempool['verified']),
+                'unverified': len(mempool['unverified']),
+            })
+
+            blocks = await asyncio.gather(*[client.get_block(i, True) for i in range(block_index + 1, latest + 1)])
+            for block in blocks:
+                for tx in block['tx']:
+                    persisted[tx['hash']] = now
+            block_index = latest
+
+            if not submitting.is_set():
+                deadline = deadline or now + self.persist_timeout
+                if all(h in persisted for h in submitted):
+                    return
+                if now > deadline:
+                    self.logger.warning(f"Timeout waiting for txs to be persisted after {self.persist_timeout}s")
+                    return
+            await asyncio.sleep(self.sample_interval)
+
+
+# Run with: python3 -B -m testcases.loadgen [--txs N] [--tps TPS] [--accounts N] [--concurrency N] [--output file]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Submit GAS transfers at the target TPS and report the latency.")
+    parser.add_argument('--txs', type=int, default=1000, help="the number of the transfers")
+    parser.add_argument('--tps', type=float, default=100.0, help="the target submission rate")
+    parser.add_argument('--accounts', type=int, default=0,
+                        help="the number of the sender accounts, all pool accounts in default")
+    parser.add_argument('--concurrency', type=int, default=32, help="the max concurrent sendrawtransaction calls")
+    parser.add_argument('--output', default='', help="write the report to the JSON file")
+    args = parser.parse_args()
+
+    test = LoadGenerator(args.txs, args.tps, args.accounts, args.concurrency)
+    test.run()
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(test.report.as_dict(), f, indent=2)
@@ -6,6 +6,7 @@ from testcases.testing import Testing
 class NotaryDepositN3(Testing):
     def __init__(self):
         super().__init__("NotaryDepositN3")
+        self.declare_resources(writes=['notary.deposit:others[0]', 'account:others[0]'])
         self.neo3_only = True  # NEO4 has different GAS contract.
         self.default_sysfee = 2_0000000  # 0.2 GAS
         self.default_netfee = 2_0000000  # 0.2 GAS
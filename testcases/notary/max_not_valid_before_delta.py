@@ -10,6 +10,7 @@ from testcases.testing import Testing
 class MaxNotValidBeforeDelta(Testing):
     def __init__(self):
         super().__init__("MaxNotValidBeforeDelta")
+        self.declare_resources(reads=['notary.max_not_valid_before_delta'])
 
         # A default value for maximum allowed NotValidBeforeDelta.
         # It is set to be 20 rounds for 7 validators, a little more than half an hour for 15s blocks.
@@ -46,7 +47,7 @@ class MaxNotValidBeforeDelta(Testing):
         ).to_bytes()
 
         # Step 2: send the transaction
-        tx = self.make_tx(self.env.validators[0], script, self.default_sysfee, self.default_netfee, block_index+10)
+        tx = self.make_tx(self.account, script, self.default_sysfee, self.default_netfee, block_index+10)
         tx_id = self.client.send_raw_tx(tx.to_array())['hash']
         self.logger.info(f"setMaxNotValidBeforeDelta transaction sent: {tx_id}")
 
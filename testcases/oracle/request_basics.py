@@ -17,6 +17,7 @@ class OracleRequestBasics(Testing):
 
     def __init__(self):
         super().__init__("OracleRequestBasics")
+        self.declare_resources(reads=['oracle.price'], sends_txs=False)
         self.min_gas_for_response = 1_000_0000  # 0.1 GAS
         self.test_url = "https://not-found-domain-url.xyz"
         self.url_max_size = 256
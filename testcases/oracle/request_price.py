@@ -9,6 +9,7 @@ from testcases.testing import Testing
 class OracleRequestPrice(Testing):
     def __init__(self):
         super().__init__("OracleRequestPrice")
+        self.declare_resources(writes=['oracle.price'])
         self.original_price = 5000_0000  # 0.5 GAS
         self.update_price = 1000_0000   # 0.1 GAS
 
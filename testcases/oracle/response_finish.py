@@ -9,6 +9,7 @@ from testcases.testing import Testing
 class OracleResponseFinish(Testing):
     def __init__(self):
         super().__init__("OracleResponseFinish")
+        self.declare_resources(writes=['account:validators[0]'])
 
     def _check_invocation_counter(self):
         result = self.client.invoke_function(ORACLE_CONTRACT_HASH, "finish", [])
@@ -8,6 +8,7 @@ from testcases.testing import Testing
 class OracleResponseVerify(Testing):
     def __init__(self):
         super().__init__("OracleResponseVerify")
+        self.declare_resources(writes=['account:validators[0]'])
 
     def _verify_with_tx(self):
         # Step 1: build the transaction
@@ -11,6 +11,7 @@ class GetCandidates(Testing):
 
     def __init__(self):
         super().__init__("GetCandidates")
+        self.declare_resources(reads=['candidates'], sends_txs=False)
 
     def run_test(self):
         candidates1 = self.client.send("getcandidates", [])
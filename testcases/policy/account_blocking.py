@@ -15,6 +15,7 @@ class AccountBlocking(Testing):
 
     def __init__(self):
         super().__init__("AccountBlocking")
+        self.declare_resources(writes=['policy.blocked_accounts'])
         self.account_to_block = "0x0000000000000000000000000000000000000001"
 
     def _encode_hash(self, hash: str) -> str:
@@ -43,65 +44,67 @@ class AccountBlocking(Testing):
         self.logger.info(f"blockAccount {account} result: {result}")
         assert 'exception' in result and "Invalid committee signature" in result['exception']
 
-    def _block_account(self, account: str | None, expected: bool, exception: str | None = None):
-        # Step 1: make the transaction to block the account
+    def _make_account_tx(self, method: str, account: str | None):
         account = None if account is None else UInt160.from_string(account)
         block_index = self.client.get_block_index()
         script = ScriptBuilder().emit_dynamic_call(
             script_hash=POLICY_CONTRACT_HASH,
-            method='blockAccount',
+            method=method,
             call_flags=(CallFlags.STATES | CallFlags.ALLOW_NOTIFY),
             args=[account],
         ).to_bytes()
+        return self.make_multisig_tx(script, self.default_sysfee, self.default_netfee,
+                                     block_index+10, is_committee=True)
+
+    def _check_account_tx(self, label: str, application_log: dict, expected: bool | None,
+                          exception: str | None = None):
+        self.logger.info(f"{label} application log: {application_log}")
+        if exception is not None:
+            self.check_execution_result(application_log['executions'][0], exception=exception)
+        elif expected is not None:
+            self.check_execution_result(application_log['executions'][0], stack=[('Boolean', expected)])
+        else:
+            pass  # not check the result
+
+    def _block_account(self, account: str | None, expected: bool, exception: str | None = None):
+        # Step 1: make the transaction to block the account
+        tx = self._make_account_tx('blockAccount', account)
 
         # Step 2: send the transaction to the network
-        tx = self.make_multisig_tx(script, self.default_sysfee, self.default_netfee,
-                                   block_index+10, is_committee=True)
         tx_id = self.client.send_raw_tx(tx.to_array())['hash']
         self.logger.info(f"blockAccount {account} transaction sent: {tx_id}")
 
-        # Step 3: wait for the next block
-        block_index = self.client.get_block_index()
-        self.wait_next_block(block_index)
-
-        # Step 4: check the application log
-        application_log = self.client.get_application_log(tx_id)
-        self.logger.info(f"blockAccount {account} application log: {application_log}")
-        if exception is None:
-            self.check_execution_result(application_log['executions'][0], stack=[('Boolean', expected)])
-        else:
-            self.check_execution_result(application_log['executions'][0], exception=exception)
+        # Step 3: wait for the transaction and check the application log
+        application_log = self.wait_for_tx(tx_id)
+        self._check_account_tx(f"blockAccount {account}", application_log, expected, exception)
 
     def _unblock_account(self, account: str | None, expected: bool | None, exception: str | None = None):
         # Step 1: make the transaction to unblock the account
-        account = None if account is None else UInt160.from_string(account)
-        block_index = self.client.get_block_index()
-        script = ScriptBuilder().emit_dynamic_call(
-            script_hash=POLICY_CONTRACT_HASH,
-            method='unblockAccount',
-            call_flags=(CallFlags.STATES | CallFlags.ALLOW_NOTIFY),
-            args=[account],
-        ).to_bytes()
+        tx = self._make_account_tx('unblockAccount', account)
 
         # Step 2: send the transaction to the network
-        tx = self.make_multisig_tx(script, self.default_sysfee, self.default_netfee,
-                                   block_index+10, is_committee=True)
         tx_id = self.client.send_raw_tx(tx.to_array())['hash']
         self.logger.info(f"unblockAccount {account} transaction sent: {tx_id}")
 
-        # Step 3: wait for the next block
-        block_index = self.client.get_block_index()
-        self.wait_next_block(block_index)
-
-        # Step 4: check the application log
-        application_log = self.client.get_application_log(tx_id)
-        self.logger.info(f"unblockAccount {account} application log: {application_log}")
-        if exception is not None:
-            self.check_execution_result(application_log['executions'][0], exception=exception)
-        elif expected is not None:
-            self.check_execution_result(application_log['executions'][0], stack=[('Boolean', expected)])
-        else:
-            pass  # not check the result
+        # Step 3: wait for the transaction and check the application log
+        application_log = self.wait_for_tx(tx_id)
+        self._check_account_tx(f"unblockAccount {account}", application_log, expected, exception)
+
+    def _block_independent_accounts(self):
+        # These transactions don't depend on each other, so send them together.
+        steps = [
+            ('blockAccount', POLICY_CONTRACT_HASH, False, "Cannot block a native contract"),
+            ('blockAccount', self.account_to_block, True, None),
+            ('blockAccount', None, False, "can't be null"),
+            ('unblockAccount', None, False, "can't be null"),
+        ]
+        pipeline = self.tx_pipeline()
+        for (method, account, _, _) in steps:
+            pipeline.add(self._make_account_tx(method, account), f"{method} {account}")
+
+        application_logs = pipeline.run()
+        for (method, account, expected, exception), application_log in zip(steps, application_logs):
+            self._check_account_tx(f"{method} {account}", application_log, expected, exception)
 
     def run_test(self):
         # Step 1: check the account is not blocked
@@ -113,33 +116,24 @@ class AccountBlocking(Testing):
         # Step 3: block the account with no permission
         self._block_account_no_permission(self.account_to_block)
 
-        # Step 4: block the native contract
-        self._block_account(POLICY_CONTRACT_HASH, False, "Cannot block a native contract")
-
-        # Step 5: block the account
-        self._block_account(self.account_to_block, True)
+        # Step 4: block the native contract, block the account, block and unblock the account with null
+        self._block_independent_accounts()
 
-        # Step 6: check the account is blocked
+        # Step 5: check the account is blocked
         self._is_blocked(self.account_to_block, True)
 
-        # Step 7: block the account again
+        # Step 6: block the account again
         self._block_account(self.account_to_block, False)
 
-        # Step 8: unblock the account
-        self._unblock_account(self.account_to_block)
+        # Step 7: unblock the account
+        self._unblock_account(self.account_to_block, True)
 
-        # Step 9: check the account is not blocked
+        # Step 8: check the account is not blocked
         self._is_blocked(self.account_to_block, False)
 
-        # Step 10: unblock the account again
+        # Step 9: unblock the account again
         self._unblock_account(self.account_to_block, False)
 
-        # Step 11: block the account with null
-        self._block_account(None, False, "can't be null")
-
-        # Step 12: unblock the account with null
-        self._unblock_account(None, False, "can't be null")
-
     def post_test(self):
         self._unblock_account(self.account_to_block, None)
 
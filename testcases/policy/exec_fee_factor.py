@@ -12,6 +12,7 @@ class ExecFeeFactor(Testing):
 
     def __init__(self):
         super().__init__("ExecFeeFactor")
+        self.declare_resources(writes=['policy.exec_fee_factor', 'account:others[0]'])
         self.original_exec_fee_factor = 30
         self.updated_exec_fee_factor = 20
         self.min_exec_fee_factor = 1
@@ -11,6 +11,7 @@ class ExecPicoFeeFactor(Testing):
 
     def __init__(self):
         super().__init__("ExecPicoFeeFactor")
+        self.declare_resources(reads=['policy.exec_fee_factor'], sends_txs=False)
         self.fee_factor = 10000  # 1 Datoshi = 10000 PicoGAS
         self.hardfork = Hardforks.HF_Faun
 
@@ -12,6 +12,7 @@ class FeePerByte(Testing):
 
     def __init__(self):
         super().__init__("FeePerByte")
+        self.declare_resources(writes=['policy.fee_per_byte', 'account:others[0]'])
         self.original_fee_per_byte = 1000
         self.updated_fee_per_byte = 500
         self.min_fee_per_byte = 0
@@ -15,6 +15,7 @@ class MaxTraceableBlocks(Testing):
 
     def __init__(self):
         super().__init__("MaxTraceableBlocks")
+        self.declare_resources(writes=['policy.max_traceable_blocks', 'account:others[0]'])
         self.original_max_traceable_blocks = 2102400
         self.updated_max_traceable_blocks = 2102400 - 1
         self.min_max_traceable_blocks = 1
@@ -52,8 +53,14 @@ class MaxTraceableBlocks(Testing):
         result = self.client.invoke_function(POLICY_CONTRACT_HASH, "getMaxTraceableBlocks", [])
         self.check_stack(result['stack'], [('Integer', str(self.original_max_traceable_blocks))])
 
-    def _check_no_permission_update_max_traceable_blocks(self):
-        # Step 4: create a transaction to update the max_traceable_blocks.
+    def _check_application_log(self, tx_id: str, application_log: dict, stack: list[tuple[str, str]] = [],
+                               exception: str | None = None):
+        assert 'txid' in application_log and tx_id == application_log['txid']
+        assert 'executions' in application_log and len(application_log['executions']) == 1
+        self.check_execution_result(application_log['executions'][0], stack=stack, exception=exception)
+
+    def _make_no_permission_update_max_traceable_blocks_tx(self):
+        # Step 4: create a transaction to update the max_traceable_blocks by others[0].
         block_index = self.client.get_block_index()
         script = ScriptBuilder().emit_dynamic_call(
             script_hash=POLICY_CONTRACT_HASH,
@@ -61,156 +68,70 @@ class MaxTraceableBlocks(Testing):
             call_flags=CallFlags.STATES,
             args=[self.updated_max_traceable_blocks],
         ).to_bytes()
+        return self.make_tx(self.env.others[0], script, self.default_sysfee, self.default_netfee, block_index+10)
+
+    def _check_independent_updates(self):
+        # These transactions fail or succeed regardless of the order in the block, so send them together.
+        # Step 5: others[0] don't have permission to update the max_traceable_blocks.
+        # Step 6: the max_traceable_blocks should be in range [min_max_traceable_blocks, max_max_traceable_blocks].
+        # Step 7: the max_traceable_blocks must be greater than MaxValidUntilBlockIncrement (condition 5).
+        # Step 8: committee has permission to update the max_traceable_blocks to UPDATED_MAX_TRACEABLE_BLOCKS.
+        result = self.client.invoke_function(POLICY_CONTRACT_HASH, "getMaxValidUntilBlockIncrement", [])
+        max_valid_until_block_increment = int(result['stack'][0]['value'])
+        self.logger.info(f"Current MaxValidUntilBlockIncrement: {max_valid_until_block_increment}")
 
-        # Step 5: send the transaction to the network
-        tx = self.make_tx(self.env.others[0], script, self.default_sysfee, self.default_netfee, block_index+10)
-        tx_id = self.client.send_raw_tx(tx.to_array())['hash']
-        self.logger.info(f"No permission update max_traceable_blocks transaction sent: {tx_id}")
-
-        # Step 6: wait for the next block
-        block_index = self.client.get_block_index()
-        self.wait_next_block(block_index)
-
-        # Step 7: check the application log
-        application_log = self.client.get_application_log(tx_id)
-        self.logger.info(f"No permission update max_traceable_blocks application log: {application_log}")
-        assert 'txid' in application_log and tx_id == application_log['txid']
-        assert 'executions' in application_log and len(application_log['executions']) == 1
-
-        # Check the execution, others[0] don't have permission to update the max_traceable_blocks.
-        execution = application_log['executions'][0]
-        self.check_execution_result(execution, exception='Invalid committee signature')
-
-    def _check_max_traceable_blocks_range(self):
-        # Step 8: check the max_traceable_blocks range
-        tx = self._make_update_max_traceable_blocks_tx(self.min_max_traceable_blocks - 1)
-        tx_id = self.client.send_raw_tx(tx.to_array())['hash']
-        self.logger.info(
-            f"update max_traceable_blocks to {self.min_max_traceable_blocks - 1} transaction sent: {tx_id}")
-
-        # Step 9: wait for the next block
-        block_index = self.client.get_block_index()
-        self.wait_next_block(block_index)
-
-        # Step 10: check the application log
-        application_log = self.client.get_application_log(tx_id)
-        self.logger.info(
-            f"Update max_traceable_blocks to {self.min_max_traceable_blocks - 1} application log: {application_log}")
-        assert 'txid' in application_log and tx_id == application_log['txid']
-        assert 'executions' in application_log and len(application_log['executions']) == 1
-
-        # Check the execution, the max_traceable_blocks is {self.min_max_traceable_blocks - 1}, so the transaction is fault.
-        execution = application_log['executions'][0]
-        self.check_execution_result(
-            execution, exception=f'MaxTraceableBlocks must be between [{self.min_max_traceable_blocks}, {self.max_max_traceable_blocks}]')
-
-        tx = self._make_update_max_traceable_blocks_tx(self.max_max_traceable_blocks + 1)
-        tx_id = self.client.send_raw_tx(tx.to_array())['hash']
-        self.logger.info(
-            f"update max_traceable_blocks to {self.max_max_traceable_blocks + 1} transaction sent: {tx_id}")
-
-        # Step 11: wait for the next block
-        block_index = self.client.get_block_index()
-        self.wait_next_block(block_index)
-
-        # Step 12: check the application log
-        application_log = self.client.get_application_log(tx_id)
-        self.logger.info(
-            f"Update max_traceable_blocks to {self.max_max_traceable_blocks + 1} application log: {application_log}")
-        assert 'txid' in application_log and tx_id == application_log['txid']
-        assert 'executions' in application_log and len(application_log['executions']) == 1
-
-        # Check the execution, the max_traceable_blocks is {self.max_max_traceable_blocks + 1}, so the transaction is fault.
-        execution = application_log['executions'][0]
-        self.check_execution_result(
-            execution, exception=f'MaxTraceableBlocks must be between [{self.min_max_traceable_blocks}, {self.max_max_traceable_blocks}]')
+        range_exception = \
+            f'MaxTraceableBlocks must be between [{self.min_max_traceable_blocks}, {self.max_max_traceable_blocks}]'
+        steps = [
+            (self._make_no_permission_update_max_traceable_blocks_tx(),
+             "no permission update max_traceable_blocks", [], 'Invalid committee signature'),
+            (self._make_update_max_traceable_blocks_tx(self.min_max_traceable_blocks - 1),
+             f"update max_traceable_blocks to {self.min_max_traceable_blocks - 1}", [], range_exception),
+            (self._make_update_max_traceable_blocks_tx(self.max_max_traceable_blocks + 1),
+             f"update max_traceable_blocks to {self.max_max_traceable_blocks + 1}", [], range_exception),
+            (self._make_update_max_traceable_blocks_tx(max_valid_until_block_increment - 1),
+             f"update max_traceable_blocks to {max_valid_until_block_increment - 1}", [],
+             'MaxTraceableBlocks must be larger than MaxValidUntilBlockIncrement'),
+            (self._make_update_max_traceable_blocks_tx(self.updated_max_traceable_blocks),
+             "committee update max_traceable_blocks", [('Any', None)], None),
+        ]
+
+        pipeline = self.tx_pipeline()
+        for (tx, label, _, _) in steps:
+            pipeline.add(tx, label)
+        application_logs = pipeline.run()
+
+        # Step 9: check the application logs
+        for (_, label, stack, exception), tx_id, application_log in zip(steps, pipeline.tx_ids, application_logs):
+            self.logger.info(f"{label} application log: {application_log}")
+            self._check_application_log(tx_id, application_log, stack=stack, exception=exception)
+
+        # Step 10: get the max_traceable_blocks again, it should be UPDATED_MAX_TRACEABLE_BLOCKS.
+        result = self.client.invoke_function(POLICY_CONTRACT_HASH, "getMaxTraceableBlocks", [])
+        self.logger.info(f"Get updated max_traceable_blocks result: {result}")
+        self.check_stack(result['stack'], [('Integer', str(self.updated_max_traceable_blocks))])
 
     def _check_max_traceable_blocks_decrease_validation(self):
-        # Step 13: check that max_traceable_blocks can only be decreased (condition 4)
+        # Step 11: check that max_traceable_blocks can only be decreased (condition 4)
         # Try to increase max_traceable_blocks - this should fail
         increased_value = self.updated_max_traceable_blocks + 1
         tx = self._make_update_max_traceable_blocks_tx(increased_value)
         tx_id = self.client.send_raw_tx(tx.to_array())['hash']
         self.logger.info(f"update max_traceable_blocks to {increased_value} (increase) transaction sent: {tx_id}")
 
-        # Step 14: wait for the next block
-        block_index = self.client.get_block_index()
-        self.wait_next_block(block_index)
-
-        # Step 15: check the application log
-        application_log = self.client.get_application_log(tx_id)
+        # Step 12: wait for the transaction and check the application log
+        application_log = self.wait_for_tx(tx_id)
         self.logger.info(
             f"Update max_traceable_blocks to {increased_value} (increase) application log: {application_log}")
-        assert 'txid' in application_log and tx_id == application_log['txid']
-        assert 'executions' in application_log and len(application_log['executions']) == 1
 
         # Check the execution, increasing max_traceable_blocks should fail
-        execution = application_log['executions'][0]
-        self.check_execution_result(execution, exception='MaxTraceableBlocks can not be increased')
-
-    def _check_max_traceable_blocks_greater_than_max_valid_until_block_increment(self):
-        # Step 16: check that max_traceable_blocks must be greater than MaxValidUntilBlockIncrement (condition 5)
-        # First get the current MaxValidUntilBlockIncrement
-        result = self.client.invoke_function(POLICY_CONTRACT_HASH, "getMaxValidUntilBlockIncrement", [])
-        max_valid_until_block_increment = int(result['stack'][0]['value'])
-        self.logger.info(f"Current MaxValidUntilBlockIncrement: {max_valid_until_block_increment}")
-
-        # Try to set max_traceable_blocks to a value less than MaxValidUntilBlockIncrement
-        invalid_value = max_valid_until_block_increment - 1
-        tx = self._make_update_max_traceable_blocks_tx(invalid_value)
-        tx_id = self.client.send_raw_tx(tx.to_array())['hash']
-        self.logger.info(
-            f"update max_traceable_blocks to {invalid_value} (less than MaxValidUntilBlockIncrement) transaction sent: {tx_id}")
-
-        # Step 17: wait for the next block
-        block_index = self.client.get_block_index()
-        self.wait_next_block(block_index)
-
-        # Step 18: check the application log
-        application_log = self.client.get_application_log(tx_id)
-        self.logger.info(
-            f"Update max_traceable_blocks to {invalid_value} (less than MaxValidUntilBlockIncrement) application log: {application_log}")
-        assert 'txid' in application_log and tx_id == application_log['txid']
-        assert 'executions' in application_log and len(application_log['executions']) == 1
-
-        # Check the execution, max_traceable_blocks must be greater than MaxValidUntilBlockIncrement
-        execution = application_log['executions'][0]
-        self.check_execution_result(
-            execution, exception='MaxTraceableBlocks must be larger than MaxValidUntilBlockIncrement')
-
-    def _check_committee_update_max_traceable_blocks(self, max_traceable_blocks: int):
-        # Step 19: set the max_traceable_blocks to UPDATED_MAX_TRACEABLE_BLOCKS by validators
-        tx = self._make_update_max_traceable_blocks_tx(max_traceable_blocks)
-        tx_id = self.client.send_raw_tx(tx.to_array())['hash']
-        self.logger.info(f"committee update max_traceable_blocks transaction sent: {tx_id}")
-
-        # Step 20: wait for the next block
-        block_index = self.client.get_block_index()
-        self.wait_next_block(block_index)
-
-        # Step 21: check the application log
-        application_log = self.client.get_application_log(tx_id)
-        self.logger.info(f"Committee update max_traceable_blocks application log: {application_log}")
-        assert 'txid' in application_log and tx_id == application_log['txid']
-        assert 'executions' in application_log and len(application_log['executions']) == 1
-
-        # Check the execution, committee has permission to update the max_traceable_blocks.
-        execution = application_log['executions'][0]
-        self.check_execution_result(execution, stack=[('Any', None)])
-
-        # Step 22: get the max_traceable_blocks again, it should be UPDATED_MAX_TRACEABLE_BLOCKS.
-        result = self.client.invoke_function(POLICY_CONTRACT_HASH, "getMaxTraceableBlocks", [])
-        self.logger.info(f"Get updated max_traceable_blocks result: {result}")
-        self.check_stack(result['stack'], [('Integer', str(max_traceable_blocks))])
+        self._check_application_log(tx_id, application_log, exception='MaxTraceableBlocks can not be increased')
 
     def run_test(self):
         self._get_original_max_traceable_blocks()
         self._check_invoke_function_update_max_traceable_blocks()
-        self._check_no_permission_update_max_traceable_blocks()
-        self._check_max_traceable_blocks_range()
-        self._check_committee_update_max_traceable_blocks(self.updated_max_traceable_blocks)
+        self._check_independent_updates()
         self._check_max_traceable_blocks_decrease_validation()
-        self._check_max_traceable_blocks_greater_than_max_valid_until_block_increment()
 
     def post_test(self):
         pass  # Cannot set to original value, because the max_traceable_blocks is not allowed to be decreased.
@@ -13,6 +13,7 @@ class MaxValidUntilBlockIncrement(Testing):
 
     def __init__(self):
         super().__init__("MaxValidUntilBlockIncrement")
+        self.declare_resources(writes=['policy.max_valid_until_block_increment', 'account:others[0]'])
         self.original_MVUBI = 5760
         self.updated_MVUBI = 5000
         self.min_MVUBI = 1
@@ -14,6 +14,7 @@ class MillisecondsPerBlock(Testing):
 
     def __init__(self):
         super().__init__("MillisecondsPerBlock")
+        self.declare_resources(writes=['policy.milliseconds_per_block', 'account:others[0]'])
         self.original_millis_per_block = 15_000
         self.updated_millis_per_block = 10_000
         self.min_millis_per_block = 1
@@ -12,6 +12,7 @@ class StoragePrice(Testing):
 
     def __init__(self):
         super().__init__("StoragePrice")
+        self.declare_resources(writes=['policy.storage_price', 'account:others[0]'])
         self.original_storage_price = 100_000
         self.updated_storage_price = 50_000
         self.min_storage_price = 1
@@ -17,6 +17,7 @@ class DesignateRole(Testing):
 
     def __init__(self):
         super().__init__("DesignateRole")
+        self.declare_resources(reads=['roles'], sends_txs=False)
 
     def _get_designated_by_role(self, role: int, block_index: int, expected: list = []):
         result = self.client.invoke_function(ROLE_MANAGEMENT_CONTRACT_HASH, "getDesignatedByRole",
@@ -0,0 +1,175 @@
+import argparse
+import importlib
+import logging
+import os
+import sys
+import time
+import traceback
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+from testcases.testing import Testing
+
+
+# The same groups as run_tests.sh.
+GROUPS = [
+    "basics3",            # N3
+    "contractmanagement",  # N3 & N4
+    "crypto",             # N3 & N4
+    "governance3",        # N3
+    "ledger",             # N3 & N4
+    "notary",             # N3 & N4
+    "oracle",             # N3 & N4
+    "policy",             # N3 & N4
+    "rolemanagement",     # N3 & N4
+    "stdlib",             # N3 & N4
+    "system/fee",         # N3 & N4
+    "system/opcode",      # N3 & N4
+    "plugins/rpcserver",  # N3 & N4
+]
+
+
+@dataclass
+class TestCase:
+    name: str  # i.e. "policy/fee_per_byte"
+    testing: Testing | None
+    error: str | None = None  # the error of importing the module or creating the test
+
+    def conflicts_with(self, other: 'TestCase') -> bool:
+        if self.testing is None or other.testing is None:
+            return False
+        return self.testing.conflicts_with(other.testing)
+
+
+@dataclass
+class TestResult:
+    name: str
+    passed: bool
+    elapsed: float
+    error: str | None = None
+
+
+def discover(group: str) -> list[TestCase]:
+    """
+    Discovers the `Testing` subclasses which implement `run_test` in the modules of the group, and creates the tests.
+    """
+    directory = os.path.join(os.path.dirname(__file__), *group.split('/'))
+    cases = []
+    for file in sorted(os.listdir(directory)):
+        if not file.endswith('.py') or file.startswith('__'):
+            continue
+
+        basename = file[:-len('.py')]
+        name = f"{group}/{basename}"
+        module_name = f"testcases.{group.replace('/', '.')}.{basename}"
+        try:
+            module = importlib.import_module(module_name)
+        except Exception:
+            cases.append(TestCase(name, None, traceback.format_exc()))
+            continue
+
+        for item in vars(module).values():
+            if isinstance(item, type) and issubclass(item, Testing) and item.__module__ == module_name \
+                    and item.run_test is not Testing.run_test:
+                try:
+                    cases.append(TestCase(name, item()))
+                except Exception:
+                    cases.append(TestCase(name, None, traceback.format_exc()))
+    return cases
+
+
+def run_case(case: TestCase) -> TestResult:
+    logger = logging.getLogger("TestRunner")
+    if case.testing is None:
+        logger.error(f"Failed to create {case.name} test:\n{case.error}")
+        return TestResult(case.name, False, 0.0, case.error)
+
+    logger.info(f"Run {case.name} test...")
+    start_time = time.time()
+    try:
+        case.testing.run()
+    except BaseException:
+        elapsed = time.time() - start_time
+        error = traceback.format_exc()
+        logger.error(f"Failed to run {case.name} test after {elapsed:.2f}s:\n{error}")
+        return TestResult(case.name, False, elapsed, error)
+
+    elapsed = time.time() - start_time
+    logger.info(f"Passed {case.name} test in {elapsed:.2f}s")
+    return TestResult(case.name, True, elapsed)
+
+
+def run_cases(cases: list[TestCase], workers: int) -> list[TestResult]:
+    """
+    Runs the cases on at most `workers` threads. A case starts only if it doesn't conflict with the running cases
+    and the earlier pending cases, so the conflicting cases are run one by one in the discovered order.
+    """
+    if workers <= 1:
+        return [run_case(case) for case in cases]
+
+    results: dict[int, TestResult] = {}
+    pending = list(enumerate(cases))
+    running: dict[Future, tuple[int, TestCase]] = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="TestRunner") as executor:
+        while len(pending) > 0 or len(running) > 0:
+            waiting = []
+            for (index, case) in pending:
+                if len(running) >= workers:
+                    waiting.append((index, case))
+                    continue
+
+                blockers = [c for (_, c) in waiting] + [c for (_, c) in running.values()]
+                if any(case.conflicts_with(blocker) for blocker in blockers):
+                    waiting.append((index, case))
+                else:
+                    running[executor.submit(run_case, case)] = (index, case)
+            pending = waiting
+
+            done, _ = wait(running.keys(), return_when=FIRST_COMPLETED)
+            for future in done:
+                (index, _) = running.pop(future)
+                results[index] = future.result()
+    return [results[i] for i in range(len(cases))]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the testcases in one process.")
+    parser.add_argument('--groups', default=','.join(GROUPS),
+                        help="the groups to run, separated by comma or space, i.e. 'policy,stdlib'")
+    parser.add_argument('--skip-initial', action='store_true', help="skip the initial testcase")
+    parser.add_argument('--workers', type=int, default=4,
+                        help="the max number of tests running concurrently, "
+                             "the tests conflict with each other(see `Testing.declare_resources`) are run one by one")
+    args = parser.parse_args(argv)
+
+    logger = logging.getLogger("TestRunner")
+    selected = args.groups.replace(',', ' ').split()
+    for group in selected:
+        if group not in GROUPS:
+            logger.error(f"Invalid group: {group}")
+            return 1
+
+    start_time = time.time()
+    results = []
+    if not args.skip_initial:
+        from testcases.initial import TestingInitial
+        results.append(run_case(TestCase("initial", TestingInitial())))
+
+    cases = [case for group in selected for case in discover(group)]
+    results.extend(run_cases(cases, args.workers))
+
+    elapsed = time.time() - start_time
+    failures = [r.name for r in results if not r.passed]
+    logger.info(f"Tests completed in {elapsed:.2f}s, {len(results) - len(failures)}/{len(results)} passed")
+    if len(failures) > 0:
+        logger.error(f"Failed tests: {' '.join(failures)}")
+        return 1
+
+    logger.info("All tests passed")
+    return 0
+
+
+# Run with: python3 -B -m testcases.runner [--groups group1,group2,...] [--skip-initial] [--workers N]
+if __name__ == "__main__":
+    sys.exit(main())
@@ -29,15 +29,12 @@ class StdLibTesting(Testing):
         # Step 2: send a transaction with null
         script = ScriptBuilder().emit_dynamic_call(STDLIB_CONTRACT_HASH,
                                                    method, CallFlags.READ_STATES, [None]).to_bytes()
-        tx = self.make_tx(self.env.validators[0], script, self.default_sysfee,
+        tx = self.make_tx(self.account, script, self.default_sysfee,
                           self.default_netfee, self.client.get_block_index() + 10)
         tx_id = self.client.send_raw_tx(tx.to_array())['hash']
         self.logger.info(f"Tx '{method}' null transaction sent: {tx_id}")
 
-        block_index = self.client.get_block_index()
-        self.wait_next_block(block_index)
-
-        application_log = self.client.get_application_log(tx_id)
+        application_log = self.wait_for_tx(tx_id)
         self.logger.info(f"Application log with '{method}' null: {application_log}")
         execution = application_log['executions'][0]
         assert 'trigger' in execution and execution['trigger'] == 'Application'
@@ -19,6 +19,7 @@ class Base58Encode(StdLibTesting):
 
     def __init__(self):
         super().__init__("Base58Encode")
+        self.declare_resources()
 
     def _check_argument_null(self):
         # Step 1: check base58Encode with null
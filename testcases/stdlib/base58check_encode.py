@@ -16,6 +16,7 @@ class Base58CheckEncode(StdLibTesting):
 
     def __init__(self):
         super().__init__("Base58CheckEncode")
+        self.declare_resources()
 
     def _check_argument_null(self):
         # Step 1: check base58CheckEncode with null
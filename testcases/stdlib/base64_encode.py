@@ -18,6 +18,7 @@ class Base64Encode(StdLibTesting):
 
     def __init__(self):
         super().__init__("Base64Encode")
+        self.declare_resources()
 
     def _check_argument_null(self):
         # Step 1: check base64Encode with null
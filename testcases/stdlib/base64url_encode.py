@@ -19,6 +19,7 @@ class Base64UrlEncode(StdLibTesting):
 
     def __init__(self):
         super().__init__("Base64UrlEncode")
+        self.declare_resources()
         self.hardfork = Hardforks.HF_Echidna
 
     def _check_argument_null(self):
@@ -18,6 +18,7 @@ class BinarySerialize(StdLibTesting):
 
     def __init__(self):
         super().__init__("BinarySerialize")
+        self.declare_resources()
 
     def _check_argument_null(self):
         # Step 1: check serialize with null
@@ -8,6 +8,7 @@ class HexEncode(StdLibTesting):
 
     def __init__(self):
         super().__init__("HexEncode")
+        self.declare_resources()
         self.hardfork = Hardforks.HF_Faun
 
     def _check_argument_null(self):
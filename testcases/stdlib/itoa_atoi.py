@@ -7,6 +7,7 @@ class ItoaAtoi(StdLibTesting):
 
     def __init__(self):
         super().__init__("ItoaAtoi")
+        self.declare_resources()
 
     def _check_argument_null(self):
         # Step 1: check Itoa with null
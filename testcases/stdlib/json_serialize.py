@@ -8,6 +8,7 @@ class JsonSerialize(StdLibTesting):
 
     def __init__(self):
         super().__init__("JsonSerialize")
+        self.declare_resources()
 
     def _check_argument_null(self):
         # Step 1: check jsonSerialize with 'null' string
@@ -9,6 +9,7 @@ class MemoryOps(StdLibTesting):
 
     def __init__(self):
         super().__init__("MemoryOps")
+        self.declare_resources(sends_txs=False)
 
     def _check_memory_compare_with_null(self):
         # Step 1: check MemoryCompare(value1, value2) with null value1
@@ -7,6 +7,7 @@ class StringOps(StdLibTesting):
 
     def __init__(self):
         super().__init__("StringOps")
+        self.declare_resources(sends_txs=False)
 
     def _check_string_split_with_null(self):
         # Step 1: check StringSplit(value, separator) with null value
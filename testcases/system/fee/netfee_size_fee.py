@@ -11,6 +11,7 @@ class NetworkFeeSizeFee(FeeTesting):
 
     def __init__(self):
         super().__init__("NetworkFeeSizeFee")
+        self.declare_resources(writes=['policy.fee_per_byte', 'account:others[0]'])
 
         self.update_fee_per_byte = self.fee_per_byte + 100
 
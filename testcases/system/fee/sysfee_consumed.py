@@ -10,6 +10,7 @@ class SystemFeeConsumed(FeeTesting):
 
     def __init__(self):
         super().__init__("SystemFeeConsumed")
+        self.declare_resources(writes=['account:others[0]'])
         self.price_push1 = 1
 
     def run_test(self):
@@ -12,6 +12,7 @@ class SystemFeeExecFactor(FeeTesting):
 
     def __init__(self):
         super().__init__("SystemFeeExecFactor")
+        self.declare_resources(writes=['policy.exec_fee_factor', 'account:others[0]'])
         self.price_push1 = 1
         self.updated_exec_fee_factor = self.exec_fee_factor + 10
         self.pico_fee_factor = 1_0000
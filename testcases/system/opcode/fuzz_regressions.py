@@ -0,0 +1,26 @@
+import base64
+
+from testcases.differential import DifferentialRunner
+from testcases.fuzzer import REGRESSIONS_PATH, load_regressions
+
+
+# Operation: replay the scripts saved by the fuzzer(`testcases.fuzzer`) in `fuzz_regressions.json`,
+#  on the local VM and the node, and compare the results as the differential runner.
+# Expect Result: No crash, the local VM and the node agree on all the saved scripts.
+class FuzzRegressions(DifferentialRunner):
+
+    def __init__(self, path: str = REGRESSIONS_PATH):
+        super().__init__([], minimize=False, loggerName="FuzzRegressions")
+        self.path = path
+
+    def pre_test(self):
+        super().pre_test()
+        entries = load_regressions(self.path)
+        self.scripts = [base64.b64decode(entry['script']) for entry in entries]
+        self.logger.info(f"Replaying {len(self.scripts)} regressions from {self.path}")
+
+
+# Run with: python3 -B -m testcases.system.opcode.fuzz_regressions
+if __name__ == "__main__":
+    test = FuzzRegressions()
+    test.run()
@@ -1,6 +1,9 @@
 
+import sys
+
 from neo import *
 from neo.contract import *
+from neo.vm import LocalVM
 from testcases.testing import Testing
 
 
@@ -10,9 +13,13 @@ from testcases.testing import Testing
 # 1. for primitive types: Null, Bool, Int, ByteString, the equal is value equal.
 # 2. for compound types: Array, Map, Buffer, the equal is reference equal.
 # 3. any non-Null item compared with Null via EQUAL yields false (never equal).
+#
+# In the "vm" mode, the scripts run on the local VM(`neo.vm`) instead of the RpcServer, no node is needed.
 class OpEqual(Testing):
-    def __init__(self):
+    def __init__(self, mode: str = "node"):
         super().__init__("OpEqual")
+        self.declare_resources(sends_txs=False)
+        self.invoker = LocalVM() if mode == "vm" else self.client
 
     def _expect_halt_boolean(self, result: dict, expected: bool, label: str):
         self.logger.info(f"{label} invoke result: {result}")
@@ -29,48 +36,42 @@ class OpEqual(Testing):
             .emit(OpCode.PUSHNULL) \
             .emit(OpCode.EQUAL) \
             .to_bytes()
-        result = self.client.invoke_script(script)
+        result = self.invoker.invoke_script(script)
         self._expect_halt_boolean(result, True, "null == null")
 
     def _non_null_vs_null(self):
         """Each VM type other than Null compared with Null: EQUAL must push false (HALT)."""
-        def run(script: bytes, label: str):
-            result = self.client.invoke_script(script)
-            self._expect_halt_boolean(result, False, label)
-
-        script = ScriptBuilder().emit(OpCode.PUSHT).emit(OpCode.PUSHNULL).emit(OpCode.EQUAL).to_bytes()
-        run(script, "bool true vs null")
-
-        script = ScriptBuilder().emit(OpCode.PUSHF).emit(OpCode.PUSHNULL).emit(OpCode.EQUAL).to_bytes()
-        run(script, "bool false vs null")
-
-        script = ScriptBuilder().emit_push_int(0).emit(OpCode.PUSHNULL).emit(OpCode.EQUAL).to_bytes()
-        run(script, "int vs null")
-
-        script = ScriptBuilder().emit_push_int(42).emit(OpCode.PUSHNULL).emit(OpCode.EQUAL).to_bytes()
-        run(script, "int 42 vs null")
-
-        script = ScriptBuilder().emit_push_bytes(b"").emit(OpCode.PUSHNULL).emit(OpCode.EQUAL).to_bytes()
-        run(script, "empty ByteString vs null")
-
-        script = ScriptBuilder().emit_push_bytes(b"neo").emit(OpCode.PUSHNULL).emit(OpCode.EQUAL).to_bytes()
-        run(script, "ByteString vs null")
-
-        script = ScriptBuilder().emit(OpCode.NEWARRAY0).emit(OpCode.PUSHNULL).emit(OpCode.EQUAL).to_bytes()
-        run(script, "empty Array vs null")
-
-        script = ScriptBuilder().emit(OpCode.NEWMAP).emit(OpCode.PUSHNULL).emit(OpCode.EQUAL).to_bytes()
-        run(script, "Map vs null")
-
-        script = ScriptBuilder().emit_push_int(1).emit(OpCode.NEWBUFFER).emit(OpCode.PUSHNULL).emit(OpCode.EQUAL).to_bytes()
-        run(script, "Buffer vs null")
-
-        script = ScriptBuilder().emit(OpCode.PUSHNULL).emit(OpCode.PUSHT).emit(OpCode.EQUAL).to_bytes()
-        run(script, "null vs bool true")
-
-        # Operand order reversed: null under non-null on stack — still not equal.
-        script = ScriptBuilder().emit(OpCode.PUSHNULL).emit(OpCode.PUSHF).emit(OpCode.EQUAL).to_bytes()
-        run(script, "null vs bool false")
+        cases = [
+            (ScriptBuilder().emit(OpCode.PUSHT).emit(OpCode.PUSHNULL).emit(OpCode.EQUAL).to_bytes(),
+             "bool true vs null"),
+            (ScriptBuilder().emit(OpCode.PUSHF).emit(OpCode.PUSHNULL).emit(OpCode.EQUAL).to_bytes(),
+             "bool false vs null"),
+            (ScriptBuilder().emit_push_int(0).emit(OpCode.PUSHNULL).emit(OpCode.EQUAL).to_bytes(),
+             "int vs null"),
+            (ScriptBuilder().emit_push_int(42).emit(OpCode.PUSHNULL).emit(OpCode.EQUAL).to_bytes(),
+             "int 42 vs null"),
+            (ScriptBuilder().emit_push_bytes(b"").emit(OpCode.PUSHNULL).emit(OpCode.EQUAL).to_bytes(),
+             "empty ByteString vs null"),
+            (ScriptBuilder().emit_push_bytes(b"neo").emit(OpCode.PUSHNULL).emit(OpCode.EQUAL).to_bytes(),
+             "ByteString vs null"),
+            (ScriptBuilder().emit(OpCode.NEWARRAY0).emit(OpCode.PUSHNULL).emit(OpCode.EQUAL).to_bytes(),
+             "empty Array vs null"),
+            (ScriptBuilder().emit(OpCode.NEWMAP).emit(OpCode.PUSHNULL).emit(OpCode.EQUAL).to_bytes(),
+             "Map vs null"),
+            (ScriptBuilder().emit_push_int(1).emit(OpCode.NEWBUFFER).emit(OpCode.PUSHNULL).emit(OpCode.EQUAL).to_bytes(),
+             "Buffer vs null"),
+            (ScriptBuilder().emit(OpCode.PUSHNULL).emit(OpCode.PUSHT).emit(OpCode.EQUAL).to_bytes(),
+             "null vs bool true"),
+            # Operand order reversed: null under non-null on stack — still not equal.
+            (ScriptBuilder().emit(OpCode.PUSHNULL).emit(OpCode.PUSHF).emit(OpCode.EQUAL).to_bytes(),
+             "null vs bool false"),
+        ]
+
+        # The scripts are independent, so send them in one batch request.
+        with self.invoker.batch() as batch:
+            results = [(batch.invoke_script(script), label) for (script, label) in cases]
+        for (result, label) in results:
+            self._expect_halt_boolean(result.result(), False, label)
 
     def _bool_equal(self):
         # PUSHT / PUSHF push Bool stack items (PUSH0 / PUSH1 are Integer).
@@ -79,7 +80,7 @@ class OpEqual(Testing):
             .emit(OpCode.PUSHT) \
             .emit(OpCode.EQUAL) \
             .to_bytes()
-        result = self.client.invoke_script(script)
+        result = self.invoker.invoke_script(script)
         self._expect_halt_boolean(result, True, "bool true == true")
 
         script = ScriptBuilder() \
@@ -87,7 +88,7 @@ class OpEqual(Testing):
             .emit(OpCode.PUSHF) \
             .emit(OpCode.EQUAL) \
             .to_bytes()
-        result = self.client.invoke_script(script)
+        result = self.invoker.invoke_script(script)
         self._expect_halt_boolean(result, True, "bool false == false")
 
         script = ScriptBuilder() \
@@ -95,7 +96,7 @@ class OpEqual(Testing):
             .emit(OpCode.PUSHT) \
             .emit(OpCode.EQUAL) \
             .to_bytes()
-        result = self.client.invoke_script(script)
+        result = self.invoker.invoke_script(script)
         self._expect_halt_boolean(result, False, "bool false == true")
 
     def _int_equal(self):
@@ -104,7 +105,7 @@ class OpEqual(Testing):
             .emit_push_int(42) \
             .emit(OpCode.EQUAL) \
             .to_bytes()
-        result = self.client.invoke_script(script)
+        result = self.invoker.invoke_script(script)
         self._expect_halt_boolean(result, True, "int 42 == 42")
 
         script = ScriptBuilder() \
@@ -112,7 +113,7 @@ class OpEqual(Testing):
             .emit_push_int(2) \
             .emit(OpCode.EQUAL) \
             .to_bytes()
-        result = self.client.invoke_script(script)
+        result = self.invoker.invoke_script(script)
         self._expect_halt_boolean(result, False, "int 1 == 2")
 
     def _bytestring_equal(self):
@@ -121,7 +122,7 @@ class OpEqual(Testing):
             .emit_push_bytes(b"neo") \
             .emit(OpCode.EQUAL) \
             .to_bytes()
-        result = self.client.invoke_script(script)
+        result = self.invoker.invoke_script(script)
         self._expect_halt_boolean(result, True, "ByteString neo == neo")
 
         script = ScriptBuilder() \
@@ -129,7 +130,7 @@ class OpEqual(Testing):
             .emit_push_bytes(b"b") \
             .emit(OpCode.EQUAL) \
             .to_bytes()
-        result = self.client.invoke_script(script)
+        result = self.invoker.invoke_script(script)
         self._expect_halt_boolean(result, False, "ByteString a == b")
 
     def _array_equal(self):
@@ -138,7 +139,7 @@ class OpEqual(Testing):
             .emit(OpCode.NEWARRAY0) \
             .emit(OpCode.EQUAL) \
             .to_bytes()
-        result = self.client.invoke_script(script)
+        result = self.invoker.invoke_script(script)
         self._expect_halt_boolean(result, False, "Different empty arrays are not equal")
 
         script = ScriptBuilder() \
@@ -146,7 +147,7 @@ class OpEqual(Testing):
             .emit(OpCode.DUP) \
             .emit(OpCode.EQUAL) \
             .to_bytes()
-        result = self.client.invoke_script(script)
+        result = self.invoker.invoke_script(script)
         self._expect_halt_boolean(result, True, "Same reference arrays are equal")
 
     def _map_equal(self):
@@ -155,7 +156,7 @@ class OpEqual(Testing):
             .emit(OpCode.NEWMAP) \
             .emit(OpCode.EQUAL) \
             .to_bytes()
-        result = self.client.invoke_script(script)
+        result = self.invoker.invoke_script(script)
         self._expect_halt_boolean(result, False, "Different empty maps are not equal")
 
         script = ScriptBuilder() \
@@ -163,7 +164,7 @@ class OpEqual(Testing):
             .emit(OpCode.DUP) \
             .emit(OpCode.EQUAL) \
             .to_bytes()
-        result = self.client.invoke_script(script)
+        result = self.invoker.invoke_script(script)
         self._expect_halt_boolean(result, True, "Same reference maps are equal")
 
     def _buffer_equal(self):
@@ -175,7 +176,7 @@ class OpEqual(Testing):
             .emit(OpCode.NEWBUFFER) \
             .emit(OpCode.EQUAL) \
             .to_bytes()
-        result = self.client.invoke_script(script)
+        result = self.invoker.invoke_script(script)
         self._expect_halt_boolean(result, False, "Different empty buffers are not equal")
 
         script = ScriptBuilder() \
@@ -184,7 +185,7 @@ class OpEqual(Testing):
             .emit(OpCode.DUP) \
             .emit(OpCode.EQUAL) \
             .to_bytes()
-        result = self.client.invoke_script(script)
+        result = self.invoker.invoke_script(script)
         self._expect_halt_boolean(result, True, "Same reference buffers are equal")
 
     def run_test(self):
@@ -198,7 +199,11 @@ class OpEqual(Testing):
         self._buffer_equal()
 
 
-# Run with: python3 -B -m testcases.system.opcode.op_equal
+# Run with: python3 -B -m testcases.system.opcode.op_equal [node|vm]
 if __name__ == "__main__":
-    test = OpEqual()
-    test.run()
+    mode = sys.argv[1] if len(sys.argv) > 1 else "node"
+    test = OpEqual(mode)
+    if mode == "vm":
+        test.run_test()  # no block to wait for
+    else:
+        test.run()
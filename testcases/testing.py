@@ -1,29 +1,38 @@
 
+import base64
 import hashlib
 import random
 import logging
+import threading
 import time
 
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import ec
-from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
-from cryptography.hazmat.backends import default_backend
-
 from neo import *
 from neo.contract import ScriptBuilder
-from neo.rpc import RpcClient
+from neo.notifier import BlockNotifier
+from neo.rpc import RpcClient, RpcError
+from neo.signer import SignerRegistry, SigningPool
 from env import Env
 
 logging.basicConfig(level=logging.INFO)
 
 TX_VERSION_V0 = 0
 
+# The policies which affect the fee or the validity of all transactions.
+TX_POLICIES = {
+    'policy.exec_fee_factor',
+    'policy.fee_per_byte',
+    'policy.storage_price',
+    'policy.max_valid_until_block_increment',
+    'policy.milliseconds_per_block',
+}
+
 
 class Testing:
 
     def __init__(self, loggerName: str = "Testing"):
         self.env = Env.from_testbed()
-        self.client = RpcClient(self.env.rpc_endpoint)
+        # The calls are recorded(or replayed) in the scope of the test, so the tests can run in parallel.
+        self.client = RpcClient(self.env.rpc_endpoint, cassette_scope=f"{type(self).__module__}.{type(self).__name__}")
         self.logger = logging.getLogger(loggerName)
         self.default_sysfee = 1_0000000  # 0.1 GAS
         self.default_netfee = 1_0000000  # 0.1 GAS
@@ -31,23 +40,88 @@ class Testing:
         self.neo3_only = False
         self.hardfork = None
 
+        # The shared chain state this test reads and writes, see `declare_resources`.
+        # The test without declaration conflicts with all other tests.
+        self.reads: set[str] = set()
+        self.writes: set[str] = {'*'}
+
+        # The accounts leased from the account pool, they're released after the test is finished.
+        self._leased_accounts: list[Account] = []
+
+    def declare_resources(self, reads: list[str] = [], writes: list[str] = [], sends_txs: bool = True):
+        """
+        Declares the shared chain state this test reads and writes. The runner doesn't run two tests together
+        if one of them writes a resource which the other one reads or writes. The resources are named like:
+         - 'policy.fee_per_byte', 'oracle.price', 'candidates', the state of the native contracts;
+         - 'account:others[0]', the balance of the account, the sender of a transaction writes it;
+           the leased account(`self.account`) is used by this test only, so it needn't be declared;
+         - '*', conflicts with all other tests.
+        If the test sends transactions, it reads the `TX_POLICIES` too.
+        """
+        self.reads = set(reads) | (TX_POLICIES if sends_txs else set())
+        self.writes = set(writes)
+
+    def conflicts_with(self, other: 'Testing') -> bool:
+        if '*' in self.writes or '*' in other.writes:
+            return True
+        return len(self.writes & (other.reads | other.writes)) > 0 or len(other.writes & self.reads) > 0
+
+    @property
+    def account(self) -> Account:
+        """
+        The account leased from the account pool for this test, it's not used by other running tests.
+        """
+        if len(self._leased_accounts) == 0:
+            self.lease_account()
+        return self._leased_accounts[0]
+
+    def lease_account(self) -> Account:
+        account = AccountPool.shared(self.env).lease()
+        self._leased_accounts.append(account)
+        self.logger.info(f"Leased account {account.script_hash}")
+        return account
+
+    def release_accounts(self):
+        pool = AccountPool.shared(self.env)
+        for account in self._leased_accounts:
+            pool.release(account)
+        self._leased_accounts = []
+
     def wait_next_block(self, current_block_index: int, wait_while: str = '', max_wait_seconds: int = 5*60) -> int:
         start_time = time.time()
-        while True:
-            block_index = self.client.get_block_index()
-            if block_index > current_block_index:
-                break
-            if time.time() - start_time > max_wait_seconds:
-                raise TimeoutError(f"Timeout waiting for next block of {current_block_index} after {max_wait_seconds}s")
-            time.sleep(3)
-
-            elapsed = time.time() - start_time
-            self.logger.info(f"Waiting {elapsed:.2f}s for next block of {current_block_index} while {wait_while}")
+        notifier = BlockNotifier.shared(self.env.rpc_endpoint)
+        try:
+            block_index = notifier.wait_for_block(current_block_index + 1, max_wait_seconds)
+        except TimeoutError:
+            raise TimeoutError(f"Timeout waiting for next block of {current_block_index} after {max_wait_seconds}s")
 
         elapsed = time.time() - start_time
         self.logger.info(f"Waited {elapsed:.2f}s for next block of {current_block_index} while {wait_while}")
         return block_index
 
+    def wait_for_tx(self, tx_ids: str | list[str], timeout: int = 5*60) -> dict | list[dict]:
+        """
+        Waits until the transactions are persisted and returns their application logs.
+        It checks the transactions once a new block arrives, so it doesn't wait an extra block.
+        If `tx_ids` is a list, the logs are returned in the same order.
+        """
+        tx_ids = tx_ids if isinstance(tx_ids, str) else list(tx_ids)
+        count = 1 if isinstance(tx_ids, str) else len(set(tx_ids))
+        start_time = time.time()
+        block_index = self.client.get_block_index()
+
+        def wait_next_block(remaining: float):
+            nonlocal block_index
+            try:
+                block_index = self.wait_next_block(block_index, f"waiting for {count} transactions", remaining)
+            except TimeoutError:
+                pass  # check the transactions the last time, then raise the timeout
+
+        logs = self.client.wait_for_application_log(tx_ids, timeout, wait=wait_next_block)
+        elapsed = time.time() - start_time
+        self.logger.info(f"Waited {elapsed:.2f}s for {count} transactions")
+        return logs
+
     def bft_address(self) -> UInt160:
         m = len(self.env.validators) - (len(self.env.validators) - 1) // 3
         script = create_multisig_redeemscript(m, [v.public_key for v in self.env.validators])
@@ -58,16 +132,23 @@ class Testing:
         script = create_multisig_redeemscript(m, [v.public_key for v in self.env.validators])
         return to_script_hash(script)
 
+    def multisig_signers(self, is_committee: bool = False) -> list[Account]:
+        """
+        The validators whose signatures are required by the BFT or committee address, the multisig witness needs
+        m signatures in the order of the public keys, so only the first m validators sorted by public key sign.
+        """
+        n = len(self.env.validators)
+        m = n - (n - 1) // (2 if is_committee else 3)
+        return sorted(self.env.validators, key=lambda v: v.public_key)[:m]
+
     def sign_message(self, private_key: int | bytes, message: bytes) -> bytes:
-        private_key = int.from_bytes(private_key, 'big') if isinstance(private_key, bytes) else private_key
-        sk = ec.derive_private_key(private_key, ec.SECP256R1(), default_backend())
-        der = sk.sign(message, ec.ECDSA(hashes.SHA256()))
-        (r, s) = decode_dss_signature(der)
-        return r.to_bytes(32, 'big') + s.to_bytes(32, 'big')
+        return SignerRegistry.default().sign(private_key, message)
 
     def sign(self, private_key: int | bytes, data: bytes) -> bytes:
-        sign_data = self.env.network.to_bytes(4, 'little') + hashlib.sha256(data).digest()
-        return self.sign_message(private_key, sign_data)
+        return self.sign_message(private_key, self.sign_data(data))
+
+    def sign_data(self, data: bytes) -> bytes:
+        return self.env.network.to_bytes(4, 'little') + hashlib.sha256(data).digest()
 
     def make_witness(self, sign: bytes, public_key: ECPoint) -> Witness:
         return Witness(
@@ -75,17 +156,6 @@ class Testing:
             verification_script=create_signature_redeemscript(public_key)
         )
 
-    def make_multisig_witness(self, key_sign_pairs: list[tuple[ECPoint, bytes]], is_committee: bool = False) -> Witness:
-        key_sign_pairs.sort(key=lambda x: x[0])
-        m = len(key_sign_pairs) - (len(key_sign_pairs) - 1) // (2 if is_committee else 3)
-        invocation = ScriptBuilder()
-        for i in range(m):  # Must be len(keys) - (len(keys) - 1) // (2 if is_committee else 3)
-            invocation.emit_push_bytes(key_sign_pairs[i][1])
-        return Witness(
-            invocation_script=invocation.to_bytes(),
-            verification_script=create_multisig_redeemscript(m, [k for (k, _) in key_sign_pairs])
-        )
-
     def make_tx(self, account: Account, script: bytes, sysfee: int, netfee: int, valid_until_block: int) -> Transaction:
         tx = Transaction(
             version=TX_VERSION_V0,
@@ -108,8 +178,13 @@ class Testing:
         return tx
 
     def make_multisig_tx(self, script: bytes, sysfee: int, netfee: int, valid_until_block: int, is_committee: bool = False) -> Transaction:
+        tx = self.make_unsigned_multisig_tx(script, sysfee, netfee, valid_until_block, is_committee)
+        return self.sign_multisig_txs([tx], is_committee)[0]
+
+    def make_unsigned_multisig_tx(self, script: bytes, sysfee: int, netfee: int, valid_until_block: int,
+                                  is_committee: bool = False) -> Transaction:
         account = self.committee_address() if is_committee else self.bft_address()
-        tx = Transaction(
+        return Transaction(
             version=TX_VERSION_V0,
             nonce=random.randint(0, 0xFFFFFFFF),
             system_fee=sysfee,
@@ -122,12 +197,32 @@ class Testing:
             protocol_magic=self.env.network,
         )
 
-        with BinaryWriter() as writer:
-            tx.serialize_unsigned(writer)
-            raw_tx = writer.to_array()
-        pairs = [(v.public_key, self.sign(int.from_bytes(v.private_key, 'big'), raw_tx)) for v in self.env.validators]
-        tx.witnesses = [self.make_multisig_witness(pairs, is_committee)]
-        return tx
+    def sign_multisig_txs(self, txs: list[Transaction], is_committee: bool = False,
+                          pool: SigningPool | None = None) -> list[Transaction]:
+        """
+        Signs the unsigned BFT or committee transactions with the required validators only, and returns them in order.
+        If `pool` is given, the transactions are signed in its worker processes.
+        """
+        signers = self.multisig_signers(is_committee)
+        private_keys = [v.private_key for v in signers]
+        jobs = []
+        for tx in txs:
+            with BinaryWriter() as writer:
+                tx.serialize_unsigned(writer)
+                jobs.append((private_keys, self.sign_data(writer.to_array())))
+
+        signs = pool.sign_many(jobs) if pool is not None else [
+            SignerRegistry.default().sign_batch(keys, message) for (keys, message) in jobs]
+        verification = create_multisig_redeemscript(len(signers), [v.public_key for v in self.env.validators])
+        for (tx, tx_signs) in zip(txs, signs):
+            invocation = ScriptBuilder()
+            for sign in tx_signs:
+                invocation.emit_push_bytes(sign)
+            tx.witnesses = [Witness(invocation_script=invocation.to_bytes(), verification_script=verification)]
+        return txs
+
+    def tx_pipeline(self) -> 'TxPipeline':
+        return TxPipeline(self)
 
     def check_execution_result(self, execution: dict, stack: list[tuple[str, str]] = [], exception: str | None = None):
         assert 'trigger' in execution and execution['trigger'] == 'Application'
@@ -169,6 +264,8 @@ class Testing:
             self.run_test()
         finally:
             self.post_test()
+            self.release_accounts()
+            self.logger.info(f"RPC latency:\n{self.client.stats.summary()}")
 
     def pre_test(self):
         pass
@@ -178,3 +275,82 @@ class Testing:
 
     def post_test(self):
         pass
+
+
+class AccountPool:
+    """
+    The pool accounts(see `Env.pool_accounts`) shared by all tests in the process.
+    A leased account is used by one test only, until it's released.
+    """
+
+    _pools: dict[tuple[str, int], 'AccountPool'] = {}
+    _pools_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, env: Env) -> 'AccountPool':
+        key = (env.account_seed, env.account_pool_size)
+        with cls._pools_lock:
+            if key not in cls._pools:
+                cls._pools[key] = cls(env.pool_accounts())
+            return cls._pools[key]
+
+    def __init__(self, accounts: list[Account]):
+        self._free = list(accounts)
+        self._cond = threading.Condition()
+
+    def lease(self, timeout: float = 5*60) -> Account:
+        with self._cond:
+            if not self._cond.wait_for(lambda: len(self._free) > 0, timeout):
+                raise TimeoutError(f"Timeout leasing an account after {timeout}s, all pool accounts are in use")
+            return self._free.pop(0)
+
+    def release(self, account: Account):
+        with self._cond:
+            self._free.append(account)
+            self._cond.notify()
+
+
+class TxPipeline:
+    """
+    Submits the queued transactions together, so the independent transactions can be persisted in the same block,
+    then waits for all their application logs, for example:
+
+        pipeline = self.tx_pipeline()
+        pipeline.add(tx1, "step 1")
+        pipeline.add(tx2, "step 2")
+        log1, log2 = pipeline.run()
+
+    NOTE: The transactions in the same block are ordered by fee, not by the submitting order.
+    So only the transactions that don't depend on each other should be queued in the same pipeline.
+    """
+
+    def __init__(self, testing: Testing):
+        self._testing = testing
+        self._txs: list[tuple[Transaction, str]] = []
+        self.tx_ids: list[str] = []
+
+    def add(self, tx: Transaction, label: str = '') -> int:
+        self._txs.append((tx, label))
+        return len(self._txs) - 1
+
+    def submit(self) -> list[str]:
+        client = self._testing.client
+        txs, self._txs = self._txs, []
+        calls = [("sendrawtransaction", [base64.b64encode(tx.to_array()).decode('utf-8')]) for (tx, _) in txs]
+        results = client.send_batch(calls)
+
+        self.tx_ids = []
+        for (tx, label), result in zip(txs, results):
+            try:
+                self.tx_ids.append(result.result()['hash'])
+            except RpcError as e:
+                raise RpcError(e.code, f"Failed to send '{label}' transaction: {e.message}")
+            self._testing.logger.info(f"Transaction '{label}' sent: {self.tx_ids[-1]}")
+        return self.tx_ids
+
+    def wait(self, timeout: int = 5*60) -> list[dict]:
+        return self._testing.wait_for_tx(self.tx_ids, timeout)
+
+    def run(self, timeout: int = 5*60) -> list[dict]:
+        self.submit()
+        return self.wait(timeout)
@@ -0,0 +1,71 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from neo.cassette import RECORD, REPLAY, Cassette
+from neo.rpc import RpcClient
+from neo.stubnode import StubNode
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The RPC calls of the recording process, the shared cassette of NEO_RPC_RECORD is closed only at exit.
+# The atexit functions run in the reverse order, so `check` reads the cassette after it's closed.
+RECORD_SCRIPT = """
+import atexit, gzip, json, os, sys
+from neo.rpc import RpcClient
+
+def check():
+    path = os.environ['NEO_RPC_RECORD']
+    try:
+        with gzip.open(path, 'rt') if path.endswith('.gz') else open(path) as f:
+            f.read()
+    except EOFError:
+        os._exit(3)
+
+atexit.register(check)
+client = RpcClient(sys.argv[1])
+results = [client.get_block_count(), client.get_block(0, True), client.invoke_script(bytes([0x11, 0x12, 0x9e]))]
+with client.batch() as batch:
+    count, version = batch.get_block_count(), batch.get_version()
+print(json.dumps(results + [count.result(), version.result()]))
+"""
+
+
+@pytest.mark.parametrize("name", ["run.jsonl", "run.jsonl.gz"])
+def test_record_then_replay(tmp_path, name):
+    path = str(tmp_path / name)
+    with StubNode(block_time=0) as node:
+        env = dict(os.environ, NEO_RPC_RECORD=path)
+        out = subprocess.run([sys.executable, "-B", "-c", RECORD_SCRIPT, node.endpoint],
+                             cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True).stdout
+    recorded = json.loads(out)
+
+    # The node is stopped, the calls are served by the cassette only.
+    client = RpcClient(node.endpoint, retries=0, cassette=Cassette(path, REPLAY))
+    replayed = [client.get_block_count(), client.get_block(0, True), client.invoke_script(bytes([0x11, 0x12, 0x9e]))]
+    with client.batch() as batch:
+        count, version = batch.get_block_count(), batch.get_version()
+    assert replayed + [count.result(), version.result()] == recorded
+    assert recorded[2]['stack'][0]['value'] == '3'
+
+
+def test_replay_in_scopes(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    with StubNode(block_time=0) as node:
+        cassette = Cassette(path, RECORD)
+        first, second = RpcClient(node.endpoint, cassette=cassette, cassette_scope="first"), \
+            RpcClient(node.endpoint, cassette=cassette, cassette_scope="second")
+        assert first.get_block_count() == 1
+        node.produce_block()
+        assert second.get_block_count() == 2
+        cassette.close()
+
+    # The tests running in parallel make the calls in another order in replay.
+    cassette = Cassette(path, REPLAY)
+    first, second = RpcClient(node.endpoint, retries=0, cassette=cassette, cassette_scope="first"), \
+        RpcClient(node.endpoint, retries=0, cassette=cassette, cassette_scope="second")
+    assert second.get_block_count() == 2
+    assert first.get_block_count() == 1
@@ -0,0 +1,13 @@
+from neo.vm import invoke_script
+from benchmarks.opcode_matrix import opcode_cases
+from testcases.differential import default_scripts
+
+
+def test_default_scripts_halt():
+    faults = []
+    for (case, script) in zip(opcode_cases(), default_scripts()):
+        result = invoke_script(script)
+        if result['state'] != 'HALT':
+            faults.append(case.opcode.name)
+            assert case.fault, f"{case.opcode.name} faults: {result['exception']}"
+    assert faults == ['ABORT', 'THROW', 'ABORTMSG']
@@ -0,0 +1,22 @@
+from neo.vm import ExecutionEngine
+from testcases.fuzzer import ScriptGenerator
+
+
+def test_coverage_in_pairs():
+    generator = ScriptGenerator(seed=1)
+    for _ in range(300):
+        script = generator.generate()
+        engine = ExecutionEngine()
+        engine.coverage = set()
+        engine.load_script(script)
+        engine.execute()
+        generator.update(script, engine.coverage, None)
+    assert set(generator.hits) <= set(generator.pairs)
+    assert 0 < generator.covered() <= len(generator.pairs)
+
+
+def test_empty_stack_not_counted():
+    generator = ScriptGenerator(seed=1)
+    (opcode, _) = generator.pairs[0]
+    assert not generator.update(b'', {(opcode, "Empty")}, None)
+    assert generator.covered() == 0
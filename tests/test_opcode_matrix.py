@@ -0,0 +1,31 @@
+import pytest
+
+from neo import OpCode
+from neo.vm import invoke_script
+from benchmarks.opcode_matrix import UNSUPPORTED, opcode_cases
+
+CASES = opcode_cases()
+
+
+@pytest.mark.parametrize("case", CASES, ids=[case.opcode.name for case in CASES])
+def test_case_runs(case):
+    expected = 'FAULT' if case.fault else 'HALT'
+    assert invoke_script(case.script(cleanup=False))['state'] == expected
+    assert invoke_script(case.script(with_opcode=False, cleanup=False))['state'] == 'HALT'
+    if case.repeatable:
+        assert invoke_script(case.script(1000))['state'] == expected
+        assert invoke_script(case.script(1000, with_opcode=False))['state'] == 'HALT'
+
+
+def test_jumps_are_taken():
+    # The jump over an ABORT faults if it's not taken.
+    for case in CASES:
+        if case.opcode.name.startswith('JMP'):
+            operand = b'\x03' if len(case.operand) == 1 else (6).to_bytes(4, 'little')
+            script = case.setup + bytes([case.opcode]) + operand + bytes([OpCode.ABORT, OpCode.NOP])
+            assert invoke_script(script)['state'] == 'HALT', case.opcode.name
+
+
+def test_all_opcodes_covered():
+    covered = {case.opcode for case in CASES}
+    assert [opcode.name for opcode in OpCode if opcode not in covered and opcode not in UNSUPPORTED] == []
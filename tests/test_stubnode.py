@@ -0,0 +1,125 @@
+import base64
+import random
+
+import pytest
+
+from neo3.core import types
+from neo3.network.payloads.block import Block
+from neo3.network.payloads.transaction import Transaction
+from neo3.network.payloads.verification import Signer, Witness, WitnessScope
+
+from neo.contract import GAS_CONTRACT_HASH, ScriptBuilder
+from neo.rpc import RpcClient, RpcError
+from neo.stubnode import ERROR_UNKNOWN_TRANSACTION, StubNode
+
+ALICE = '0x' + '11' * 20
+BOB = '0x' + '22' * 20
+
+
+def _hash160(account: str) -> bytes:
+    return bytes.fromhex(account[2:])[::-1]
+
+
+def _transfer_script(amount: int) -> bytes:
+    args = [_hash160(ALICE), _hash160(BOB), amount, None]
+    return ScriptBuilder().emit_dynamic_call(GAS_CONTRACT_HASH, "transfer", 0x0F, args).to_bytes()
+
+
+def _raw_tx(script: bytes, valid_until_block: int = 100) -> bytes:
+    # The witness is not verified by the stub node.
+    witness = Witness(invocation_script=b'', verification_script=b'')
+    tx = Transaction(version=0, nonce=random.randint(0, 0xFFFFFFFF), system_fee=1_0000000, network_fee=1_0000000,
+                     valid_until_block=valid_until_block, attributes=[], script=script, witnesses=[witness],
+                     signers=[Signer(account=types.UInt160(_hash160(ALICE)), scope=WitnessScope.CALLED_BY_ENTRY)])
+    return tx.to_array()
+
+
+@pytest.fixture
+def node():
+    with StubNode(block_time=0) as node:
+        yield node
+
+
+@pytest.fixture
+def client(node):
+    with RpcClient(node.endpoint, retries=0) as client:
+        yield client
+
+
+def test_produce_block(node, client):
+    assert client.get_block_count() == 1
+    genesis = client.get_block(0, True)
+    block = node.produce_block()
+    assert client.get_block_count() == 2
+    assert client.get_block_hash(1) == block.hash
+    assert client.get_block(1, True)['previousblockhash'] == genesis['hash']
+    assert client.get_block_header(block.hash, True)['index'] == 1
+
+
+def test_non_verbose_block(node, client):
+    raw_tx = _raw_tx(_transfer_script(0))
+    client.send_raw_tx(raw_tx)
+    block = node.produce_block()
+
+    raw_block = base64.b64decode(client.get_block(1, False))
+    assert len(raw_block) == client.get_block(1, True)['size']
+    deserialized = Block.deserialize_from_bytes(raw_block)
+    assert '0x' + deserialized.hash().to_array()[::-1].hex() == block.hash
+    assert [tx.to_array() for tx in deserialized.transactions] == [raw_tx]
+    assert base64.b64decode(client.get_block_header(1, False)) == raw_block[:len(block.serialize_header())]
+
+
+def test_send_raw_tx(node, client):
+    node.balances[(GAS_CONTRACT_HASH, ALICE)] = 100
+    tx_hash = client.send_raw_tx(_raw_tx(_transfer_script(30)))['hash']
+    assert client.get_mempool() == [tx_hash]
+    with pytest.raises(RpcError) as e:
+        client.get_transaction_height(tx_hash)
+    assert e.value.code == ERROR_UNKNOWN_TRANSACTION
+
+    node.produce_block()
+    assert client.get_mempool() == []
+    assert client.get_transaction_height(tx_hash) == 1
+    execution = client.get_application_log(tx_hash)['executions'][0]
+    assert execution['vmstate'] == 'HALT'
+    assert execution['stack'] == [{'type': 'Boolean', 'value': True}]
+    assert node.balances[(GAS_CONTRACT_HASH, BOB)] == 30
+
+
+def test_canned_response(node, client):
+    node.set_response("getblockcount", None, result=42)
+    node.set_response("getblockhash", [0], error=RpcError(-100, "canned"))
+    assert client.get_block_count() == 42
+    with pytest.raises(RpcError) as e:
+        client.get_block_hash(0)
+    assert e.value.message == "canned"
+
+
+def test_execute_rollback(node):
+    node.balances[(GAS_CONTRACT_HASH, ALICE)] = 100
+    assert node.execute(_transfer_script(30))['stack'] == [{'type': 'Boolean', 'value': True}]
+    assert node.balances == {(GAS_CONTRACT_HASH, ALICE): 100}
+
+    # The balances of a FAULT are rolled back even if it's persisted.
+    assert node.execute(_transfer_script(30) + bytes([0x38]), persist=True)['state'] == 'FAULT'  # ABORT
+    assert node.balances == {(GAS_CONTRACT_HASH, ALICE): 100}
+
+    assert node.execute(_transfer_script(30), persist=True)['state'] == 'HALT'
+    assert node.balances == {(GAS_CONTRACT_HASH, ALICE): 70, (GAS_CONTRACT_HASH, BOB): 30}
+
+
+def test_wait_for_application_log(node, client):
+    tx_hash = client.send_raw_tx(_raw_tx(_transfer_script(0)))['hash']
+    waits = []
+
+    def produce_block(remaining: float):
+        waits.append(remaining)
+        node.produce_block()
+
+    # The repeated hash is waited once and its log is returned for each.
+    logs = client.wait_for_application_log([tx_hash, tx_hash], timeout=5.0, wait=produce_block)
+    assert len(waits) == 1
+    assert [log['txid'] for log in logs] == [tx_hash, tx_hash]
+
+    with pytest.raises(TimeoutError):
+        client.wait_for_application_log('0x' + '00' * 32, timeout=0.3, poll_interval=0.1)